@@ -0,0 +1,259 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.metadata_repository import MetadataRepository
+
+
+class CacheRespuestas:
+    """
+    Cache en memoria de respuestas ya serializadas, con LRU acotado por
+    tamaño en bytes. Las claves incluyen la versión de los datos, así que una
+    carga nueva invalida todo sin tener que borrar nada: las entradas viejas
+    dejan de pedirse y se desalojan solas.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Tamaño máximo total de los cuerpos guardados
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.desalojos = 0
+        self._entradas: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: Tuple) -> Optional[bytes]:
+        with self._lock:
+            cuerpo = self._entradas.get(clave)
+            if cuerpo is None:
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            return cuerpo
+
+    def guardar(self, clave: Tuple, cuerpo: bytes) -> None:
+        # Una respuesta más grande que todo el cache no se guarda
+        if len(cuerpo) > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self.bytes -= len(anterior)
+            self._entradas[clave] = cuerpo
+            self.bytes += len(cuerpo)
+            while self.bytes > self.max_bytes:
+                _, desalojado = self._entradas.popitem(last=False)
+                self.bytes -= len(desalojado)
+                self.desalojos += 1
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self.bytes = 0
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "desalojos": self.desalojos,
+                "hit_ratio": round(self.hits / consultas, 4) if consultas else 0.0,
+            }
+
+
+cache_analytics = CacheRespuestas(settings.CACHE_MAX_BYTES)
+
+# Última versión leída de metadata: (versión, fecha, cuándo se leyó con time.monotonic)
+_version_datos: Tuple[Optional[str], Optional[datetime], float] = (None, None, 0.0)
+_version_lock = threading.Lock()
+
+
+def version_vigente() -> Tuple[Optional[str], Optional[datetime]]:
+    """Versión leída hace menos de CACHE_VERSION_TTL segundos, o (None, None)."""
+    version, fecha, leida = _version_datos
+    if version is not None and time.monotonic() - leida < settings.CACHE_VERSION_TTL:
+        return version, fecha
+    return None, None
+
+
+def version_de_fecha(fecha: Optional[datetime]) -> str:
+    """Versión de los datos que corresponde a una fecha de última actualización."""
+    return fecha.isoformat() if fecha else "sin-version"
+
+
+def registrar_version(fecha: Optional[datetime]) -> Tuple[str, Optional[datetime]]:
+    """Guarda la fecha recién leída de metadata como versión vigente."""
+    global _version_datos
+    version = version_de_fecha(fecha)
+    _version_datos = (version, fecha, time.monotonic())
+    return version, fecha
+
+
+def get_version_datos() -> Tuple[str, Optional[datetime]]:
+    """
+    Obtiene la versión de los datos: la fecha de última actualización que
+    escribe la carga. Se relee de la base como mucho una vez cada
+    CACHE_VERSION_TTL segundos, así un acierto del cache no hace ninguna
+    consulta.
+
+    Returns:
+        Tupla (versión, fecha): la fecha en formato ISO, o "sin-version" si
+        no hay datos, y la fecha en sí (o None)
+    """
+    version, fecha = version_vigente()
+    if version is not None:
+        return version, fecha
+    with _version_lock:
+        version, fecha = version_vigente()
+        if version is not None:
+            return version, fecha
+        db = SessionLocal()
+        try:
+            return registrar_version(MetadataRepository(db).get_ultima_actualizacion())
+        finally:
+            db.close()
+
+
+def _serializar(respuesta: Any) -> bytes:
+    if isinstance(respuesta, BaseModel):
+        return respuesta.model_dump_json().encode("utf-8")
+    return json.dumps(jsonable_encoder(respuesta), ensure_ascii=False).encode("utf-8")
+
+
+def _clave(endpoint: str, parametros: Dict[str, Any], version: str) -> Tuple:
+    return (endpoint, tuple(sorted(parametros.items())), version)
+
+
+def buscar_en_cache(endpoint: str, parametros: Dict[str, Any], version: str) -> Optional[bytes]:
+    """Cuerpo ya serializado de un endpoint para una versión, o None si no está."""
+    if not settings.CACHE_HABILITADO:
+        return None
+    return cache_analytics.obtener(_clave(endpoint, parametros, version))
+
+
+def guardar_en_cache(endpoint: str, parametros: Dict[str, Any], version: str, respuesta: Any) -> bytes:
+    """Serializa la respuesta de un endpoint, la guarda y devuelve el cuerpo."""
+    cuerpo = _serializar(respuesta)
+    if settings.CACHE_HABILITADO:
+        cache_analytics.guardar(_clave(endpoint, parametros, version), cuerpo)
+    return cuerpo
+
+
+def _etag(endpoint: str, parametros: Dict[str, Any], version: str) -> str:
+    clave = f"{endpoint}|{sorted(parametros.items())}|{version}"
+    return '"' + hashlib.blake2b(clave.encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def _fecha_utc(fecha: datetime) -> datetime:
+    # Sin metadata, la versión es MAX(fecha_ultimo_movimiento), que puede ser un date
+    if not isinstance(fecha, datetime):
+        fecha = datetime(fecha.year, fecha.month, fecha.day)
+    # Las fechas sin zona horaria se guardan en UTC (ver metadata_router)
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return fecha.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _no_modificado(request: Request, etag: str, fecha: Optional[datetime]) -> bool:
+    """
+    Evalúa If-None-Match y, solo si no viene, If-Modified-Since (RFC 9110).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etiquetas = [e.strip().removeprefix("W/") for e in if_none_match.split(",")]
+        return "*" in etiquetas or etag in etiquetas
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or fecha is None:
+        return False
+    try:
+        desde = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if desde.tzinfo is None:
+        desde = desde.replace(tzinfo=timezone.utc)
+    return _fecha_utc(fecha) <= desde
+
+
+def encabezados_condicionales(
+    request: Request,
+    endpoint: str,
+    parametros: Dict[str, Any],
+    version: str,
+    fecha: Optional[datetime]
+) -> Tuple[Dict[str, str], bool]:
+    """
+    Arma ETag, Last-Modified y Cache-Control para una versión de los datos.
+
+    Returns:
+        Tupla (headers, no_modificado): no_modificado es True si el cliente
+        ya tiene esa versión y corresponde responder 304
+    """
+    return encabezados_para_etag(request, _etag(endpoint, parametros, version), fecha)
+
+
+def encabezados_para_etag(
+    request: Request,
+    etag: str,
+    fecha: Optional[datetime]
+) -> Tuple[Dict[str, str], bool]:
+    """
+    Como encabezados_condicionales, con un ETag ya calculado (por ejemplo, el
+    checksum de un archivo).
+    """
+    headers = {"ETag": etag, "Cache-Control": settings.CACHE_CONTROL}
+    if fecha is not None:
+        headers["Last-Modified"] = format_datetime(_fecha_utc(fecha), usegmt=True)
+    return headers, _no_modificado(request, etag, fecha)
+
+
+def respuesta_cacheada(
+    request: Request,
+    endpoint: str,
+    parametros: Dict[str, Any],
+    calcular: Callable[[], Any]
+) -> Response:
+    """
+    Devuelve la respuesta de un endpoint de /analytics desde el cache, o la
+    calcula, la serializa y la guarda. Agrega ETag, Last-Modified y
+    Cache-Control derivados de la versión de los datos, y responde 304 sin
+    calcular nada si el cliente ya tiene esa versión.
+
+    Args:
+        request: Request de FastAPI (para los headers condicionales)
+        endpoint: Nombre del endpoint (parte de la clave)
+        parametros: Parámetros de la consulta (parte de la clave)
+        calcular: Función sin argumentos que arma la respuesta (llama al service)
+
+    Returns:
+        Response JSON con el cuerpo ya serializado, o 304 sin cuerpo
+    """
+    version, fecha = get_version_datos()
+    headers, no_modificado = encabezados_condicionales(request, endpoint, parametros, version, fecha)
+    if no_modificado:
+        return Response(status_code=304, headers=headers)
+
+    cuerpo = buscar_en_cache(endpoint, parametros, version)
+    if cuerpo is None:
+        cuerpo = guardar_en_cache(endpoint, parametros, version, calcular())
+    return Response(content=cuerpo, media_type="application/json", headers=headers)
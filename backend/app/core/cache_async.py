@@ -0,0 +1,56 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from datetime import datetime
+
+from fastapi import Request, Response
+
+from app.core.cache import (
+    buscar_en_cache,
+    encabezados_condicionales,
+    guardar_en_cache,
+    registrar_version,
+    version_vigente,
+)
+from app.repositories.async_repository import AsyncMetadataRepository
+
+
+async def get_version_datos_async(metadata_repo: AsyncMetadataRepository) -> Tuple[str, Optional[datetime]]:
+    """
+    Igual que get_version_datos, pero relee metadata sin bloquear el event loop.
+    Comparte la versión vigente con el camino sincrónico.
+    """
+    version, fecha = version_vigente()
+    if version is not None:
+        return version, fecha
+    return registrar_version(await metadata_repo.get_ultima_actualizacion())
+
+
+async def respuesta_cacheada_async(
+    request: Request,
+    metadata_repo: AsyncMetadataRepository,
+    endpoint: str,
+    parametros: Dict[str, Any],
+    calcular: Callable[[], Awaitable[Any]]
+) -> Response:
+    """
+    Variante asíncrona de respuesta_cacheada: mismo cache, mismas claves y
+    mismos headers condicionales, con `calcular` como corrutina.
+
+    Args:
+        request: Request de FastAPI (para los headers condicionales)
+        metadata_repo: Repository para leer la versión de los datos
+        endpoint: Nombre del endpoint (parte de la clave)
+        parametros: Parámetros de la consulta (parte de la clave)
+        calcular: Función sin argumentos que devuelve una corrutina con la respuesta
+
+    Returns:
+        Response JSON con el cuerpo ya serializado, o 304 sin cuerpo
+    """
+    version, fecha = await get_version_datos_async(metadata_repo)
+    headers, no_modificado = encabezados_condicionales(request, endpoint, parametros, version, fecha)
+    if no_modificado:
+        return Response(status_code=304, headers=headers)
+
+    cuerpo = buscar_en_cache(endpoint, parametros, version)
+    if cuerpo is None:
+        cuerpo = guardar_en_cache(endpoint, parametros, version, await calcular())
+    return Response(content=cuerpo, media_type="application/json", headers=headers)
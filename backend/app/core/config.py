@@ -1,9 +1,49 @@
+import os
+import tempfile
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str
     
+    # Stack asíncrono (asyncpg). Sin ASYNC_DATABASE_URL se deriva de DATABASE_URL
+    ASYNC_DATABASE_URL: Optional[str] = None
+    ASYNC_POOL_SIZE: int = 20
+    ASYNC_MAX_OVERFLOW: int = 10
+    
+    # Cache de respuestas de /analytics
+    CACHE_HABILITADO: bool = True
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_VERSION_TTL: float = 5.0
+    # Los clientes y CDNs pueden reusar una respuesta este tiempo; después
+    # revalidan con If-None-Match / If-Modified-Since y reciben un 304
+    CACHE_CONTROL: str = "public, max-age=60"
+    
+    # Leer los gráficos pesados de las tablas resumen_* que arma la carga;
+    # en False se calculan en cada consulta sobre las tablas base
+    USAR_RESUMENES: bool = True
+    
+    # Gráficos de /analytics/dashboard calculados a la vez. Es también el
+    # tamaño de un pool aparte (sin overflow) para esos gráficos, compartido
+    # por todos los requests: no le saca conexiones al pool principal
+    # (pool_size=5), del que cada dashboard usa solo la que sostiene el
+    # snapshot. Si el pool aparte está ocupado, los gráficos se calculan de a uno
+    DASHBOARD_WORKERS: int = 4
+    
+    # Cómo se leen las tablas al exportar la base: "copy" (COPY ... TO STDOUT,
+    # Postgres arma el CSV; requiere psycopg2) o "csv" (SELECT + csv.writer,
+    # sirve con cualquier base y driver)
+    EXPORTACION_MOTOR: str = "copy"
+    # Tablas exportadas a la vez; 1 exporta de a una, sin archivos temporales.
+    # Como DASHBOARD_WORKERS, es el tamaño de un pool aparte compartido por
+    # todas las exportaciones: si está ocupado, se exporta de a una tabla
+    EXPORTACION_WORKERS: int = 4
+    # Dónde se guarda el ZIP de cada versión de los datos (se arma en la
+    # primera descarga de la versión y se sirve desde disco en las siguientes)
+    EXPORTACION_DIR: str = os.path.join(tempfile.gettempdir(), "corrupcion_exportaciones")
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
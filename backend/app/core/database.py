@@ -1,3 +1,7 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -17,6 +21,57 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+class ConexionesParalelas:
+    """
+    Pool aparte para las consultas que un request reparte entre varias
+    conexiones a la vez. Las conexiones se reservan antes de pedirlas y sin
+    esperar: si no hay libres, el request hace el trabajo en su propia
+    sesión. Así ningún request retiene su conexión del pool principal
+    mientras espera otras, que con varios requests a la vez agota el pool y
+    los deja trabados hasta el pool_timeout.
+    """
+
+    def __init__(self, conexiones: int):
+        """
+        Args:
+            conexiones: Tamaño del pool (sin overflow)
+        """
+        self.engine = create_engine(
+            settings.DATABASE_URL,
+            pool_pre_ping=True,
+            pool_size=conexiones,
+            max_overflow=0,
+            echo=False
+        )
+        self.sesiones = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self._libres = threading.BoundedSemaphore(conexiones)
+
+    @contextmanager
+    def reservar(self, cantidad: int) -> Iterator[int]:
+        """
+        Reserva hasta `cantidad` conexiones libres, sin esperar.
+
+        Yields:
+            Cantidad reservada (puede ser 0); cada sesión de self.sesiones
+            que se abra dentro de esa cantidad tiene su conexión asegurada
+        """
+        reservadas = 0
+        while reservadas < cantidad and self._libres.acquire(blocking=False):
+            reservadas += 1
+        try:
+            yield reservadas
+        finally:
+            for _ in range(reservadas):
+                self._libres.release()
+
+
+# Gráficos de /analytics/dashboard calculados en paralelo (ver DashboardService)
+conexiones_dashboard = ConexionesParalelas(settings.DASHBOARD_WORKERS)
+
+# Tablas de /exportacion exportadas en paralelo (ver ExportacionService)
+conexiones_exportacion = ConexionesParalelas(settings.EXPORTACION_WORKERS)
+
+
 def get_db():
     """Obtiene una sesión de base de datos."""
     db = SessionLocal()
@@ -0,0 +1,40 @@
+from typing import AsyncGenerator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+
+
+def url_async(url: str) -> str:
+    """
+    Convierte una URL de PostgreSQL al driver asyncpg
+    (postgresql://... o postgresql+psycopg2://... -> postgresql+asyncpg://...).
+    Las URLs de otros motores se devuelven sin cambios.
+    """
+    esquema, separador, resto = url.partition("://")
+    if esquema.split("+")[0] in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{separador}{resto}"
+    return url
+
+
+# Motor asíncrono para los routers async. El motor sincrónico de
+# app.core.database sigue siendo el de la carga, los scripts y los routers sync.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or url_async(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_size=settings.ASYNC_POOL_SIZE,
+    max_overflow=settings.ASYNC_MAX_OVERFLOW,
+    echo=False
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Obtiene una sesión asíncrona de base de datos."""
+    async with AsyncSessionLocal() as db:
+        yield db
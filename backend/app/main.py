@@ -13,7 +13,10 @@ from app.routers import (
     personas_mas_denunciadas_router,
     personas_que_mas_denunciaron_router,
     causas_por_fiscalia_router,
-    metadata_router
+    metadata_router,
+    dashboard_router,
+    async_analytics_router,
+    expedientes_router
 )
 
 app = FastAPI(title="Corrupción en Cifras API")
@@ -29,6 +32,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified"],
 )
 app.include_router(expedientes_por_estado_procesal_router.router)
 app.include_router(jueces_mayor_demora_router.router)
@@ -43,6 +47,9 @@ app.include_router(personas_mas_denunciadas_router.router)
 app.include_router(personas_que_mas_denunciaron_router.router)
 app.include_router(causas_por_fiscalia_router.router)
 app.include_router(metadata_router.router)
+app.include_router(dashboard_router.router)
+app.include_router(async_analytics_router.router)
+app.include_router(expedientes_router.router)
 
 
 @app.get("/")
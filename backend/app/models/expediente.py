@@ -24,6 +24,10 @@ class Expediente(Base):
     fiscal = Column(Text, nullable=True)
     fiscalia = Column(Text, nullable=True)
     
+    # Versiones normalizadas para agrupar (las calcula el script de carga)
+    tribunal_normalizado = Column(Text, nullable=True)
+    fiscalia_normalizada = Column(Text, nullable=True)
+    
     # Estado procesal con constraint
     estado_procesal = Column(
         String(50),
@@ -0,0 +1,172 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.expediente_repository import (
+    consulta_causas_por_ano,
+    consulta_causas_por_fiscalia,
+    consulta_causas_por_fuero,
+    consulta_causas_por_juzgado,
+    consulta_count_by_estado_procesal,
+    consulta_delitos_mas_frecuentes,
+    consulta_duracion_instruccion,
+    consulta_duracion_outliers,
+    consulta_duracion_promedio_global,
+    fila_duracion_promedio_global,
+    filas_causas_por_ano,
+    filas_causas_por_fiscalia,
+    filas_causas_por_fuero,
+    filas_causas_por_juzgado,
+    filas_delitos_mas_frecuentes,
+    filas_duracion_instruccion,
+    filas_duracion_outliers,
+)
+from app.repositories.juez_repository import (
+    consulta_jueces_con_mayor_demora,
+    filas_jueces_con_mayor_demora,
+)
+from app.repositories.metadata_repository import (
+    consulta_metadata_ultima_actualizacion,
+    consulta_ultimo_movimiento,
+    fecha_ultimo_movimiento,
+)
+from app.repositories.parte_repository import (
+    consulta_personas_mas_denunciadas,
+    consulta_personas_que_mas_denunciaron,
+    filas_personas_mas_denunciadas,
+    filas_personas_que_mas_denunciaron,
+)
+
+# Variantes asíncronas de los repositories de los gráficos de /analytics: las
+# consultas se esperan con `await AsyncSession.execute` sobre el motor asyncpg.
+# Las sentencias y la conversión de filas son las mismas funciones que usan los
+# repositories sincrónicos, así que los dos caminos devuelven los mismos datos.
+
+
+class AsyncExpedienteRepository:
+    """
+    Variante asíncrona de ExpedienteRepository, con los métodos que usan los
+    gráficos de /analytics.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """
+        Inicializa el repository con una sesión asíncrona de base de datos.
+
+        Args:
+            db: Sesión asíncrona de SQLAlchemy
+        """
+        self.db = db
+
+    async def count_by_estado_procesal(self, estado_procesal: str) -> int:
+        """Ver ExpedienteRepository.count_by_estado_procesal"""
+        return await self.db.scalar(consulta_count_by_estado_procesal(estado_procesal))
+
+    async def count_by_year(self) -> List[Dict[str, Any]]:
+        """Ver ExpedienteRepository.count_by_year"""
+        result = await self.db.execute(consulta_causas_por_ano())
+        return filas_causas_por_ano(result)
+
+    async def get_delitos_mas_frecuentes(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Ver ExpedienteRepository.get_delitos_mas_frecuentes"""
+        result = await self.db.execute(consulta_delitos_mas_frecuentes(), {"limit": limit})
+        return filas_delitos_mas_frecuentes(result)
+
+    async def get_causas_por_juzgado(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Ver ExpedienteRepository.get_causas_por_juzgado"""
+        result = await self.db.execute(consulta_causas_por_juzgado(), {"limit": limit})
+        return filas_causas_por_juzgado(result)
+
+    async def get_causas_por_fuero(self) -> List[Dict[str, Any]]:
+        """Ver ExpedienteRepository.get_causas_por_fuero"""
+        result = await self.db.execute(consulta_causas_por_fuero())
+        return filas_causas_por_fuero(result)
+
+    async def get_causas_por_fiscalia(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Ver ExpedienteRepository.get_causas_por_fiscalia"""
+        result = await self.db.execute(consulta_causas_por_fiscalia(), {"limit": limit})
+        return filas_causas_por_fiscalia(result)
+
+    async def get_duracion_instruccion(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Ver ExpedienteRepository.get_duracion_instruccion"""
+        result = await self.db.execute(consulta_duracion_instruccion(), {"limit": limit})
+        return filas_duracion_instruccion(result)
+
+    async def get_duracion_promedio_global(self) -> Dict[str, Any]:
+        """Ver ExpedienteRepository.get_duracion_promedio_global"""
+        result = await self.db.execute(consulta_duracion_promedio_global())
+        return fila_duracion_promedio_global(result.first())
+
+    async def get_duracion_outliers_mas_largos(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Ver ExpedienteRepository.get_duracion_outliers_mas_largos"""
+        result = await self.db.execute(consulta_duracion_outliers(mas_largos=True), {"limit": limit})
+        return filas_duracion_outliers(result)
+
+    async def get_duracion_outliers_mas_cortos(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Ver ExpedienteRepository.get_duracion_outliers_mas_cortos"""
+        result = await self.db.execute(consulta_duracion_outliers(mas_largos=False), {"limit": limit})
+        return filas_duracion_outliers(result)
+
+
+class AsyncJuezRepository:
+    """Variante asíncrona de JuezRepository"""
+
+    def __init__(self, db: AsyncSession):
+        """
+        Inicializa el repository con una sesión asíncrona de base de datos.
+
+        Args:
+            db: Sesión asíncrona de SQLAlchemy
+        """
+        self.db = db
+
+    async def get_jueces_con_mayor_demora(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Ver JuezRepository.get_jueces_con_mayor_demora"""
+        result = await self.db.execute(consulta_jueces_con_mayor_demora(), {"limit": limit})
+        return filas_jueces_con_mayor_demora(result)
+
+
+class AsyncParteRepository:
+    """Variante asíncrona de ParteRepository"""
+
+    def __init__(self, db: AsyncSession):
+        """
+        Inicializa el repository con una sesión asíncrona de base de datos.
+
+        Args:
+            db: Sesión asíncrona de SQLAlchemy
+        """
+        self.db = db
+
+    async def get_personas_mas_denunciadas(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Ver ParteRepository.get_personas_mas_denunciadas"""
+        result = await self.db.execute(consulta_personas_mas_denunciadas(), {"limit": limit})
+        return filas_personas_mas_denunciadas(result)
+
+    async def get_personas_que_mas_denunciaron(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Ver ParteRepository.get_personas_que_mas_denunciaron"""
+        result = await self.db.execute(consulta_personas_que_mas_denunciaron(), {"limit": limit})
+        return filas_personas_que_mas_denunciaron(result)
+
+
+class AsyncMetadataRepository:
+    """Variante asíncrona de MetadataRepository (solo lectura)"""
+
+    def __init__(self, db: AsyncSession):
+        """
+        Inicializa el repository con una sesión asíncrona de base de datos.
+
+        Args:
+            db: Sesión asíncrona de SQLAlchemy
+        """
+        self.db = db
+
+    async def get_ultima_actualizacion(self) -> Optional[datetime]:
+        """Ver MetadataRepository.get_ultima_actualizacion"""
+        metadata = (await self.db.scalars(consulta_metadata_ultima_actualizacion())).first()
+        if metadata:
+            return metadata.valor
+
+        result = await self.db.execute(consulta_ultimo_movimiento())
+        return fecha_ultimo_movimiento(result.first())
+
@@ -1,11 +1,409 @@
-from typing import List, Optional, Generator, Dict, Any
+import re
+import unicodedata
+from typing import Iterable, List, Optional, Generator, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc, text
+from sqlalchemy import Row, Select, TextClause, and_, or_, desc, asc, func, select, text, tuple_
 from datetime import date, datetime
 
+from app.core.config import settings
 from app.core.database import SessionLocal
 from app.models.expediente import Expediente
 
+# Configuración de texto (español sin acentos) de la columna caratula_busqueda;
+# la crea scripts/load_data_completo.py junto con sus índices
+CONFIG_BUSQUEDA = "public.es_sin_acentos"
+
+
+def _escapar_like(texto: str) -> str:
+    """Escapa los comodines de LIKE para buscar el texto literal."""
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _consulta_texto(texto: str) -> str:
+    """
+    Arma una consulta de to_tsquery con todas las palabras del texto; la última
+    se busca como prefijo porque puede estar a medio escribir.
+    """
+    palabras = re.findall(r"\w+", texto)
+    if not palabras:
+        return ""
+    palabras[-1] += ":*"
+    return " & ".join(palabras)
+
+
+# Marcas que pone ts_headline alrededor de las palabras encontradas: caracteres
+# de uso privado, que no aparecen en las carátulas, y que nunca salen de acá
+_INICIO_MARCA = "\ue000"
+_FIN_MARCA = "\ue001"
+
+
+def _rangos_marcados(marcado: str, original: str) -> List[Tuple[int, int]]:
+    """
+    Posiciones [inicio, fin) de las palabras que ts_headline marcó, sobre el
+    texto original. Si al sacar las marcas no queda exactamente el original
+    (o el original ya traía esos caracteres) no devuelve ninguna.
+    """
+    if _INICIO_MARCA in original or _FIN_MARCA in original:
+        return []
+    rangos = []
+    limpio = []
+    inicio = None
+    for caracter in marcado:
+        if caracter == _INICIO_MARCA:
+            inicio = len(limpio)
+        elif caracter == _FIN_MARCA:
+            if inicio is not None and inicio < len(limpio):
+                rangos.append((inicio, len(limpio)))
+            inicio = None
+        else:
+            limpio.append(caracter)
+    return rangos if "".join(limpio) == original else []
+
+
+def _rangos_subcadena(texto: str, buscado: str) -> List[Tuple[int, int]]:
+    """
+    Posiciones [inicio, fin) de las apariciones de `buscado` en `texto` sin
+    distinguir mayúsculas ni acentos, como el ILIKE sobre sin_acentos.
+    """
+    # Cada caracter normalizado recuerda de qué caracter del texto viene
+    normalizado, origen = [], []
+    for i, caracter in enumerate(texto):
+        for base in unicodedata.normalize("NFD", caracter):
+            if not unicodedata.combining(base):
+                for letra in base.lower():
+                    normalizado.append(letra)
+                    origen.append(i)
+    buscado = "".join(
+        base.lower() for base in unicodedata.normalize("NFD", buscado) if not unicodedata.combining(base)
+    )
+    if not buscado:
+        return []
+    normalizado = "".join(normalizado)
+    rangos = []
+    desde = normalizado.find(buscado)
+    while desde >= 0:
+        hasta = desde + len(buscado)
+        rangos.append((origen[desde], origen[hasta - 1] + 1))
+        desde = normalizado.find(buscado, hasta)
+    return rangos
+
+
+def _unir_rangos(rangos: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Ordena los rangos y junta los que se superponen o se tocan."""
+    unidos: List[Tuple[int, int]] = []
+    for inicio, fin in sorted(rangos):
+        if unidos and inicio <= unidos[-1][1]:
+            unidos[-1] = (unidos[-1][0], max(fin, unidos[-1][1]))
+        else:
+            unidos.append((inicio, fin))
+    return unidos
+
+
+# Consultas de los gráficos de /analytics. Cada consulta_* arma la sentencia y
+# su filas_* convierte el resultado; las comparten ExpedienteRepository y
+# AsyncExpedienteRepository, así los dos caminos devuelven los mismos datos.
+
+def consulta_count_by_estado_procesal(estado_procesal: str) -> Select:
+    """Cantidad de expedientes con el estado procesal dado."""
+    return select(func.count()).select_from(Expediente).where(
+        Expediente.estado_procesal == estado_procesal
+    )
+
+
+def consulta_causas_por_ano() -> TextClause:
+    """Causas iniciadas por año, separadas por estado procesal."""
+    if settings.USAR_RESUMENES:
+        # Resumen precalculado por la carga
+        return text("""
+            SELECT anio, cantidad_causas_abiertas, cantidad_causas_terminadas, cantidad_causas
+            FROM resumen_causas_por_ano
+            ORDER BY anio
+        """)
+    return text("""
+        SELECT 
+            ano_inicio AS anio,
+            COUNT(CASE WHEN estado_procesal = 'En trámite' THEN 1 END) AS cantidad_causas_abiertas,
+            COUNT(CASE WHEN estado_procesal = 'Terminada' THEN 1 END) AS cantidad_causas_terminadas,
+            COUNT(*) AS cantidad_causas
+        FROM expediente
+        WHERE ano_inicio IS NOT NULL
+        GROUP BY ano_inicio
+        ORDER BY anio
+    """)
+
+
+def filas_causas_por_ano(result: Iterable[Row]) -> List[Dict[str, Any]]:
+    """Convierte el resultado de consulta_causas_por_ano a diccionarios."""
+    return [
+        {
+            "anio": int(row.anio),
+            "cantidad_causas_abiertas": int(row.cantidad_causas_abiertas),
+            "cantidad_causas_terminadas": int(row.cantidad_causas_terminadas),
+            "cantidad_causas": int(row.cantidad_causas)
+        }
+        for row in result
+    ]
+
+
+def consulta_delitos_mas_frecuentes() -> TextClause:
+    """Delitos más frecuentes, separados por estado procesal (parámetro :limit)."""
+    if settings.USAR_RESUMENES:
+        # Resumen precalculado por la carga
+        return text("""
+            SELECT delito, cantidad_causas_abiertas, cantidad_causas_terminadas, cantidad_causas
+            FROM resumen_delitos
+            ORDER BY cantidad_causas DESC
+            LIMIT :limit
+        """)
+    # Usar las tablas relacionales (expediente_delito, tipo_delito) con estado procesal
+    return text("""
+        SELECT 
+            td.nombre AS delito,
+            COUNT(CASE WHEN e.estado_procesal = 'En trámite' THEN 1 END) AS cantidad_causas_abiertas,
+            COUNT(CASE WHEN e.estado_procesal = 'Terminada' THEN 1 END) AS cantidad_causas_terminadas,
+            COUNT(ed.numero_expediente) AS cantidad_causas
+        FROM expediente_delito ed
+        JOIN tipo_delito td ON ed.tipo_delito_id = td.tipo_delito_id
+        JOIN expediente e ON ed.numero_expediente = e.numero_expediente
+        GROUP BY td.nombre
+        ORDER BY cantidad_causas DESC
+        LIMIT :limit
+    """)
+
+
+def filas_delitos_mas_frecuentes(result: Iterable[Row]) -> List[Dict[str, Any]]:
+    """Convierte el resultado de consulta_delitos_mas_frecuentes a diccionarios."""
+    return [
+        {
+            "delito": row.delito,
+            "cantidad_causas_abiertas": int(row.cantidad_causas_abiertas),
+            "cantidad_causas_terminadas": int(row.cantidad_causas_terminadas),
+            "cantidad_causas": int(row.cantidad_causas)
+        }
+        for row in result
+    ]
+
+
+def consulta_causas_por_juzgado() -> TextClause:
+    """Causas por juzgado, separadas por estado procesal (parámetro :limit)."""
+    # tribunal_normalizado lo calcula la carga: sin "Dr./Dra." y con "Lo"/"Los" corregidos
+    return text("""
+        SELECT 
+            tribunal_normalizado AS tribunal,
+            COUNT(CASE WHEN estado_procesal = 'En trámite' THEN 1 END) AS cantidad_causas_abiertas,
+            COUNT(CASE WHEN estado_procesal = 'Terminada' THEN 1 END) AS cantidad_causas_terminadas,
+            COUNT(*) AS cantidad_causas
+        FROM expediente
+        WHERE tribunal_normalizado IS NOT NULL
+        GROUP BY tribunal_normalizado
+        ORDER BY cantidad_causas DESC
+        LIMIT :limit
+    """)
+
+
+def filas_causas_por_juzgado(result: Iterable[Row]) -> List[Dict[str, Any]]:
+    """Convierte el resultado de consulta_causas_por_juzgado a diccionarios."""
+    return [
+        {
+            "tribunal": row.tribunal,
+            "cantidad_causas_abiertas": int(row.cantidad_causas_abiertas),
+            "cantidad_causas_terminadas": int(row.cantidad_causas_terminadas),
+            "cantidad_causas": int(row.cantidad_causas)
+        }
+        for row in result
+    ]
+
+
+def consulta_causas_por_fuero() -> TextClause:
+    """Causas por fuero judicial, separadas por estado procesal."""
+    if settings.USAR_RESUMENES:
+        # Resumen precalculado por la carga
+        return text("""
+            SELECT fuero, cantidad_causas_abiertas, cantidad_causas_terminadas, cantidad_causas
+            FROM resumen_causas_por_fuero
+            ORDER BY cantidad_causas DESC
+        """)
+    return text("""
+        SELECT 
+            t.fuero AS fuero,
+            COUNT(CASE WHEN e.estado_procesal = 'En trámite' THEN 1 END) AS cantidad_causas_abiertas,
+            COUNT(CASE WHEN e.estado_procesal = 'Terminada' THEN 1 END) AS cantidad_causas_terminadas,
+            COUNT(e.numero_expediente) AS cantidad_causas
+        FROM expediente e
+        JOIN tribunal t ON e.tribunal = t.nombre
+        WHERE t.fuero IS NOT NULL
+        GROUP BY t.fuero
+        ORDER BY cantidad_causas DESC
+    """)
+
+
+def filas_causas_por_fuero(result: Iterable[Row]) -> List[Dict[str, Any]]:
+    """Convierte el resultado de consulta_causas_por_fuero a diccionarios."""
+    return [
+        {
+            "fuero": row.fuero,
+            "cantidad_causas_abiertas": int(row.cantidad_causas_abiertas),
+            "cantidad_causas_terminadas": int(row.cantidad_causas_terminadas),
+            "cantidad_causas": int(row.cantidad_causas)
+        }
+        for row in result
+    ]
+
+
+def consulta_causas_por_fiscalia() -> TextClause:
+    """Causas por fiscalía, separadas por estado procesal (parámetro :limit)."""
+    if settings.USAR_RESUMENES:
+        # Resumen precalculado por la carga
+        return text("""
+            SELECT fiscalia, causas_abiertas, causas_terminadas, total_causas
+            FROM resumen_causas_por_fiscalia
+            ORDER BY total_causas DESC
+            LIMIT :limit
+        """)
+    # fiscalia_normalizada la calcula la carga, con "Lo"/"Los" corregidos
+    return text("""
+        SELECT 
+            fiscalia_normalizada AS fiscalia,
+            COUNT(CASE WHEN estado_procesal = 'En trámite' THEN 1 END) AS causas_abiertas,
+            COUNT(CASE WHEN estado_procesal = 'Terminada' THEN 1 END) AS causas_terminadas,
+            COUNT(*) AS total_causas
+        FROM expediente
+        WHERE fiscalia_normalizada IS NOT NULL
+        GROUP BY fiscalia_normalizada
+        ORDER BY total_causas DESC
+        LIMIT :limit
+    """)
+
+
+def filas_causas_por_fiscalia(result: Iterable[Row]) -> List[Dict[str, Any]]:
+    """Convierte el resultado de consulta_causas_por_fiscalia a diccionarios."""
+    return [
+        {
+            "fiscalia": row.fiscalia,
+            "causas_abiertas": int(row.causas_abiertas),
+            "causas_terminadas": int(row.causas_terminadas),
+            "total_causas": int(row.total_causas)
+        }
+        for row in result
+    ]
+
+
+def consulta_duracion_instruccion() -> TextClause:
+    """Causas ordenadas por duración de instrucción, de más larga a más corta (parámetro :limit)."""
+    return text("""
+        SELECT 
+            e.numero_expediente,
+            e.caratula,
+            e.tribunal,
+            e.estado_procesal,
+            e.fecha_inicio,
+            e.fecha_ultimo_movimiento,
+            (e.fecha_ultimo_movimiento::date - e.fecha_inicio::date) AS duracion_dias
+        FROM expediente e
+        WHERE 
+            e.fecha_inicio IS NOT NULL
+            AND e.fecha_ultimo_movimiento IS NOT NULL
+        ORDER BY duracion_dias DESC
+        LIMIT :limit
+    """)
+
+
+def filas_duracion_instruccion(result: Iterable[Row]) -> List[Dict[str, Any]]:
+    """Convierte el resultado de consulta_duracion_instruccion a diccionarios."""
+    return [
+        {
+            "numero_expediente": row.numero_expediente,
+            "caratula": row.caratula,
+            "tribunal": row.tribunal,
+            "estado_procesal": row.estado_procesal,
+            "fecha_inicio": row.fecha_inicio.isoformat() if row.fecha_inicio else None,
+            "fecha_ultimo_movimiento": row.fecha_ultimo_movimiento.isoformat() if row.fecha_ultimo_movimiento else None,
+            "duracion_dias": int(row.duracion_dias) if row.duracion_dias else 0
+        }
+        for row in result
+    ]
+
+
+def consulta_duracion_promedio_global() -> TextClause:
+    """Duración promedio, máxima y mínima de todas las causas con ambas fechas."""
+    return text("""
+        SELECT 
+            AVG((fecha_ultimo_movimiento::date - fecha_inicio::date)) AS duracion_promedio_dias,
+            MAX((fecha_ultimo_movimiento::date - fecha_inicio::date)) AS duracion_maxima_dias,
+            MIN((fecha_ultimo_movimiento::date - fecha_inicio::date)) AS duracion_minima_dias,
+            COUNT(*) AS total_causas
+        FROM expediente
+        WHERE 
+            fecha_inicio IS NOT NULL
+            AND fecha_ultimo_movimiento IS NOT NULL
+    """)
+
+
+def fila_duracion_promedio_global(result: Optional[Row]) -> Dict[str, Any]:
+    """Convierte la fila de consulta_duracion_promedio_global (o None) a diccionario."""
+    if result and result.total_causas > 0:
+        return {
+            "duracion_promedio_dias": float(result.duracion_promedio_dias) if result.duracion_promedio_dias else 0.0,
+            "duracion_maxima_dias": int(result.duracion_maxima_dias) if result.duracion_maxima_dias else 0,
+            "duracion_minima_dias": int(result.duracion_minima_dias) if result.duracion_minima_dias else 0,
+            "total_causas": int(result.total_causas)
+        }
+    return {
+        "duracion_promedio_dias": 0.0,
+        "duracion_maxima_dias": 0,
+        "duracion_minima_dias": 0,
+        "total_causas": 0
+    }
+
+
+def consulta_duracion_outliers(mas_largos: bool) -> TextClause:
+    """
+    Causas con mayor (mas_largos) o menor duración de instrucción, con el
+    nombre del imputado (denunciado) de cada una (parámetro :limit).
+    """
+    orden = "DESC" if mas_largos else "ASC"
+    return text(f"""
+        SELECT 
+            e.numero_expediente,
+            e.caratula,
+            e.tribunal,
+            e.estado_procesal,
+            e.fecha_inicio,
+            e.fecha_ultimo_movimiento,
+            (e.fecha_ultimo_movimiento::date - e.fecha_inicio::date) AS duracion_dias,
+            (
+                SELECT p.nombre_razon_social
+                FROM parte p
+                JOIN rol_parte rp ON rp.parte_id = p.parte_id
+                WHERE p.numero_expediente = e.numero_expediente
+                  AND (UPPER(TRIM(rp.nombre)) = 'DENUNCIADO' OR UPPER(TRIM(rp.nombre)) = 'IMPUTADO')
+                LIMIT 1
+            ) AS imputado_nombre
+        FROM expediente e
+        WHERE 
+            e.fecha_inicio IS NOT NULL
+            AND e.fecha_ultimo_movimiento IS NOT NULL
+        ORDER BY duracion_dias {orden}
+        LIMIT :limit
+    """)
+
+
+def filas_duracion_outliers(result: Iterable[Row]) -> List[Dict[str, Any]]:
+    """Convierte el resultado de consulta_duracion_outliers a diccionarios."""
+    return [
+        {
+            "numero_expediente": row.numero_expediente,
+            "caratula": row.caratula,
+            "tribunal": row.tribunal,
+            "estado_procesal": row.estado_procesal,
+            "fecha_inicio": row.fecha_inicio.isoformat() if row.fecha_inicio else None,
+            "fecha_ultimo_movimiento": row.fecha_ultimo_movimiento.isoformat() if row.fecha_ultimo_movimiento else None,
+            "duracion_dias": int(row.duracion_dias) if row.duracion_dias else 0,
+            "imputado_nombre": row.imputado_nombre if row.imputado_nombre else None
+        }
+        for row in result
+    ]
+
 
 class ExpedienteRepository:
     """
@@ -112,6 +510,172 @@ class ExpedienteRepository:
             Expediente.jurisdiccion.ilike(f"%{jurisdiccion}%")
         ).offset(skip).limit(limit).all()
     
+    def get_pagina(
+        self,
+        orden: str = "numero_expediente",
+        despues_de: Optional[Tuple[Optional[date], str]] = None,
+        limit: int = 50,
+        filtros: Optional[Dict[str, str]] = None
+    ) -> List[Expediente]:
+        """
+        Obtiene una página de expedientes con paginación por clave (keyset):
+        en lugar de saltear filas con OFFSET, sigue desde la última fila de la
+        página anterior por el índice del orden, así que cualquier página
+        cuesta lo mismo que la primera.
+        
+        Args:
+            orden: 'numero_expediente' o 'fecha_inicio' (desempata por numero_expediente;
+                   las fechas nulas van al final)
+            despues_de: Claves (fecha_inicio, numero_expediente) de la última fila de
+                        la página anterior, o None para la primera página
+            limit: Número máximo de registros a retornar
+            filtros: Igualdades por columna: estado_procesal, tribunal, jurisdiccion,
+                     fiscal y/o fiscalia
+            
+        Returns:
+            Lista de expedientes de la página, en el orden pedido
+        """
+        query = self.db.query(Expediente)
+        for columna, valor in (filtros or {}).items():
+            query = query.filter(getattr(Expediente, columna) == valor)
+        
+        if orden == "numero_expediente":
+            if despues_de is not None:
+                query = query.filter(Expediente.numero_expediente > despues_de[1])
+            return query.order_by(Expediente.numero_expediente).limit(limit).all()
+        
+        # Orden por fecha: primero las fechas no nulas con una comparación de
+        # filas (usa el índice (fecha_inicio, numero_expediente)), después las nulas
+        expedientes: List[Expediente] = []
+        fecha, numero = despues_de if despues_de is not None else (None, None)
+        if despues_de is None or fecha is not None:
+            con_fecha = query.filter(Expediente.fecha_inicio.isnot(None))
+            if despues_de is not None:
+                con_fecha = con_fecha.filter(
+                    tuple_(Expediente.fecha_inicio, Expediente.numero_expediente) > tuple_(fecha, numero)
+                )
+            expedientes = con_fecha.order_by(
+                Expediente.fecha_inicio, Expediente.numero_expediente
+            ).limit(limit).all()
+            numero = None
+        if len(expedientes) < limit:
+            sin_fecha = query.filter(Expediente.fecha_inicio.is_(None))
+            if numero is not None:
+                sin_fecha = sin_fecha.filter(Expediente.numero_expediente > numero)
+            expedientes += sin_fecha.order_by(
+                Expediente.numero_expediente
+            ).limit(limit - len(expedientes)).all()
+        return expedientes
+    
+    def buscar(self, texto: str, limit: int = 20, candidatos: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Busca expedientes por carátula y número, ordenados por relevancia.
+        
+        Junta tres búsquedas, cada una resuelta con su índice:
+        - Prefijo del número de expediente (sin distinguir mayúsculas): relevancia 2
+        - Texto completo de la carátula (español, sin acentos, la última palabra
+          como prefijo): relevancia ts_rank_cd, entre 0 y 1
+        - Subcadena de la carátula por trigramas, para nombres y siglas que el
+          texto completo no encuentra (solo con 3 o más caracteres): relevancia
+          word_similarity / 2
+        Cada búsqueda aporta a lo sumo `candidatos` expedientes, para que el
+        costo no crezca con la cantidad de coincidencias de una palabra común.
+        
+        Args:
+            texto: Texto buscado
+            limit: Número máximo de resultados a retornar (default: 20)
+            candidatos: Máximo de expedientes que aporta cada búsqueda (default: 1000)
+            
+        Returns:
+            Lista de diccionarios con:
+            - numero_expediente, caratula, tribunal, estado_procesal, fecha_inicio
+            - coincidencias: Lista de {campo, inicio, fin} con las posiciones de los
+              caracteres encontrados en la carátula o el número (ver Coincidencia
+              en expedientes_schema); de las tres búsquedas, no solo del texto completo
+            - relevancia: Relevancia del expediente (la mayor de sus coincidencias)
+        """
+        texto = texto.strip()
+        query = text(f"""
+            WITH candidatos AS (
+                (SELECT e.numero_expediente, 2.0 AS relevancia
+                 FROM expediente e
+                 WHERE upper(e.numero_expediente) LIKE upper(:prefijo) ESCAPE '\\'
+                 LIMIT :candidatos)
+                UNION ALL
+                (SELECT e.numero_expediente,
+                        ts_rank_cd(e.caratula_busqueda, to_tsquery('{CONFIG_BUSQUEDA}'::regconfig, :consulta), 32)
+                            AS relevancia
+                 FROM expediente e
+                 WHERE e.caratula_busqueda @@ to_tsquery('{CONFIG_BUSQUEDA}'::regconfig, :consulta)
+                 LIMIT :candidatos)
+                UNION ALL
+                (SELECT e.numero_expediente,
+                        word_similarity(public.sin_acentos(:texto), public.sin_acentos(e.caratula)) / 2 AS relevancia
+                 FROM expediente e
+                 WHERE :con_trigramas
+                   AND public.sin_acentos(e.caratula) ILIKE public.sin_acentos(:contiene) ESCAPE '\\'
+                 LIMIT :candidatos)
+            ),
+            mejores AS (
+                SELECT numero_expediente, MAX(relevancia) AS relevancia
+                FROM candidatos
+                GROUP BY numero_expediente
+                ORDER BY relevancia DESC, numero_expediente
+                LIMIT :limit
+            )
+            SELECT 
+                e.numero_expediente,
+                e.caratula,
+                e.tribunal,
+                e.estado_procesal,
+                e.fecha_inicio,
+                ts_headline(
+                    '{CONFIG_BUSQUEDA}'::regconfig, coalesce(e.caratula, ''),
+                    to_tsquery('{CONFIG_BUSQUEDA}'::regconfig, :consulta),
+                    :marcas
+                ) AS caratula_marcada,
+                m.relevancia
+            FROM mejores m
+            JOIN expediente e ON e.numero_expediente = m.numero_expediente
+            ORDER BY m.relevancia DESC, m.numero_expediente
+        """)
+        
+        result = self.db.execute(query, {
+            "consulta": _consulta_texto(texto),
+            "texto": texto,
+            "prefijo": _escapar_like(texto) + "%",
+            "contiene": "%" + _escapar_like(texto) + "%",
+            "con_trigramas": len(texto) >= 3,
+            "marcas": f"StartSel={_INICIO_MARCA}, StopSel={_FIN_MARCA}, HighlightAll=true",
+            "candidatos": candidatos,
+            "limit": limit
+        })
+        
+        resultados = []
+        for row in result:
+            coincidencias = []
+            if row.numero_expediente.upper().startswith(texto.upper()):
+                coincidencias.append({"campo": "numero_expediente", "inicio": 0, "fin": len(texto)})
+            if row.caratula:
+                rangos = _rangos_marcados(row.caratula_marcada, row.caratula)
+                if len(texto) >= 3:
+                    rangos += _rangos_subcadena(row.caratula, texto)
+                coincidencias += [
+                    {"campo": "caratula", "inicio": inicio, "fin": fin}
+                    for inicio, fin in _unir_rangos(rangos)
+                ]
+            resultados.append({
+                "numero_expediente": row.numero_expediente,
+                "caratula": row.caratula,
+                "tribunal": row.tribunal,
+                "estado_procesal": row.estado_procesal,
+                "fecha_inicio": row.fecha_inicio,
+                "coincidencias": coincidencias,
+                "relevancia": float(row.relevancia)
+            })
+        
+        return resultados
+    
     def search_by_numero(self, numero: str) -> List[Expediente]:
         """
         Busca expedientes por número de expediente (búsqueda parcial).
@@ -250,9 +814,7 @@ class ExpedienteRepository:
         Returns:
             Número de expedientes con el estado especificado
         """
-        return self.db.query(Expediente).filter(
-            Expediente.estado_procesal == estado_procesal
-        ).count()
+        return self.db.scalar(consulta_count_by_estado_procesal(estado_procesal))
     
     def count_by_tribunal(self, tribunal_id: int) -> int:
         """
@@ -293,31 +855,8 @@ class ExpedienteRepository:
             - cantidad_causas_terminadas: Cantidad de causas terminadas iniciadas en ese año
             - cantidad_causas: Total de causas iniciadas en ese año
         """
-        query = text("""
-            SELECT 
-                ano_inicio AS anio,
-                COUNT(CASE WHEN estado_procesal = 'En trámite' THEN 1 END) AS cantidad_causas_abiertas,
-                COUNT(CASE WHEN estado_procesal = 'Terminada' THEN 1 END) AS cantidad_causas_terminadas,
-                COUNT(*) AS cantidad_causas
-            FROM expediente
-            WHERE ano_inicio IS NOT NULL
-            GROUP BY ano_inicio
-            ORDER BY anio
-        """)
-        
-        result = self.db.execute(query)
-        
-        # Convertir resultados a lista de diccionarios
-        datos_por_ano = []
-        for row in result:
-            datos_por_ano.append({
-                "anio": int(row.anio),
-                "cantidad_causas_abiertas": int(row.cantidad_causas_abiertas),
-                "cantidad_causas_terminadas": int(row.cantidad_causas_terminadas),
-                "cantidad_causas": int(row.cantidad_causas)
-            })
-        
-        return datos_por_ano
+        result = self.db.execute(consulta_causas_por_ano())
+        return filas_causas_por_ano(result)
     
     def get_delitos_mas_frecuentes(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -333,32 +872,8 @@ class ExpedienteRepository:
             - cantidad_causas_terminadas: Cantidad de causas terminadas con ese delito
             - cantidad_causas: Total de causas con ese delito
         """
-        # Usar las tablas relacionales (expediente_delito, tipo_delito) con estado procesal
-        query_relacional = text("""
-            SELECT 
-                td.nombre AS delito,
-                COUNT(CASE WHEN e.estado_procesal = 'En trámite' THEN 1 END) AS cantidad_causas_abiertas,
-                COUNT(CASE WHEN e.estado_procesal = 'Terminada' THEN 1 END) AS cantidad_causas_terminadas,
-                COUNT(ed.numero_expediente) AS cantidad_causas
-            FROM expediente_delito ed
-            JOIN tipo_delito td ON ed.tipo_delito_id = td.tipo_delito_id
-            JOIN expediente e ON ed.numero_expediente = e.numero_expediente
-            GROUP BY td.nombre
-            ORDER BY cantidad_causas DESC
-            LIMIT :limit
-        """)
-        
-        result = self.db.execute(query_relacional, {"limit": limit})
-        delitos = []
-        for row in result:
-            delitos.append({
-                "delito": row.delito,
-                "cantidad_causas_abiertas": int(row.cantidad_causas_abiertas),
-                "cantidad_causas_terminadas": int(row.cantidad_causas_terminadas),
-                "cantidad_causas": int(row.cantidad_causas)
-            })
-        
-        return delitos
+        result = self.db.execute(consulta_delitos_mas_frecuentes(), {"limit": limit})
+        return filas_delitos_mas_frecuentes(result)
     
     def get_causas_por_juzgado(self, limit: int = 20) -> List[Dict[str, Any]]:
         """
@@ -374,59 +889,8 @@ class ExpedienteRepository:
             - cantidad_causas_terminadas: Cantidad de causas terminadas
             - cantidad_causas: Total de causas
         """
-        # Usar el campo TEXT tribunal directamente (no hay FK id_tribunal)
-        query = text("""
-            WITH tribunales_limpios AS (
-                SELECT 
-                    REGEXP_REPLACE(
-                        REGEXP_REPLACE(
-                            REGEXP_REPLACE(
-                                REGEXP_REPLACE(
-                                    TRIM(tribunal),
-                                    '^Dr\.?\s+', '', 'g'
-                                ),
-                                '^Dra\.?\s+', '', 'g'
-                            ),
-                            '^DR\.?\s+', '', 'g'
-                        ),
-                        '^DRA\.?\s+', '', 'g'
-                    ) AS tribunal_limpio,
-                    estado_procesal
-                FROM expediente
-                WHERE tribunal IS NOT NULL 
-                  AND tribunal != ''
-            )
-            SELECT 
-                REGEXP_REPLACE(
-                    REGEXP_REPLACE(
-                        REPLACE(
-                            REPLACE(tribunal_limpio, ' LO ', ' Lo '),
-                            ' LOS ', ' Los '
-                        ),
-                        '^LO ', 'Lo ', 'g'
-                    ),
-                    '^LOS ', 'Los ', 'g'
-                ) AS tribunal,
-                COUNT(CASE WHEN estado_procesal = 'En trámite' THEN 1 END) AS cantidad_causas_abiertas,
-                COUNT(CASE WHEN estado_procesal = 'Terminada' THEN 1 END) AS cantidad_causas_terminadas,
-                COUNT(*) AS cantidad_causas
-            FROM tribunales_limpios
-            GROUP BY tribunal_limpio
-            ORDER BY cantidad_causas DESC
-            LIMIT :limit
-        """)
-        
-        result = self.db.execute(query, {"limit": limit})
-        tribunales = []
-        for row in result:
-            tribunales.append({
-                "tribunal": row.tribunal,
-                "cantidad_causas_abiertas": int(row.cantidad_causas_abiertas),
-                "cantidad_causas_terminadas": int(row.cantidad_causas_terminadas),
-                "cantidad_causas": int(row.cantidad_causas)
-            })
-        
-        return tribunales
+        result = self.db.execute(consulta_causas_por_juzgado(), {"limit": limit})
+        return filas_causas_por_juzgado(result)
     
     def get_causas_terminadas_por_juzgado(self, limit: int = 20) -> List[Dict[str, Any]]:
         """
@@ -475,30 +939,8 @@ class ExpedienteRepository:
             - cantidad_causas_terminadas: Cantidad de causas terminadas en ese fuero
             - cantidad_causas: Total de causas en ese fuero
         """
-        query = text("""
-            SELECT 
-                t.fuero AS fuero,
-                COUNT(CASE WHEN e.estado_procesal = 'En trámite' THEN 1 END) AS cantidad_causas_abiertas,
-                COUNT(CASE WHEN e.estado_procesal = 'Terminada' THEN 1 END) AS cantidad_causas_terminadas,
-                COUNT(e.numero_expediente) AS cantidad_causas
-            FROM expediente e
-            JOIN tribunal t ON e.tribunal = t.nombre
-            WHERE t.fuero IS NOT NULL
-            GROUP BY t.fuero
-            ORDER BY cantidad_causas DESC
-        """)
-        
-        result = self.db.execute(query)
-        fueros = []
-        for row in result:
-            fueros.append({
-                "fuero": row.fuero,
-                "cantidad_causas_abiertas": int(row.cantidad_causas_abiertas),
-                "cantidad_causas_terminadas": int(row.cantidad_causas_terminadas),
-                "cantidad_causas": int(row.cantidad_causas)
-            })
-        
-        return fueros
+        result = self.db.execute(consulta_causas_por_fuero())
+        return filas_causas_por_fuero(result)
     
     def get_causas_por_fiscalia(self, limit: int = 20) -> List[Dict[str, Any]]:
         """
@@ -514,47 +956,8 @@ class ExpedienteRepository:
             - causas_terminadas: Cantidad de causas terminadas
             - total_causas: Total de causas de la fiscalía
         """
-        query = text("""
-            WITH fiscalias_limpias AS (
-                SELECT 
-                    REGEXP_REPLACE(
-                        REGEXP_REPLACE(
-                            REPLACE(
-                                REPLACE(TRIM(fiscalia), ' LO ', ' Lo '),
-                                ' LOS ', ' Los '
-                            ),
-                            '^LO ', 'Lo ', 'g'
-                        ),
-                        '^LOS ', 'Los ', 'g'
-                    ) AS fiscalia_limpia,
-                    estado_procesal
-                FROM expediente
-                WHERE fiscalia IS NOT NULL AND fiscalia != ''
-            )
-            SELECT 
-                fiscalia_limpia AS fiscalia,
-                COUNT(CASE WHEN estado_procesal = 'En trámite' THEN 1 END) AS causas_abiertas,
-                COUNT(CASE WHEN estado_procesal = 'Terminada' THEN 1 END) AS causas_terminadas,
-                COUNT(*) AS total_causas
-            FROM fiscalias_limpias
-            GROUP BY fiscalia_limpia
-            ORDER BY total_causas DESC
-            LIMIT :limit
-        """)
-        
-        result = self.db.execute(query, {"limit": limit})
-        
-        # Convertir resultados a lista de diccionarios
-        fiscalias = []
-        for row in result:
-            fiscalias.append({
-                "fiscalia": row.fiscalia,
-                "causas_abiertas": int(row.causas_abiertas),
-                "causas_terminadas": int(row.causas_terminadas),
-                "total_causas": int(row.total_causas)
-            })
-        
-        return fiscalias
+        result = self.db.execute(consulta_causas_por_fiscalia(), {"limit": limit})
+        return filas_causas_por_fiscalia(result)
     
     def get_duracion_instruccion(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -574,39 +977,8 @@ class ExpedienteRepository:
             - fecha_ultimo_movimiento: Fecha del último movimiento
             - duracion_dias: Duración en días
         """
-        query = text("""
-            SELECT 
-                e.numero_expediente,
-                e.caratula,
-                e.tribunal,
-                e.estado_procesal,
-                e.fecha_inicio,
-                e.fecha_ultimo_movimiento,
-                (e.fecha_ultimo_movimiento::date - e.fecha_inicio::date) AS duracion_dias
-            FROM expediente e
-            WHERE 
-                e.fecha_inicio IS NOT NULL
-                AND e.fecha_ultimo_movimiento IS NOT NULL
-            ORDER BY duracion_dias DESC
-            LIMIT :limit
-        """)
-        
-        result = self.db.execute(query, {"limit": limit})
-        
-        # Convertir resultados a lista de diccionarios
-        causas = []
-        for row in result:
-            causas.append({
-                "numero_expediente": row.numero_expediente,
-                "caratula": row.caratula,
-                "tribunal": row.tribunal,
-                "estado_procesal": row.estado_procesal,
-                "fecha_inicio": row.fecha_inicio.isoformat() if row.fecha_inicio else None,
-                "fecha_ultimo_movimiento": row.fecha_ultimo_movimiento.isoformat() if row.fecha_ultimo_movimiento else None,
-                "duracion_dias": int(row.duracion_dias) if row.duracion_dias else 0
-            })
-        
-        return causas
+        result = self.db.execute(consulta_duracion_instruccion(), {"limit": limit})
+        return filas_duracion_instruccion(result)
     
     def get_duracion_promedio_global(self) -> Dict[str, Any]:
         """
@@ -621,34 +993,8 @@ class ExpedienteRepository:
             - duracion_minima_dias: Duración mínima en días (int)
             - total_causas: Total de causas analizadas (int)
         """
-        query = text("""
-            SELECT 
-                AVG((fecha_ultimo_movimiento::date - fecha_inicio::date)) AS duracion_promedio_dias,
-                MAX((fecha_ultimo_movimiento::date - fecha_inicio::date)) AS duracion_maxima_dias,
-                MIN((fecha_ultimo_movimiento::date - fecha_inicio::date)) AS duracion_minima_dias,
-                COUNT(*) AS total_causas
-            FROM expediente
-            WHERE 
-                fecha_inicio IS NOT NULL
-                AND fecha_ultimo_movimiento IS NOT NULL
-        """)
-        
-        result = self.db.execute(query).first()
-        
-        if result and result.total_causas > 0:
-            return {
-                "duracion_promedio_dias": float(result.duracion_promedio_dias) if result.duracion_promedio_dias else 0.0,
-                "duracion_maxima_dias": int(result.duracion_maxima_dias) if result.duracion_maxima_dias else 0,
-                "duracion_minima_dias": int(result.duracion_minima_dias) if result.duracion_minima_dias else 0,
-                "total_causas": int(result.total_causas)
-            }
-        else:
-            return {
-                "duracion_promedio_dias": 0.0,
-                "duracion_maxima_dias": 0,
-                "duracion_minima_dias": 0,
-                "total_causas": 0
-            }
+        result = self.db.execute(consulta_duracion_promedio_global()).first()
+        return fila_duracion_promedio_global(result)
     
     def get_duracion_outliers_mas_largos(self, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -669,48 +1015,8 @@ class ExpedienteRepository:
             - duracion_dias: Duración en días
             - imputado_nombre: Nombre del imputado (denunciado) o None si no hay
         """
-        query = text("""
-            SELECT 
-                e.numero_expediente,
-                e.caratula,
-                e.tribunal,
-                e.estado_procesal,
-                e.fecha_inicio,
-                e.fecha_ultimo_movimiento,
-                (e.fecha_ultimo_movimiento::date - e.fecha_inicio::date) AS duracion_dias,
-                (
-                    SELECT p.nombre_razon_social
-                    FROM parte p
-                    JOIN rol_parte rp ON rp.parte_id = p.parte_id
-                    WHERE p.numero_expediente = e.numero_expediente
-                      AND (UPPER(TRIM(rp.nombre)) = 'DENUNCIADO' OR UPPER(TRIM(rp.nombre)) = 'IMPUTADO')
-                    LIMIT 1
-                ) AS imputado_nombre
-            FROM expediente e
-            WHERE 
-                e.fecha_inicio IS NOT NULL
-                AND e.fecha_ultimo_movimiento IS NOT NULL
-            ORDER BY duracion_dias DESC
-            LIMIT :limit
-        """)
-        
-        result = self.db.execute(query, {"limit": limit})
-        
-        # Convertir resultados a lista de diccionarios
-        causas = []
-        for row in result:
-            causas.append({
-                "numero_expediente": row.numero_expediente,
-                "caratula": row.caratula,
-                "tribunal": row.tribunal,
-                "estado_procesal": row.estado_procesal,
-                "fecha_inicio": row.fecha_inicio.isoformat() if row.fecha_inicio else None,
-                "fecha_ultimo_movimiento": row.fecha_ultimo_movimiento.isoformat() if row.fecha_ultimo_movimiento else None,
-                "duracion_dias": int(row.duracion_dias) if row.duracion_dias else 0,
-                "imputado_nombre": row.imputado_nombre if row.imputado_nombre else None
-            })
-        
-        return causas
+        result = self.db.execute(consulta_duracion_outliers(mas_largos=True), {"limit": limit})
+        return filas_duracion_outliers(result)
     
     def get_duracion_outliers_mas_cortos(self, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -731,48 +1037,8 @@ class ExpedienteRepository:
             - duracion_dias: Duración en días
             - imputado_nombre: Nombre del imputado (denunciado) o None si no hay
         """
-        query = text("""
-            SELECT 
-                e.numero_expediente,
-                e.caratula,
-                e.tribunal,
-                e.estado_procesal,
-                e.fecha_inicio,
-                e.fecha_ultimo_movimiento,
-                (e.fecha_ultimo_movimiento::date - e.fecha_inicio::date) AS duracion_dias,
-                (
-                    SELECT p.nombre_razon_social
-                    FROM parte p
-                    JOIN rol_parte rp ON rp.parte_id = p.parte_id
-                    WHERE p.numero_expediente = e.numero_expediente
-                      AND (UPPER(TRIM(rp.nombre)) = 'DENUNCIADO' OR UPPER(TRIM(rp.nombre)) = 'IMPUTADO')
-                    LIMIT 1
-                ) AS imputado_nombre
-            FROM expediente e
-            WHERE 
-                e.fecha_inicio IS NOT NULL
-                AND e.fecha_ultimo_movimiento IS NOT NULL
-            ORDER BY duracion_dias ASC
-            LIMIT :limit
-        """)
-        
-        result = self.db.execute(query, {"limit": limit})
-        
-        # Convertir resultados a lista de diccionarios
-        causas = []
-        for row in result:
-            causas.append({
-                "numero_expediente": row.numero_expediente,
-                "caratula": row.caratula,
-                "tribunal": row.tribunal,
-                "estado_procesal": row.estado_procesal,
-                "fecha_inicio": row.fecha_inicio.isoformat() if row.fecha_inicio else None,
-                "fecha_ultimo_movimiento": row.fecha_ultimo_movimiento.isoformat() if row.fecha_ultimo_movimiento else None,
-                "duracion_dias": int(row.duracion_dias) if row.duracion_dias else 0,
-                "imputado_nombre": row.imputado_nombre
-            })
-        
-        return causas
+        result = self.db.execute(consulta_duracion_outliers(mas_largos=False), {"limit": limit})
+        return filas_duracion_outliers(result)
     
     def get_estadisticas_estado_procesal(self) -> dict:
         """
@@ -1,10 +1,74 @@
-from typing import List, Dict, Any, Generator
+from typing import Iterable, List, Dict, Any, Generator
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import Row, TextClause, text
 
+from app.core.config import settings
 from app.core.database import SessionLocal
 
 
+# Consulta del gráfico de jueces con mayor demora, compartida con
+# AsyncJuezRepository (app.repositories.async_repository)
+
+def consulta_jueces_con_mayor_demora() -> TextClause:
+    """Jueces con mayor demora promedio en sus expedientes (parámetro :limit)."""
+    if settings.USAR_RESUMENES:
+        # Resumen precalculado por la carga
+        return text("""
+            SELECT juez_nombre, tribunal_nombre, demora_promedio_dias, cantidad_expedientes
+            FROM resumen_jueces_demora
+            ORDER BY demora_promedio_dias DESC
+            LIMIT :limit
+        """)
+    # Los nombres normalizados (sin "Dr./Dra.", "Lo"/"Los" corregidos) los calcula la carga
+    return text("""
+        WITH duraciones AS (
+            SELECT 
+                e.numero_expediente,
+                e.tribunal,
+                e.tribunal_normalizado,
+                (e.fecha_ultimo_movimiento::date - e.fecha_inicio::date) AS dias_duracion
+            FROM expediente e
+            WHERE e.fecha_inicio IS NOT NULL 
+              AND e.fecha_ultimo_movimiento IS NOT NULL
+              AND e.tribunal IS NOT NULL
+        ),
+        demoras_jueces AS (
+            SELECT 
+                j.juez_id,
+                j.juez_nombre_normalizado AS juez_nombre,
+                d.tribunal_normalizado AS tribunal_nombre,
+                AVG(d.dias_duracion) AS demora_promedio_dias,
+                COUNT(d.numero_expediente) AS cantidad_expedientes
+            FROM duraciones d
+            JOIN tribunal t ON d.tribunal = t.nombre
+            JOIN tribunal_juez tj ON tj.tribunal_id = t.tribunal_id
+            JOIN juez j ON j.juez_id = tj.juez_id
+            GROUP BY j.juez_id, j.juez_nombre_normalizado, d.tribunal_normalizado
+        )
+        SELECT 
+            juez_nombre,
+            tribunal_nombre,
+            ROUND(demora_promedio_dias, 2) AS demora_promedio_dias,
+            cantidad_expedientes
+        FROM demoras_jueces
+        ORDER BY demora_promedio_dias DESC
+        LIMIT :limit
+    """)
+
+
+def filas_jueces_con_mayor_demora(result: Iterable[Row]) -> List[Dict[str, Any]]:
+    """Convierte el resultado de consulta_jueces_con_mayor_demora a diccionarios."""
+    return [
+        {
+            "juez_nombre": row.juez_nombre,
+            "tribunal_nombre": row.tribunal_nombre,
+            "demora_promedio_dias": float(row.demora_promedio_dias),
+            "cantidad_expedientes": int(row.cantidad_expedientes)
+        }
+        for row in result
+    ]
+
+
 class JuezRepository:
     """
     Repository para consultas de solo lectura relacionadas con Jueces.
@@ -39,74 +103,8 @@ class JuezRepository:
             - demora_promedio_dias: Promedio de días de demora (redondeado a 2 decimales)
             - cantidad_expedientes: Cantidad de expedientes del juez
         """
-        query = text("""
-            WITH duraciones AS (
-                SELECT 
-                    e.numero_expediente,
-                    e.tribunal,
-                    (e.fecha_ultimo_movimiento::date - e.fecha_inicio::date) AS dias_duracion
-                FROM expediente e
-                WHERE e.fecha_inicio IS NOT NULL 
-                  AND e.fecha_ultimo_movimiento IS NOT NULL
-                  AND e.tribunal IS NOT NULL
-            ),
-            demoras_jueces AS (
-                SELECT 
-                    j.juez_id,
-                    j.nombre AS juez_nombre,
-                    t.nombre AS tribunal_nombre,
-                    AVG(d.dias_duracion) AS demora_promedio_dias,
-                    COUNT(d.numero_expediente) AS cantidad_expedientes
-                FROM duraciones d
-                JOIN tribunal t ON d.tribunal = t.nombre
-                JOIN tribunal_juez tj ON tj.tribunal_id = t.tribunal_id
-                JOIN juez j ON j.juez_id = tj.juez_id
-                GROUP BY j.juez_id, j.nombre, t.nombre
-            )
-            SELECT 
-                REGEXP_REPLACE(
-                    REGEXP_REPLACE(
-                        REGEXP_REPLACE(
-                            REGEXP_REPLACE(
-                                TRIM(juez_nombre),
-                                '^Dr\.?\s+', '', 'g'
-                            ),
-                            '^Dra\.?\s+', '', 'g'
-                        ),
-                        '^DR\.?\s+', '', 'g'
-                    ),
-                    '^DRA\.?\s+', '', 'g'
-                ) AS juez_nombre,
-                REGEXP_REPLACE(
-                    REGEXP_REPLACE(
-                        REPLACE(
-                            REPLACE(tribunal_nombre, ' LO ', ' Lo '),
-                            ' LOS ', ' Los '
-                        ),
-                        '^LO ', 'Lo ', 'g'
-                    ),
-                    '^LOS ', 'Los ', 'g'
-                ) AS tribunal_nombre,
-                ROUND(demora_promedio_dias, 2) AS demora_promedio_dias,
-                cantidad_expedientes
-            FROM demoras_jueces
-            ORDER BY demora_promedio_dias DESC
-            LIMIT :limit
-        """)
-        
-        result = self.db.execute(query, {"limit": limit})
-        
-        # Convertir resultados a lista de diccionarios
-        jueces = []
-        for row in result:
-            jueces.append({
-                "juez_nombre": row.juez_nombre,
-                "tribunal_nombre": row.tribunal_nombre,
-                "demora_promedio_dias": float(row.demora_promedio_dias),
-                "cantidad_expedientes": int(row.cantidad_expedientes)
-            })
-        
-        return jueces
+        result = self.db.execute(consulta_jueces_con_mayor_demora(), {"limit": limit})
+        return filas_jueces_con_mayor_demora(result)
 
 
 def get_juez_repository() -> Generator[JuezRepository, None, None]:
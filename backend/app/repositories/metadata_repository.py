@@ -1,11 +1,35 @@
 from typing import Optional, Generator
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import Row, Select, TextClause, select, text
 from app.core.database import SessionLocal
 from app.models.metadata import Metadata
 
 
+# Consultas de get_ultima_actualizacion, compartidas con AsyncMetadataRepository
+# (app.repositories.async_repository)
+
+def consulta_metadata_ultima_actualizacion() -> Select:
+    """Fila de metadata con la fecha de última actualización."""
+    return select(Metadata).where(Metadata.clave == 'ultima_actualizacion')
+
+
+def consulta_ultimo_movimiento() -> TextClause:
+    """Fecha del movimiento más reciente, el fallback si metadata no la tiene."""
+    return text("""
+        SELECT MAX(fecha_ultimo_movimiento) AS ultima_fecha
+        FROM expediente
+        WHERE fecha_ultimo_movimiento IS NOT NULL
+    """)
+
+
+def fecha_ultimo_movimiento(result: Optional[Row]) -> Optional[datetime]:
+    """Extrae la fecha de la fila de consulta_ultimo_movimiento (o None)."""
+    if result and result.ultima_fecha:
+        return result.ultima_fecha
+    return None
+
+
 class MetadataRepository:
     """
     Repository para consultas relacionadas con metadatos del sistema.
@@ -28,26 +52,13 @@ class MetadataRepository:
             Fecha de última actualización o None si no existe
         """
         # Intentar obtener de la tabla metadata
-        metadata = self.db.query(Metadata).filter(
-            Metadata.clave == 'ultima_actualizacion'
-        ).first()
-        
+        metadata = self.db.scalars(consulta_metadata_ultima_actualizacion()).first()
         if metadata:
             return metadata.valor
         
         # Si no existe en metadata, usar la fecha más reciente de fecha_ultimo_movimiento
         # como fallback
-        query = text("""
-            SELECT MAX(fecha_ultimo_movimiento) AS ultima_fecha
-            FROM expediente
-            WHERE fecha_ultimo_movimiento IS NOT NULL
-        """)
-        
-        result = self.db.execute(query).first()
-        if result and result.ultima_fecha:
-            return result.ultima_fecha
-        
-        return None
+        return fecha_ultimo_movimiento(self.db.execute(consulta_ultimo_movimiento()).first())
     
     def actualizar_fecha_actualizacion(self, fecha: Optional[datetime] = None) -> None:
         """
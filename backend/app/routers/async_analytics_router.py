@@ -0,0 +1,228 @@
+from typing import Any, Awaitable, Callable, Dict
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache_async import respuesta_cacheada_async
+from app.core.database_async import get_async_db
+from app.repositories.async_repository import (
+    AsyncExpedienteRepository,
+    AsyncJuezRepository,
+    AsyncMetadataRepository,
+    AsyncParteRepository,
+)
+from app.services.causas_en_tramite_por_juzgado_service import CausasEnTramitePorJuzgadoService
+from app.services.causas_iniciadas_por_ano_service import CausasIniciadasPorAnoService
+from app.services.causas_por_estado_procesal_service import CausasPorEstadoProcesalService
+from app.services.causas_por_fiscalia_service import CausasPorFiscaliaService
+from app.services.causas_por_fuero_service import CausasPorFueroService
+from app.services.delitos_mas_frecuentes_service import DelitosMasFrecuentesService
+from app.services.duracion_instruccion_service import DuracionInstruccionService
+from app.services.duracion_outliers_service import DuracionOutliersService
+from app.services.jueces_mayor_demora_service import JuecesMayorDemoraService
+from app.services.personas_mas_denunciadas_service import PersonasMasDenunciadasService
+from app.services.personas_que_mas_denunciaron_service import PersonasQueMasDenunciaronService
+from app.schemas.causas_en_tramite_por_juzgado_schema import CausasEnTramitePorJuzgadoResponse
+from app.schemas.causas_iniciadas_por_ano_schema import CausasIniciadasPorAnoResponse
+from app.schemas.causas_por_fiscalia_schema import CausasPorFiscaliaResponse
+from app.schemas.causas_por_fuero_schema import CausasPorFueroResponse
+from app.schemas.delitos_mas_frecuentes_schema import DelitosMasFrecuentesResponse
+from app.schemas.duracion_instruccion_schema import DuracionInstruccionResponse
+from app.schemas.duracion_outliers_schema import DuracionOutliersResponse
+from app.schemas.expedientes_por_estado_procesal_schema import CasosPorEstadoProcesalResponse
+from app.schemas.jueces_mayor_demora_schema import JuecesMayorDemoraResponse
+from app.schemas.personas_mas_denunciadas_schema import PersonasMasDenunciadasResponse
+from app.schemas.personas_que_mas_denunciaron_schema import PersonasQueMasDenunciaronResponse
+
+# Variantes asíncronas de los endpoints de /analytics, en /async/analytics/<id>.
+# Usan el motor asyncpg y los repositories de app.repositories.async_repository:
+# la espera de la base no ocupa un thread del threadpool de FastAPI. Las
+# consultas, el cache y los headers son los mismos que los del endpoint
+# sincrónico; ver scripts/load_test_async.py.
+router = APIRouter(prefix="/async/analytics", tags=["analytics-async"])
+
+
+async def _responder(
+    request: Request,
+    db: AsyncSession,
+    endpoint: str,
+    parametros: Dict[str, Any],
+    calcular: Callable[[], Awaitable[Any]]
+) -> Response:
+    """Responde desde el cache compartido con /analytics, con la versión leída en la misma sesión."""
+    return await respuesta_cacheada_async(request, AsyncMetadataRepository(db), endpoint, parametros, calcular)
+
+
+@router.get(
+    "/casos-por-estado",
+    response_model=CasosPorEstadoProcesalResponse,
+    summary="Variante asíncrona de /analytics/casos-por-estado"
+)
+async def get_casos_por_estado_async(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Mismos datos, cache y headers que GET /analytics/casos-por-estado."""
+    service = CausasPorEstadoProcesalService(AsyncExpedienteRepository(db))
+    return await _responder(request, db, "casos-por-estado", {}, service.get_datos_grafico_async)
+
+
+@router.get(
+    "/jueces-mayor-demora",
+    response_model=JuecesMayorDemoraResponse,
+    summary="Variante asíncrona de /analytics/jueces-mayor-demora"
+)
+async def get_jueces_mayor_demora_async(
+    request: Request,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Mismos datos, cache y headers que GET /analytics/jueces-mayor-demora."""
+    service = JuecesMayorDemoraService(AsyncJuezRepository(db))
+    return await _responder(
+        request, db, "jueces-mayor-demora", {"limit": limit},
+        lambda: service.get_datos_grafico_async(limit=limit)
+    )
+
+
+@router.get(
+    "/causas-iniciadas-por-ano",
+    response_model=CausasIniciadasPorAnoResponse,
+    summary="Variante asíncrona de /analytics/causas-iniciadas-por-ano"
+)
+async def get_causas_iniciadas_por_ano_async(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Mismos datos, cache y headers que GET /analytics/causas-iniciadas-por-ano."""
+    service = CausasIniciadasPorAnoService(AsyncExpedienteRepository(db))
+    return await _responder(request, db, "causas-iniciadas-por-ano", {}, service.get_datos_grafico_async)
+
+
+@router.get(
+    "/delitos-mas-frecuentes",
+    response_model=DelitosMasFrecuentesResponse,
+    summary="Variante asíncrona de /analytics/delitos-mas-frecuentes"
+)
+async def get_delitos_mas_frecuentes_async(
+    request: Request,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Mismos datos, cache y headers que GET /analytics/delitos-mas-frecuentes."""
+    service = DelitosMasFrecuentesService(AsyncExpedienteRepository(db))
+    return await _responder(
+        request, db, "delitos-mas-frecuentes", {"limit": limit},
+        lambda: service.get_datos_grafico_async(limit=limit)
+    )
+
+
+@router.get(
+    "/causas-en-tramite-por-juzgado",
+    response_model=CausasEnTramitePorJuzgadoResponse,
+    summary="Variante asíncrona de /analytics/causas-en-tramite-por-juzgado"
+)
+async def get_causas_en_tramite_por_juzgado_async(
+    request: Request,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Mismos datos, cache y headers que GET /analytics/causas-en-tramite-por-juzgado."""
+    service = CausasEnTramitePorJuzgadoService(AsyncExpedienteRepository(db))
+    return await _responder(
+        request, db, "causas-en-tramite-por-juzgado", {"limit": limit},
+        lambda: service.get_datos_grafico_async(limit=limit)
+    )
+
+
+@router.get(
+    "/duracion-instruccion",
+    response_model=DuracionInstruccionResponse,
+    summary="Variante asíncrona de /analytics/duracion-instruccion"
+)
+async def get_duracion_instruccion_async(
+    request: Request,
+    limit: int = 50,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Mismos datos, cache y headers que GET /analytics/duracion-instruccion."""
+    service = DuracionInstruccionService(AsyncExpedienteRepository(db))
+    return await _responder(
+        request, db, "duracion-instruccion", {"limit": limit},
+        lambda: service.get_datos_grafico_async(limit=limit)
+    )
+
+
+@router.get(
+    "/duracion-outliers",
+    response_model=DuracionOutliersResponse,
+    summary="Variante asíncrona de /analytics/duracion-outliers"
+)
+async def get_duracion_outliers_async(
+    request: Request,
+    limit: int = 5,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Mismos datos, cache y headers que GET /analytics/duracion-outliers."""
+    service = DuracionOutliersService(AsyncExpedienteRepository(db))
+    return await _responder(
+        request, db, "duracion-outliers", {"limit": limit},
+        lambda: service.get_datos_outliers_async(limit=limit)
+    )
+
+
+@router.get(
+    "/causas-por-fuero",
+    response_model=CausasPorFueroResponse,
+    summary="Variante asíncrona de /analytics/causas-por-fuero"
+)
+async def get_causas_por_fuero_async(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Mismos datos, cache y headers que GET /analytics/causas-por-fuero."""
+    service = CausasPorFueroService(AsyncExpedienteRepository(db))
+    return await _responder(request, db, "causas-por-fuero", {}, service.get_datos_grafico_async)
+
+
+@router.get(
+    "/personas-mas-denunciadas",
+    response_model=PersonasMasDenunciadasResponse,
+    summary="Variante asíncrona de /analytics/personas-mas-denunciadas"
+)
+async def get_personas_mas_denunciadas_async(
+    request: Request,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Mismos datos, cache y headers que GET /analytics/personas-mas-denunciadas."""
+    service = PersonasMasDenunciadasService(AsyncParteRepository(db))
+    return await _responder(
+        request, db, "personas-mas-denunciadas", {"limit": limit},
+        lambda: service.get_datos_grafico_async(limit=limit)
+    )
+
+
+@router.get(
+    "/personas-que-mas-denunciaron",
+    response_model=PersonasQueMasDenunciaronResponse,
+    summary="Variante asíncrona de /analytics/personas-que-mas-denunciaron"
+)
+async def get_personas_que_mas_denunciaron_async(
+    request: Request,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Mismos datos, cache y headers que GET /analytics/personas-que-mas-denunciaron."""
+    service = PersonasQueMasDenunciaronService(AsyncParteRepository(db))
+    return await _responder(
+        request, db, "personas-que-mas-denunciaron", {"limit": limit},
+        lambda: service.get_datos_grafico_async(limit=limit)
+    )
+
+
+@router.get(
+    "/causas-por-fiscal",
+    response_model=CausasPorFiscaliaResponse,
+    summary="Variante asíncrona de /analytics/causas-por-fiscal"
+)
+async def get_causas_por_fiscal_async(
+    request: Request,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Mismos datos, cache y headers que GET /analytics/causas-por-fiscal."""
+    service = CausasPorFiscaliaService(AsyncExpedienteRepository(db))
+    return await _responder(
+        request, db, "causas-por-fiscal", {"limit": limit},
+        lambda: service.get_datos_grafico_async(limit=limit)
+    )
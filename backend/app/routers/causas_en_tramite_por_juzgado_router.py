@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from app.core.cache import respuesta_cacheada
 from app.services.causas_en_tramite_por_juzgado_service import CausasEnTramitePorJuzgadoService
 from app.repositories.expediente_repository import (
     ExpedienteRepository,
@@ -19,6 +20,7 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
                 "No requiere procesamiento adicional en el frontend."
 )
 def get_causas_en_tramite_por_juzgado(
+    request: Request,
     limit: int = 20,
     expediente_repo: ExpedienteRepository = Depends(get_expediente_repository)
 ):
@@ -39,5 +41,8 @@ def get_causas_en_tramite_por_juzgado(
     # Crear el service con el repository inyectado
     service = CausasEnTramitePorJuzgadoService(expediente_repo)
     
-    return service.get_datos_grafico(limit=limit)
+    return respuesta_cacheada(
+        request, "causas-en-tramite-por-juzgado", {"limit": limit},
+        lambda: service.get_datos_grafico(limit=limit)
+    )
 
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from app.core.cache import respuesta_cacheada
 from app.services.causas_iniciadas_por_ano_service import CausasIniciadasPorAnoService
 from app.repositories.expediente_repository import (
     ExpedienteRepository,
@@ -19,6 +20,7 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
                 "No requiere procesamiento adicional en el frontend."
 )
 def get_causas_iniciadas_por_ano(
+    request: Request,
     expediente_repo: ExpedienteRepository = Depends(get_expediente_repository)
 ):
     """
@@ -36,5 +38,8 @@ def get_causas_iniciadas_por_ano(
     # Crear el service con el repository inyectado
     service = CausasIniciadasPorAnoService(expediente_repo)
     
-    return service.get_datos_grafico()
+    return respuesta_cacheada(
+        request, "causas-iniciadas-por-ano", {},
+        lambda: service.get_datos_grafico()
+    )
 
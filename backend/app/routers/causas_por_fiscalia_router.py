@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from app.core.cache import respuesta_cacheada
 from app.services.causas_por_fiscalia_service import CausasPorFiscaliaService
 from app.repositories.expediente_repository import (
     ExpedienteRepository,
@@ -20,6 +21,7 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
                 "No requiere procesamiento adicional en el frontend."
 )
 def get_causas_por_fiscal(
+    request: Request,
     limit: int = 20,
     expediente_repo: ExpedienteRepository = Depends(get_expediente_repository)
 ):
@@ -43,7 +45,10 @@ def get_causas_por_fiscal(
     # Crear el service con el repository inyectado
     service = CausasPorFiscaliaService(expediente_repo)
     
-    return service.get_datos_grafico(limit=limit)
+    return respuesta_cacheada(
+        request, "causas-por-fiscal", {"limit": limit},
+        lambda: service.get_datos_grafico(limit=limit)
+    )
 
 
 
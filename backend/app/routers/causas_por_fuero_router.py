@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from app.core.cache import respuesta_cacheada
 from app.services.causas_por_fuero_service import CausasPorFueroService
 from app.repositories.expediente_repository import (
     ExpedienteRepository,
@@ -19,6 +20,7 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
                 "No requiere procesamiento adicional en el frontend."
 )
 def get_causas_por_fuero(
+    request: Request,
     expediente_repo: ExpedienteRepository = Depends(get_expediente_repository)
 ):
     """
@@ -36,5 +38,8 @@ def get_causas_por_fuero(
     # Crear el service con el repository inyectado
     service = CausasPorFueroService(expediente_repo)
     
-    return service.get_datos_grafico()
+    return respuesta_cacheada(
+        request, "causas-por-fuero", {},
+        lambda: service.get_datos_grafico()
+    )
 
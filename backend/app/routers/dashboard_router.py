@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+from app.services.dashboard_service import (
+    DashboardService,
+    get_dashboard_service
+)
+from app.schemas.dashboard_schema import DashboardRequest, DashboardResponse
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.post(
+    "/dashboard",
+    response_model=DashboardResponse,
+    summary="Obtener varios gráficos en una sola llamada",
+    description="Endpoint que devuelve los datos de varios gráficos de /analytics en una sola respuesta. "
+                "Los gráficos se calculan en paralelo sobre el mismo snapshot de la base, así que todos "
+                "corresponden a la misma versión de los datos. "
+                "Cada gráfico se devuelve igual que en su endpoint individual."
+)
+def get_dashboard(
+    pedido: DashboardRequest,
+    service: DashboardService = Depends(get_dashboard_service)
+):
+    """
+    Obtiene los datos de varios gráficos listos para graficar.
+
+    - **graficos**: Lista de gráficos a devolver, cada uno con:
+      - **id**: Ruta del endpoint individual (ej: "jueces-mayor-demora")
+      - **params**: Parámetros del endpoint (ej: {"limit": 10}); los omitidos toman su default
+
+    Retorna:
+    - **version_datos**: Versión de los datos (fecha de última actualización) de todos los gráficos
+    - **graficos**: Lista en el mismo orden del pedido, con id, params efectivos y datos
+    """
+    try:
+        cuerpo = service.get_dashboard(pedido.graficos)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return Response(content=cuerpo, media_type="application/json")
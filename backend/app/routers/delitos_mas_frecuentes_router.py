@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from app.core.cache import respuesta_cacheada
 from app.services.delitos_mas_frecuentes_service import DelitosMasFrecuentesService
 from app.repositories.expediente_repository import (
     ExpedienteRepository,
@@ -19,6 +20,7 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
                 "No requiere procesamiento adicional en el frontend."
 )
 def get_delitos_mas_frecuentes(
+    request: Request,
     limit: int = 10,
     expediente_repo: ExpedienteRepository = Depends(get_expediente_repository)
 ):
@@ -39,5 +41,8 @@ def get_delitos_mas_frecuentes(
     # Crear el service con el repository inyectado
     service = DelitosMasFrecuentesService(expediente_repo)
     
-    return service.get_datos_grafico(limit=limit)
+    return respuesta_cacheada(
+        request, "delitos-mas-frecuentes", {"limit": limit},
+        lambda: service.get_datos_grafico(limit=limit)
+    )
 
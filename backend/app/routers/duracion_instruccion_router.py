@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from app.core.cache import respuesta_cacheada
 from app.services.duracion_instruccion_service import DuracionInstruccionService
 from app.repositories.expediente_repository import (
     ExpedienteRepository,
@@ -20,6 +21,7 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
                 "No requiere procesamiento adicional en el frontend."
 )
 def get_duracion_instruccion(
+    request: Request,
     limit: int = 50,
     expediente_repo: ExpedienteRepository = Depends(get_expediente_repository)
 ):
@@ -43,5 +45,8 @@ def get_duracion_instruccion(
     # Crear el service con el repository inyectado
     service = DuracionInstruccionService(expediente_repo)
     
-    return service.get_datos_grafico(limit=limit)
+    return respuesta_cacheada(
+        request, "duracion-instruccion", {"limit": limit},
+        lambda: service.get_datos_grafico(limit=limit)
+    )
 
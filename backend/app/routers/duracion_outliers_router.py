@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from app.core.cache import respuesta_cacheada
 from app.services.duracion_outliers_service import DuracionOutliersService
 from app.repositories.expediente_repository import (
     ExpedienteRepository,
@@ -19,6 +20,7 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
                 "No requiere procesamiento adicional en el frontend."
 )
 def get_duracion_outliers(
+    request: Request,
     limit: int = 5,
     expediente_repo: ExpedienteRepository = Depends(get_expediente_repository)
 ):
@@ -46,5 +48,8 @@ def get_duracion_outliers(
     # Crear el service con el repository inyectado
     service = DuracionOutliersService(expediente_repo)
     
-    return service.get_datos_outliers(limit=limit)
+    return respuesta_cacheada(
+        request, "duracion-outliers", {"limit": limit},
+        lambda: service.get_datos_outliers(limit=limit)
+    )
 
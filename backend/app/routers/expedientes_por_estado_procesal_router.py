@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from app.core.cache import respuesta_cacheada
 from app.services.causas_por_estado_procesal_service import CausasPorEstadoProcesalService
 from app.repositories.expediente_repository import (
     ExpedienteRepository,
@@ -18,10 +19,14 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
                 "No requiere procesamiento adicional en el frontend."
 )
 def get_casos_por_estado_procesal(
+    request: Request,
     expediente_repo: ExpedienteRepository = Depends(get_expediente_repository)
 ):
     """Obtiene datos procesados y agregados por estado procesal listos para graficar."""
     service = CausasPorEstadoProcesalService(expediente_repo)
     
-    return service.get_datos_grafico()
+    return respuesta_cacheada(
+        request, "casos-por-estado", {},
+        lambda: service.get_datos_grafico()
+    )
 
@@ -0,0 +1,98 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.services.expedientes_service import CursorInvalidoError, ExpedientesService
+from app.repositories.expediente_repository import (
+    ExpedienteRepository,
+    get_expediente_repository
+)
+from app.schemas.expedientes_schema import ExpedientesBusquedaResponse, ExpedientesPaginaResponse
+
+router = APIRouter(prefix="/expedientes", tags=["expedientes"])
+
+
+@router.get(
+    "",
+    response_model=ExpedientesPaginaResponse,
+    summary="Listar expedientes paginados por cursor",
+    description="Endpoint que devuelve expedientes de a páginas, ordenados por número de expediente "
+                "o por fecha de inicio, con filtros opcionales. "
+                "Para pedir la página siguiente se pasa el siguiente_cursor de la respuesta anterior; "
+                "cualquier página cuesta lo mismo que la primera."
+)
+def get_expedientes(
+    orden: Literal["numero_expediente", "fecha_inicio"] = "numero_expediente",
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    estado_procesal: Optional[str] = None,
+    tribunal: Optional[str] = None,
+    jurisdiccion: Optional[str] = None,
+    fiscal: Optional[str] = None,
+    fiscalia: Optional[str] = None,
+    expediente_repo: ExpedienteRepository = Depends(get_expediente_repository)
+):
+    """
+    Obtiene una página de expedientes.
+    
+    - **orden**: 'numero_expediente' (default) o 'fecha_inicio' (las fechas nulas van al final)
+    - **cursor**: siguiente_cursor de la página anterior; omitir para la primera página
+    - **limit**: Tamaño de la página (default: 50, máximo: 500)
+    - **estado_procesal**, **tribunal**, **jurisdiccion**, **fiscal**, **fiscalia**: Filtros por valor exacto
+    
+    Retorna:
+    - **expedientes**: Lista de expedientes de la página
+    - **siguiente_cursor**: Cursor de la página siguiente, o null si es la última
+    """
+    service = ExpedientesService(expediente_repo)
+    
+    try:
+        return service.get_pagina(
+            orden=orden,
+            cursor=cursor,
+            limit=limit,
+            filtros={
+                "estado_procesal": estado_procesal,
+                "tribunal": tribunal,
+                "jurisdiccion": jurisdiccion,
+                "fiscal": fiscal,
+                "fiscalia": fiscalia,
+            }
+        )
+    except CursorInvalidoError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get(
+    "/search",
+    response_model=ExpedientesBusquedaResponse,
+    summary="Buscar expedientes por carátula o número",
+    description="Endpoint de búsqueda pensado para autocompletar: busca el texto en la carátula "
+                "(sin distinguir acentos ni mayúsculas, con la última palabra como prefijo) y como "
+                "comienzo del número de expediente, y devuelve los resultados más relevantes con "
+                "las posiciones de las coincidencias para resaltarlas."
+)
+def search_expedientes(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    expediente_repo: ExpedienteRepository = Depends(get_expediente_repository)
+):
+    """
+    Busca expedientes por carátula o número de expediente.
+    
+    - **q**: Texto a buscar (ej: "fernandez kirch", "CFP 1234")
+    - **limit**: Número máximo de resultados (default: 20, máximo: 100)
+    
+    Retorna:
+    - **consulta**: Texto buscado
+    - **resultados**: Expedientes ordenados por relevancia, cada uno con:
+      - **numero_expediente**, **caratula**, **tribunal**, **estado_procesal**, **fecha_inicio**
+      - **coincidencias**: Tramos encontrados como {campo, inicio, fin}: posiciones de
+        caracteres sobre **caratula** o **numero_expediente**, para resaltarlos del lado
+        del cliente (la respuesta no trae HTML)
+      - **relevancia**: Puntaje de relevancia (mayor es más relevante)
+    """
+    service = ExpedientesService(expediente_repo)
+    
+    try:
+        return service.buscar(q, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Depends
-from fastapi.responses import StreamingResponse
+import base64
+from typing import Literal
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from app.core.cache import encabezados_para_etag
 from app.services.exportacion_service import (
     ExportacionService,
     get_exportacion_service
@@ -8,37 +11,60 @@ from app.services.exportacion_service import (
 router = APIRouter(prefix="/exportacion", tags=["exportacion"])
 
 
-@router.get(
+@router.api_route(
     "/descargar-base-de-datos",
+    methods=["GET", "HEAD"],
     summary="Descargar base de datos completa en formato ZIP",
     description="Exporta todas las tablas de la base de datos como archivos CSV "
-                "y los comprime en un archivo ZIP. Todo el proceso se realiza en memoria. "
+                "y los comprime en un archivo ZIP. El ZIP se arma una vez por versión de los datos, "
+                "mientras se envía la primera descarga, y se guarda en disco; las descargas "
+                "siguientes se sirven desde el archivo, con ETag "
+                "(checksum SHA-256), Content-Length y soporte de Range para reanudar descargas. "
+                "Con formato=parquet o formato=arrow cada tabla va en formato columnar "
+                "(Parquet o Arrow IPC) en lugar de CSV. "
                 "El archivo incluye las siguientes tablas: fuero, jurisdiccion, tribunal, "
                 "secretaria, expediente, radicacion, resolucion, parte, rol_parte, letrado, "
                 "representacion, expediente_delito, tipo_delito, plazo, juez, tribunal_juez."
 )
 def descargar_base_de_datos(
+    request: Request,
+    formato: Literal["csv", "parquet", "arrow"] = "csv",
     service: ExportacionService = Depends(get_exportacion_service)
 ):
     """
     Endpoint para descargar toda la base de datos como un archivo ZIP.
     
+    - **formato**: Formato de cada tabla dentro del ZIP:
+      - 'csv' (default): un archivo .csv por tabla
+      - 'parquet': un archivo .parquet por tabla (zstd, columnas de texto repetitivas
+        como tribunal, estado_procesal o rol con dictionary encoding)
+      - 'arrow': un archivo .arrows por tabla (Arrow IPC en formato streaming, zstd)
+    
     Retorna:
     - Un archivo ZIP que contiene todos los datos de la base de datos
-    - Cada tabla se exporta como un archivo CSV individual
-    - El nombre del archivo es: base_corrupcion.zip
+    - Cada tabla se exporta como un archivo individual en el formato pedido
+    - El nombre del archivo es: base_corrupcion.zip (base_corrupcion_parquet.zip o
+      base_corrupcion_arrow.zip en los formatos columnares)
     
-    El proceso se realiza completamente en memoria, sin escribir archivos en disco.
+    La primera descarga de cada versión de los datos arma el ZIP (leyendo las
+    tablas de a lotes) y lo envía a medida que se genera, mientras lo guarda;
+    las siguientes no consultan la base. Con If-None-Match responde 304 si el
+    cliente ya tiene esta versión, y con Range / If-Range se puede reanudar
+    una descarga cortada (el checksum, y por lo tanto el ETag, recién se
+    conoce cuando el ZIP está guardado).
     """
-    # Generar el ZIP en memoria
-    zip_buffer = service.generar_zip_completo()
+    nombre = "base_corrupcion.zip" if formato == "csv" else f"base_corrupcion_{formato}.zip"
+    archivo = service.obtener_archivo_zip(formato)
     
-    # Retornar como StreamingResponse
-    return StreamingResponse(
-        zip_buffer,
-        media_type="application/zip",
-        headers={
-            "Content-Disposition": "attachment; filename=base_corrupcion.zip"
-        }
-    )
-
+    if archivo is None:
+        headers = {"Content-Disposition": f'attachment; filename="{nombre}"'}
+        if request.method == "HEAD":
+            return Response(media_type="application/zip", headers=headers)
+        return StreamingResponse(service.transmitir_zip(formato), media_type="application/zip", headers=headers)
+    
+    headers, no_modificado = encabezados_para_etag(request, f'"{archivo.sha256}"', archivo.fecha)
+    if no_modificado:
+        return Response(status_code=304, headers=headers)
+    headers["Repr-Digest"] = "sha-256=:" + base64.b64encode(bytes.fromhex(archivo.sha256)).decode("ascii") + ":"
+    
+    return FileResponse(archivo.ruta, media_type="application/zip", filename=nombre, headers=headers)
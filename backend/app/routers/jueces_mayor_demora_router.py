@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from app.core.cache import respuesta_cacheada
 from app.services.jueces_mayor_demora_service import JuecesMayorDemoraService
 from app.repositories.juez_repository import (
     JuezRepository,
@@ -18,6 +19,7 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
                 "No requiere procesamiento adicional en el frontend."
 )
 def get_jueces_mayor_demora(
+    request: Request,
     limit: int = 10,
     juez_repo: JuezRepository = Depends(get_juez_repository)
 ):
@@ -37,5 +39,8 @@ def get_jueces_mayor_demora(
     # Crear el service con el repository inyectado
     service = JuecesMayorDemoraService(juez_repo)
     
-    return service.get_datos_grafico(limit=limit)
+    return respuesta_cacheada(
+        request, "jueces-mayor-demora", {"limit": limit},
+        lambda: service.get_datos_grafico(limit=limit)
+    )
 
@@ -5,7 +5,9 @@ from app.repositories.metadata_repository import (
     MetadataRepository,
     get_metadata_repository
 )
-from app.schemas.metadata_schema import UltimaActualizacionResponse
+from app.core.cache import cache_analytics, get_version_datos
+from app.core.config import settings
+from app.schemas.metadata_schema import UltimaActualizacionResponse, EstadisticasCacheResponse
 
 # Zona horaria de Argentina
 TZ_ARGENTINA = ZoneInfo("America/Argentina/Buenos_Aires")
@@ -58,3 +60,26 @@ def get_ultima_actualizacion(
         formato_fecha=formato_fecha
     )
 
+
+@router.get(
+    "/cache",
+    response_model=EstadisticasCacheResponse,
+    summary="Obtener estadísticas del cache de respuestas",
+    description="Endpoint que devuelve el tamaño y los contadores de aciertos y fallos del cache "
+                "en memoria de los endpoints de /analytics."
+)
+def get_estadisticas_cache():
+    """
+    Obtiene el estado del cache de respuestas de este proceso.
+    
+    Retorna:
+    - **version_datos**: Versión de los datos vigente (fecha de última actualización)
+    - **entradas** / **bytes** / **max_bytes**: Ocupación del cache
+    - **hits** / **misses** / **hit_ratio**: Aciertos y fallos desde que arrancó el proceso
+    - **desalojos**: Entradas desalojadas por falta de espacio
+    """
+    return EstadisticasCacheResponse(
+        habilitado=settings.CACHE_HABILITADO,
+        version_datos=get_version_datos()[0],
+        **cache_analytics.estadisticas()
+    )
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from app.core.cache import respuesta_cacheada
 from app.services.personas_mas_denunciadas_service import PersonasMasDenunciadasService
 from app.repositories.parte_repository import (
     ParteRepository,
@@ -19,6 +20,7 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
                 "No requiere procesamiento adicional en el frontend."
 )
 def get_personas_mas_denunciadas(
+    request: Request,
     limit: int = 20,
     parte_repo: ParteRepository = Depends(get_parte_repository)
 ):
@@ -39,5 +41,8 @@ def get_personas_mas_denunciadas(
     # Crear el service con el repository inyectado
     service = PersonasMasDenunciadasService(parte_repo)
     
-    return service.get_datos_grafico(limit=limit)
+    return respuesta_cacheada(
+        request, "personas-mas-denunciadas", {"limit": limit},
+        lambda: service.get_datos_grafico(limit=limit)
+    )
 
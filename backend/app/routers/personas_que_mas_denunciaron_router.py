@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from app.core.cache import respuesta_cacheada
 from app.services.personas_que_mas_denunciaron_service import PersonasQueMasDenunciaronService
 from app.repositories.parte_repository import (
     ParteRepository,
@@ -19,6 +20,7 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
                 "No requiere procesamiento adicional en el frontend."
 )
 def get_personas_que_mas_denunciaron(
+    request: Request,
     limit: int = 20,
     parte_repo: ParteRepository = Depends(get_parte_repository)
 ):
@@ -39,5 +41,8 @@ def get_personas_que_mas_denunciaron(
     # Crear el service con el repository inyectado
     service = PersonasQueMasDenunciaronService(parte_repo)
     
-    return service.get_datos_grafico(limit=limit)
+    return respuesta_cacheada(
+        request, "personas-que-mas-denunciaron", {"limit": limit},
+        lambda: service.get_datos_grafico(limit=limit)
+    )
 
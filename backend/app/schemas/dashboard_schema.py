@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal
+
+# Gráficos que puede pedir el dashboard: los mismos ids que las rutas de /analytics
+GraficoId = Literal[
+    "casos-por-estado",
+    "jueces-mayor-demora",
+    "causas-iniciadas-por-ano",
+    "delitos-mas-frecuentes",
+    "causas-en-tramite-por-juzgado",
+    "duracion-instruccion",
+    "duracion-outliers",
+    "causas-por-fuero",
+    "personas-mas-denunciadas",
+    "personas-que-mas-denunciaron",
+    "causas-por-fiscal",
+]
+
+
+class GraficoSolicitado(BaseModel):
+    """Gráfico pedido al dashboard, con sus parámetros (ej: {"limit": 10})"""
+    id: GraficoId
+    params: Dict[str, int] = Field(default_factory=dict)
+
+
+class DashboardRequest(BaseModel):
+    """Schema del pedido de varios gráficos en una sola llamada"""
+    graficos: List[GraficoSolicitado] = Field(min_length=1)
+
+
+class GraficoDashboard(BaseModel):
+    """Respuesta de un gráfico, igual a la de su endpoint individual"""
+    id: GraficoId
+    params: Dict[str, int]  # Parámetros efectivos, con los defaults aplicados
+    datos: Dict[str, Any]
+
+
+class DashboardResponse(BaseModel):
+    """Schema de respuesta del dashboard: todos los gráficos sobre la misma versión de los datos"""
+    version_datos: str
+    graficos: List[GraficoDashboard]  # En el mismo orden en que se pidieron
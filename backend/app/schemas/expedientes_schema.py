@@ -0,0 +1,67 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Literal, Optional
+
+
+class ExpedienteItem(BaseModel):
+    """Item individual de expediente"""
+    numero_expediente: str
+    caratula: Optional[str]
+    jurisdiccion: Optional[str]
+    tribunal: Optional[str]
+    camara_origen: Optional[str]
+    delitos: Optional[str]
+    fiscal: Optional[str]
+    fiscalia: Optional[str]
+    estado_procesal: Optional[str]
+    fecha_inicio: Optional[date]
+    fecha_ultimo_movimiento: Optional[date]
+    ano_inicio: Optional[int]
+    
+    class Config:
+        from_attributes = True
+
+
+class ExpedientesPaginaResponse(BaseModel):
+    """Schema de respuesta de una página de expedientes (paginación por cursor)"""
+    expedientes: List[ExpedienteItem]
+    siguiente_cursor: Optional[str]  # None si es la última página
+    
+    class Config:
+        from_attributes = True
+
+
+class Coincidencia(BaseModel):
+    """
+    Tramo de un campo que coincide con la búsqueda: posiciones [inicio, fin)
+    en caracteres Unicode (code points) sobre el valor del campo tal como
+    viene en la respuesta. La API no devuelve HTML: para resaltar, el cliente
+    corta el texto en esas posiciones y escapa cada parte como cualquier texto.
+    Los tramos de un mismo campo vienen ordenados y no se superponen.
+    """
+    campo: Literal["caratula", "numero_expediente"]
+    inicio: int
+    fin: int
+
+
+class ExpedienteBusquedaItem(BaseModel):
+    """Item individual de resultado de búsqueda de expedientes"""
+    numero_expediente: str
+    caratula: Optional[str]
+    coincidencias: List[Coincidencia]  # Qué resaltar en caratula y numero_expediente
+    tribunal: Optional[str]
+    estado_procesal: Optional[str]
+    fecha_inicio: Optional[date]
+    relevancia: float
+    
+    class Config:
+        from_attributes = True
+
+
+class ExpedientesBusquedaResponse(BaseModel):
+    """Schema de respuesta de la búsqueda de expedientes, ordenada por relevancia"""
+    consulta: str
+    resultados: List[ExpedienteBusquedaItem]
+    
+    class Config:
+        from_attributes = True
@@ -15,3 +15,16 @@ class UltimaActualizacionResponse(BaseModel):
 
 
 
+
+
+class EstadisticasCacheResponse(BaseModel):
+    """Schema de respuesta con el estado del cache de /analytics"""
+    habilitado: bool
+    version_datos: str  # Versión de los datos con la que se arman las claves
+    entradas: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    desalojos: int
+    hit_ratio: float
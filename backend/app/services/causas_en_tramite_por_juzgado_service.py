@@ -1,4 +1,4 @@
-from typing import Generator, List
+from typing import Generator, List, Any, Dict
 from app.repositories.expediente_repository import ExpedienteRepository
 from app.schemas.causas_en_tramite_por_juzgado_schema import (
     CausasEnTramitePorJuzgadoResponse,
@@ -19,7 +19,8 @@ class CausasEnTramitePorJuzgadoService:
         Inicializa el service con el repository de expedientes.
         
         Args:
-            expediente_repository: Instancia del ExpedienteRepository
+            expediente_repository: Instancia del ExpedienteRepository (o del AsyncExpedienteRepository,
+                para los métodos *_async)
         """
         self.expediente_repository = expediente_repository
     
@@ -43,7 +44,18 @@ class CausasEnTramitePorJuzgadoService:
         """
         # Obtener datos del repository
         juzgados_data = self.expediente_repository.get_causas_por_juzgado(limit=limit)
-        
+        return self._armar_respuesta(juzgados_data)
+    
+    async def get_datos_grafico_async(self, limit: int = 20) -> CausasEnTramitePorJuzgadoResponse:
+        """
+        Igual que get_datos_grafico, con un AsyncExpedienteRepository: espera la consulta
+        sin bloquear el event loop.
+        """
+        juzgados_data = await self.expediente_repository.get_causas_por_juzgado(limit=limit)
+        return self._armar_respuesta(juzgados_data)
+    
+    def _armar_respuesta(self, juzgados_data: List[Dict[str, Any]]) -> CausasEnTramitePorJuzgadoResponse:
+        """Procesa los datos del repository y arma la respuesta del gráfico."""
         # Procesar datos para el gráfico
         labels = []
         causas_abiertas = []
@@ -1,4 +1,4 @@
-from typing import Generator
+from typing import Generator, Any, Dict, List
 from app.repositories.expediente_repository import ExpedienteRepository
 from app.schemas.causas_iniciadas_por_ano_schema import (
     CausasIniciadasPorAnoResponse,
@@ -18,7 +18,8 @@ class CausasIniciadasPorAnoService:
         Inicializa el service con el repository de expedientes.
         
         Args:
-            expediente_repository: Instancia del ExpedienteRepository
+            expediente_repository: Instancia del ExpedienteRepository (o del AsyncExpedienteRepository,
+                para los métodos *_async)
         """
         self.expediente_repository = expediente_repository
     
@@ -39,7 +40,18 @@ class CausasIniciadasPorAnoService:
         """
         # Obtener datos del repository
         datos_por_ano = self.expediente_repository.count_by_year()
-        
+        return self._armar_respuesta(datos_por_ano)
+    
+    async def get_datos_grafico_async(self) -> CausasIniciadasPorAnoResponse:
+        """
+        Igual que get_datos_grafico, con un AsyncExpedienteRepository: espera la consulta
+        sin bloquear el event loop.
+        """
+        datos_por_ano = await self.expediente_repository.count_by_year()
+        return self._armar_respuesta(datos_por_ano)
+    
+    def _armar_respuesta(self, datos_por_ano: List[Dict[str, Any]]) -> CausasIniciadasPorAnoResponse:
+        """Procesa los datos del repository y arma la respuesta del gráfico."""
         # Procesar datos para el gráfico
         labels = []
         causas_abiertas = []
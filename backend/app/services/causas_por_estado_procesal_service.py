@@ -1,10 +1,13 @@
-from typing import Generator
+from typing import Generator, List
 from app.repositories.expediente_repository import ExpedienteRepository
 from app.schemas.expedientes_por_estado_procesal_schema import (
     CasosPorEstadoProcesalResponse,
     DatosGraficoEstadoProcesal
 )
 
+# Estados procesales válidos
+ESTADOS = ['En trámite', 'Terminada']
+
 
 class CausasPorEstadoProcesalService:
     """
@@ -17,7 +20,8 @@ class CausasPorEstadoProcesalService:
         Inicializa el service con el repository de expedientes.
         
         Args:
-            expediente_repository: Instancia del ExpedienteRepository
+            expediente_repository: Instancia del ExpedienteRepository (o del AsyncExpedienteRepository,
+                para los métodos *_async)
         """
         self.expediente_repository = expediente_repository
     
@@ -34,15 +38,25 @@ class CausasPorEstadoProcesalService:
         - porcentajes: Lista de porcentajes por estado
         - total: Total de casos
         """
-        # Estados procesales válidos
-        estados = ['En trámite', 'Terminada']
-        
         # Obtener conteos por estado
         conteos = []
-        for estado in estados:
+        for estado in ESTADOS:
             count = self.expediente_repository.count_by_estado_procesal(estado)
             conteos.append(count)
-        
+        return self._armar_respuesta(conteos)
+    
+    async def get_datos_grafico_async(self) -> CasosPorEstadoProcesalResponse:
+        """
+        Igual que get_datos_grafico, con un AsyncExpedienteRepository: espera las consultas
+        sin bloquear el event loop.
+        """
+        conteos = []
+        for estado in ESTADOS:
+            conteos.append(await self.expediente_repository.count_by_estado_procesal(estado))
+        return self._armar_respuesta(conteos)
+    
+    def _armar_respuesta(self, conteos: List[int]) -> CasosPorEstadoProcesalResponse:
+        """Arma la respuesta del gráfico con los conteos de cada estado de ESTADOS."""
         # Calcular total
         total = sum(conteos)
         
@@ -55,7 +69,7 @@ class CausasPorEstadoProcesalService:
         
         # Preparar datos del gráfico
         datos_grafico = DatosGraficoEstadoProcesal(
-            labels=estados,
+            labels=ESTADOS,
             data=conteos,
             porcentajes=porcentajes,
             total=total
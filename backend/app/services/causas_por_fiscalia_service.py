@@ -1,4 +1,4 @@
-from typing import Generator
+from typing import Generator, Any, Dict, List
 from app.repositories.expediente_repository import ExpedienteRepository
 from app.schemas.causas_por_fiscalia_schema import (
     CausasPorFiscaliaResponse,
@@ -19,7 +19,8 @@ class CausasPorFiscaliaService:
         Inicializa el service con el repository de expedientes.
         
         Args:
-            expediente_repository: Instancia del ExpedienteRepository
+            expediente_repository: Instancia del ExpedienteRepository (o del AsyncExpedienteRepository,
+                para los métodos *_async)
         """
         self.expediente_repository = expediente_repository
     
@@ -42,7 +43,18 @@ class CausasPorFiscaliaService:
         """
         # Obtener datos del repository
         fiscalias_data = self.expediente_repository.get_causas_por_fiscalia(limit=limit)
-        
+        return self._armar_respuesta(fiscalias_data)
+    
+    async def get_datos_grafico_async(self, limit: int = 20) -> CausasPorFiscaliaResponse:
+        """
+        Igual que get_datos_grafico, con un AsyncExpedienteRepository: espera la consulta
+        sin bloquear el event loop.
+        """
+        fiscalias_data = await self.expediente_repository.get_causas_por_fiscalia(limit=limit)
+        return self._armar_respuesta(fiscalias_data)
+    
+    def _armar_respuesta(self, fiscalias_data: List[Dict[str, Any]]) -> CausasPorFiscaliaResponse:
+        """Procesa los datos del repository y arma la respuesta del gráfico."""
         # Procesar datos para el gráfico
         labels = []
         causas_abiertas = []
@@ -1,4 +1,4 @@
-from typing import Generator, List
+from typing import Generator, List, Any, Dict
 from app.repositories.expediente_repository import ExpedienteRepository
 from app.schemas.causas_por_fuero_schema import (
     CausasPorFueroResponse,
@@ -19,7 +19,8 @@ class CausasPorFueroService:
         Inicializa el service con el repository de expedientes.
         
         Args:
-            expediente_repository: Instancia del ExpedienteRepository
+            expediente_repository: Instancia del ExpedienteRepository (o del AsyncExpedienteRepository,
+                para los métodos *_async)
         """
         self.expediente_repository = expediente_repository
     
@@ -40,7 +41,18 @@ class CausasPorFueroService:
         """
         # Obtener datos del repository
         fueros_data = self.expediente_repository.get_causas_por_fuero()
-        
+        return self._armar_respuesta(fueros_data)
+    
+    async def get_datos_grafico_async(self) -> CausasPorFueroResponse:
+        """
+        Igual que get_datos_grafico, con un AsyncExpedienteRepository: espera la consulta
+        sin bloquear el event loop.
+        """
+        fueros_data = await self.expediente_repository.get_causas_por_fuero()
+        return self._armar_respuesta(fueros_data)
+    
+    def _armar_respuesta(self, fueros_data: List[Dict[str, Any]]) -> CausasPorFueroResponse:
+        """Procesa los datos del repository y arma la respuesta del gráfico."""
         # Procesar datos para el gráfico
         labels = []
         causas_abiertas = []
@@ -0,0 +1,219 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import text
+
+from app.core.cache import buscar_en_cache, get_version_datos, guardar_en_cache, version_de_fecha
+from app.core.config import settings
+from app.core.database import ConexionesParalelas, SessionLocal, conexiones_dashboard
+from app.repositories.expediente_repository import ExpedienteRepository
+from app.repositories.juez_repository import JuezRepository
+from app.repositories.metadata_repository import MetadataRepository
+from app.repositories.parte_repository import ParteRepository
+from app.schemas.dashboard_schema import GraficoSolicitado
+from app.services.causas_en_tramite_por_juzgado_service import CausasEnTramitePorJuzgadoService
+from app.services.causas_iniciadas_por_ano_service import CausasIniciadasPorAnoService
+from app.services.causas_por_estado_procesal_service import CausasPorEstadoProcesalService
+from app.services.causas_por_fiscalia_service import CausasPorFiscaliaService
+from app.services.causas_por_fuero_service import CausasPorFueroService
+from app.services.delitos_mas_frecuentes_service import DelitosMasFrecuentesService
+from app.services.duracion_instruccion_service import DuracionInstruccionService
+from app.services.duracion_outliers_service import DuracionOutliersService
+from app.services.jueces_mayor_demora_service import JuecesMayorDemoraService
+from app.services.personas_mas_denunciadas_service import PersonasMasDenunciadasService
+from app.services.personas_que_mas_denunciaron_service import PersonasQueMasDenunciaronService
+
+
+class Grafico(NamedTuple):
+    """Cómo arma un gráfico del dashboard su endpoint individual"""
+    repositorio: type
+    service: type
+    metodo: str
+    defaults: Dict[str, int]  # Parámetros aceptados y sus valores por defecto
+
+
+# Mismos ids, defaults y claves de cache que los endpoints individuales de /analytics
+GRAFICOS: Dict[str, Grafico] = {
+    "casos-por-estado": Grafico(
+        ExpedienteRepository, CausasPorEstadoProcesalService, "get_datos_grafico", {}),
+    "jueces-mayor-demora": Grafico(
+        JuezRepository, JuecesMayorDemoraService, "get_datos_grafico", {"limit": 10}),
+    "causas-iniciadas-por-ano": Grafico(
+        ExpedienteRepository, CausasIniciadasPorAnoService, "get_datos_grafico", {}),
+    "delitos-mas-frecuentes": Grafico(
+        ExpedienteRepository, DelitosMasFrecuentesService, "get_datos_grafico", {"limit": 10}),
+    "causas-en-tramite-por-juzgado": Grafico(
+        ExpedienteRepository, CausasEnTramitePorJuzgadoService, "get_datos_grafico", {"limit": 20}),
+    "duracion-instruccion": Grafico(
+        ExpedienteRepository, DuracionInstruccionService, "get_datos_grafico", {"limit": 50}),
+    "duracion-outliers": Grafico(
+        ExpedienteRepository, DuracionOutliersService, "get_datos_outliers", {"limit": 5}),
+    "causas-por-fuero": Grafico(
+        ExpedienteRepository, CausasPorFueroService, "get_datos_grafico", {}),
+    "personas-mas-denunciadas": Grafico(
+        ParteRepository, PersonasMasDenunciadasService, "get_datos_grafico", {"limit": 20}),
+    "personas-que-mas-denunciaron": Grafico(
+        ParteRepository, PersonasQueMasDenunciaronService, "get_datos_grafico", {"limit": 20}),
+    "causas-por-fiscal": Grafico(
+        ExpedienteRepository, CausasPorFiscaliaService, "get_datos_grafico", {"limit": 20}),
+}
+
+
+def calcular_grafico(db: Session, endpoint: str, parametros: Dict[str, int]) -> Any:
+    """
+    Arma la respuesta de un gráfico con su service y repository, sobre la sesión dada.
+
+    Args:
+        db: Sesión de SQLAlchemy
+        endpoint: Id del gráfico, de GRAFICOS
+        parametros: Parámetros efectivos del gráfico
+
+    Returns:
+        La respuesta del service (schema de Pydantic)
+    """
+    grafico = GRAFICOS[endpoint]
+    service = grafico.service(grafico.repositorio(db))
+    return getattr(service, grafico.metodo)(**parametros)
+
+
+class DashboardService:
+    """
+    Service para armar varios gráficos de /analytics en una sola llamada.
+    Los gráficos que no están en el cache se calculan en paralelo, cada uno
+    con su propia conexión de un pool aparte (conexiones_dashboard), y todos
+    sobre el mismo snapshot de la base (pg_export_snapshot), así que ven la
+    misma versión de los datos aunque una carga se publique en el medio.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker = SessionLocal,
+        workers: Optional[int] = None,
+        paralelas: ConexionesParalelas = conexiones_dashboard
+    ):
+        """
+        Inicializa el service.
+
+        Args:
+            session_factory: Fábrica de sesiones de SQLAlchemy (la que sostiene el snapshot)
+            workers: Máximo de gráficos calculados a la vez (default: settings.DASHBOARD_WORKERS)
+            paralelas: Pool de las sesiones de los gráficos calculados en paralelo
+        """
+        self.session_factory = session_factory
+        self.workers = workers or settings.DASHBOARD_WORKERS
+        self.paralelas = paralelas
+
+    @staticmethod
+    def parametros_efectivos(solicitado: GraficoSolicitado) -> Dict[str, int]:
+        """
+        Aplica los defaults del gráfico a los parámetros pedidos.
+
+        Raises:
+            ValueError: Si se pide un parámetro que el gráfico no acepta
+        """
+        defaults = GRAFICOS[solicitado.id].defaults
+        desconocidos = set(solicitado.params) - set(defaults)
+        if desconocidos:
+            raise ValueError(
+                f"El gráfico '{solicitado.id}' no acepta los parámetros: {', '.join(sorted(desconocidos))}"
+            )
+        return {**defaults, **solicitado.params}
+
+    def _sesion_en_snapshot(self, snapshot: str) -> Session:
+        db = self.paralelas.sesiones()
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        # Tiene que ser la primera sentencia de la transacción
+        db.execute(text("SET TRANSACTION SNAPSHOT :snapshot"), {"snapshot": snapshot})
+        return db
+
+    def _calcular_en_snapshot(
+        self,
+        principal: Session,
+        pendientes: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """
+        Calcula los gráficos pendientes en paralelo, todos sobre el snapshot de
+        la transacción de `principal`, que debe seguir abierta hasta el final.
+        Si no hay conexiones libres en el pool de los gráficos (otros dashboards
+        las están usando) se calculan de a uno sobre `principal`, sin esperar.
+        """
+        with self.paralelas.reservar(min(self.workers, len(pendientes))) as reservadas:
+            if reservadas < 2:
+                return [
+                    calcular_grafico(principal, pendiente["id"], pendiente["params"])
+                    for pendiente in pendientes
+                ]
+
+            snapshot = principal.execute(text("SELECT pg_export_snapshot()")).scalar()
+
+            def calcular(pendiente: Dict[str, Any]) -> Any:
+                db = self._sesion_en_snapshot(snapshot)
+                try:
+                    return calcular_grafico(db, pendiente["id"], pendiente["params"])
+                finally:
+                    db.close()
+
+            with ThreadPoolExecutor(max_workers=reservadas) as executor:
+                return list(executor.map(calcular, pendientes))
+
+    def get_dashboard(self, solicitados: List[GraficoSolicitado]) -> bytes:
+        """
+        Obtiene los gráficos pedidos, del cache o calculados.
+
+        Args:
+            solicitados: Gráficos a devolver, con sus parámetros
+
+        Returns:
+            Cuerpo JSON (DashboardResponse) ya serializado: los gráficos que
+            vienen del cache se insertan tal cual, sin volver a parsearlos
+
+        Raises:
+            ValueError: Si algún gráfico recibe parámetros que no acepta
+        """
+        graficos = [
+            {"id": solicitado.id, "params": self.parametros_efectivos(solicitado)}
+            for solicitado in solicitados
+        ]
+        version, _ = get_version_datos()
+        for grafico in graficos:
+            grafico["cuerpo"] = buscar_en_cache(grafico["id"], grafico["params"], version)
+        pendientes = [grafico for grafico in graficos if grafico["cuerpo"] is None]
+
+        if pendientes:
+            principal = self.session_factory()
+            try:
+                principal.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+                version_snapshot = version_de_fecha(MetadataRepository(principal).get_ultima_actualizacion())
+                if version_snapshot != version:
+                    # Se publicó una carga desde la última lectura de la versión:
+                    # lo que vino del cache es de otra versión, se recalcula todo
+                    version = version_snapshot
+                    pendientes = graficos
+                for grafico, respuesta in zip(pendientes, self._calcular_en_snapshot(principal, pendientes)):
+                    grafico["cuerpo"] = guardar_en_cache(grafico["id"], grafico["params"], version, respuesta)
+            finally:
+                principal.close()
+
+        partes = [
+            b'{"id":' + json.dumps(grafico["id"]).encode("utf-8")
+            + b',"params":' + json.dumps(grafico["params"]).encode("utf-8")
+            + b',"datos":' + grafico["cuerpo"] + b'}'
+            for grafico in graficos
+        ]
+        return (
+            b'{"version_datos":' + json.dumps(version).encode("utf-8")
+            + b',"graficos":[' + b",".join(partes) + b']}'
+        )
+
+
+def get_dashboard_service() -> DashboardService:
+    """
+    Dependency de FastAPI para obtener una instancia del DashboardService.
+    El service abre y cierra sus propias sesiones: la que sostiene el snapshot
+    y una por gráfico calculado en paralelo.
+
+    Returns:
+        Instancia de DashboardService
+    """
+    return DashboardService()
@@ -1,5 +1,5 @@
 import re
-from typing import Generator
+from typing import Any, Dict, Generator, List
 from app.repositories.expediente_repository import ExpedienteRepository
 from app.schemas.delitos_mas_frecuentes_schema import (
     DelitosMasFrecuentesResponse,
@@ -20,7 +20,8 @@ class DelitosMasFrecuentesService:
         Inicializa el service con el repository de expedientes.
         
         Args:
-            expediente_repository: Instancia del ExpedienteRepository
+            expediente_repository: Instancia del ExpedienteRepository (o del AsyncExpedienteRepository,
+                para los métodos *_async)
         """
         self.expediente_repository = expediente_repository
     
@@ -60,7 +61,18 @@ class DelitosMasFrecuentesService:
         """
         # Obtener datos del repository
         delitos_data = self.expediente_repository.get_delitos_mas_frecuentes(limit=limit)
-        
+        return self._armar_respuesta(delitos_data)
+    
+    async def get_datos_grafico_async(self, limit: int = 10) -> DelitosMasFrecuentesResponse:
+        """
+        Igual que get_datos_grafico, con un AsyncExpedienteRepository: espera la consulta
+        sin bloquear el event loop.
+        """
+        delitos_data = await self.expediente_repository.get_delitos_mas_frecuentes(limit=limit)
+        return self._armar_respuesta(delitos_data)
+    
+    def _armar_respuesta(self, delitos_data: List[Dict[str, Any]]) -> DelitosMasFrecuentesResponse:
+        """Procesa los datos del repository y arma la respuesta del gráfico."""
         # Procesar datos para el gráfico
         labels = []
         causas_abiertas = []
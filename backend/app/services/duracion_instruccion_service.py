@@ -1,4 +1,4 @@
-from typing import Generator, List
+from typing import Any, Dict, Generator, List
 from app.repositories.expediente_repository import ExpedienteRepository
 from app.schemas.duracion_instruccion_schema import (
     DuracionInstruccionResponse,
@@ -18,7 +18,8 @@ class DuracionInstruccionService:
         Inicializa el service con el repository de expedientes.
         
         Args:
-            expediente_repository: Instancia del ExpedienteRepository
+            expediente_repository: Instancia del ExpedienteRepository (o del AsyncExpedienteRepository,
+                para los métodos *_async)
         """
         self.expediente_repository = expediente_repository
     
@@ -46,7 +47,23 @@ class DuracionInstruccionService:
         
         # Obtener datos del repository para el gráfico (limitadas por limit)
         causas_data = self.expediente_repository.get_duracion_instruccion(limit=limit)
-        
+        return self._armar_respuesta(estadisticas_globales, causas_data)
+    
+    async def get_datos_grafico_async(self, limit: int = 50) -> DuracionInstruccionResponse:
+        """
+        Igual que get_datos_grafico, con un AsyncExpedienteRepository: espera las consultas
+        sin bloquear el event loop.
+        """
+        estadisticas_globales = await self.expediente_repository.get_duracion_promedio_global()
+        causas_data = await self.expediente_repository.get_duracion_instruccion(limit=limit)
+        return self._armar_respuesta(estadisticas_globales, causas_data)
+    
+    def _armar_respuesta(
+        self,
+        estadisticas_globales: Dict[str, Any],
+        causas_data: List[Dict[str, Any]]
+    ) -> DuracionInstruccionResponse:
+        """Procesa los datos del repository y arma la respuesta del gráfico."""
         if not causas_data:
             # Si no hay datos, retornar estructura vacía
             return DuracionInstruccionResponse(
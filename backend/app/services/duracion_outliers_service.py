@@ -1,4 +1,4 @@
-from typing import Generator
+from typing import Any, Dict, Generator, List
 from app.repositories.expediente_repository import ExpedienteRepository
 from app.schemas.duracion_outliers_schema import (
     DuracionOutliersResponse,
@@ -18,7 +18,8 @@ class DuracionOutliersService:
         Inicializa el service con el repository de expedientes.
         
         Args:
-            expediente_repository: Instancia del ExpedienteRepository
+            expediente_repository: Instancia del ExpedienteRepository (o del AsyncExpedienteRepository,
+                para los métodos *_async)
         """
         self.expediente_repository = expediente_repository
     
@@ -39,7 +40,23 @@ class DuracionOutliersService:
         # Obtener datos del repository
         causas_mas_largas_data = self.expediente_repository.get_duracion_outliers_mas_largos(limit=limit)
         causas_mas_cortas_data = self.expediente_repository.get_duracion_outliers_mas_cortos(limit=limit)
-        
+        return self._armar_respuesta(causas_mas_largas_data, causas_mas_cortas_data)
+    
+    async def get_datos_outliers_async(self, limit: int = 5) -> DuracionOutliersResponse:
+        """
+        Igual que get_datos_outliers, con un AsyncExpedienteRepository: espera las consultas
+        sin bloquear el event loop.
+        """
+        causas_mas_largas_data = await self.expediente_repository.get_duracion_outliers_mas_largos(limit=limit)
+        causas_mas_cortas_data = await self.expediente_repository.get_duracion_outliers_mas_cortos(limit=limit)
+        return self._armar_respuesta(causas_mas_largas_data, causas_mas_cortas_data)
+    
+    def _armar_respuesta(
+        self,
+        causas_mas_largas_data: List[Dict[str, Any]],
+        causas_mas_cortas_data: List[Dict[str, Any]]
+    ) -> DuracionOutliersResponse:
+        """Procesa los datos del repository y arma la respuesta."""
         # Procesar causas más largas
         causas_mas_largas_items = []
         for causa in causas_mas_largas_data:
@@ -0,0 +1,137 @@
+import base64
+import json
+from datetime import date
+from typing import Dict, Optional, Tuple
+from app.repositories.expediente_repository import ExpedienteRepository
+from app.schemas.expedientes_schema import (
+    ExpedienteBusquedaItem,
+    ExpedienteItem,
+    ExpedientesBusquedaResponse,
+    ExpedientesPaginaResponse
+)
+
+ORDENES = ("numero_expediente", "fecha_inicio")
+
+
+class CursorInvalidoError(ValueError):
+    """El cursor no fue generado por este endpoint o no corresponde al orden pedido."""
+
+
+def codificar_cursor(orden: str, fecha_inicio: Optional[date], numero_expediente: str) -> str:
+    """
+    Arma el cursor opaco que apunta a la fila siguiente a (fecha_inicio, numero_expediente).
+    """
+    datos = {
+        "o": orden,
+        "f": fecha_inicio.isoformat() if fecha_inicio else None,
+        "n": numero_expediente,
+    }
+    crudo = json.dumps(datos, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(crudo).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str, orden: str) -> Tuple[Optional[date], str]:
+    """
+    Lee un cursor de codificar_cursor.
+
+    Returns:
+        Claves (fecha_inicio, numero_expediente) de la última fila de la página anterior
+
+    Raises:
+        CursorInvalidoError: Si el cursor está mal formado o es de otro orden
+    """
+    try:
+        crudo = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        datos = json.loads(crudo)
+        fecha = date.fromisoformat(datos["f"]) if datos["f"] else None
+        numero = str(datos["n"])
+        orden_cursor = datos["o"]
+    except (ValueError, TypeError, KeyError):
+        raise CursorInvalidoError("Cursor inválido")
+    if orden_cursor != orden:
+        raise CursorInvalidoError(f"El cursor es de una consulta ordenada por '{orden_cursor}', no por '{orden}'")
+    return fecha, numero
+
+
+class ExpedientesService:
+    """
+    Service para listar expedientes con paginación por cursor y buscarlos
+    por carátula o número.
+    """
+    
+    def __init__(self, expediente_repository: ExpedienteRepository):
+        """
+        Inicializa el service con el repository de expedientes.
+        
+        Args:
+            expediente_repository: Instancia del ExpedienteRepository
+        """
+        self.expediente_repository = expediente_repository
+    
+    def get_pagina(
+        self,
+        orden: str = "numero_expediente",
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        filtros: Optional[Dict[str, str]] = None
+    ) -> ExpedientesPaginaResponse:
+        """
+        Obtiene una página de expedientes.
+        
+        Args:
+            orden: Uno de ORDENES
+            cursor: siguiente_cursor de la página anterior, o None para la primera
+            limit: Tamaño de la página
+            filtros: Igualdades por columna (ver ExpedienteRepository.get_pagina)
+            
+        Returns:
+            ExpedientesPaginaResponse con los expedientes y el cursor de la página siguiente
+            
+        Raises:
+            CursorInvalidoError: Si el cursor no es válido para el orden pedido
+        """
+        despues_de = decodificar_cursor(cursor, orden) if cursor else None
+        
+        # Se pide una fila de más para saber si hay página siguiente
+        expedientes = self.expediente_repository.get_pagina(
+            orden=orden,
+            despues_de=despues_de,
+            limit=limit + 1,
+            filtros={columna: valor for columna, valor in (filtros or {}).items() if valor is not None}
+        )
+        
+        siguiente_cursor = None
+        if len(expedientes) > limit:
+            expedientes = expedientes[:limit]
+            ultimo = expedientes[-1]
+            siguiente_cursor = codificar_cursor(orden, ultimo.fecha_inicio, ultimo.numero_expediente)
+        
+        return ExpedientesPaginaResponse(
+            expedientes=[ExpedienteItem.model_validate(expediente) for expediente in expedientes],
+            siguiente_cursor=siguiente_cursor
+        )
+    
+    def buscar(self, texto: str, limit: int = 20) -> ExpedientesBusquedaResponse:
+        """
+        Busca expedientes por carátula o número de expediente.
+        
+        Args:
+            texto: Texto buscado (palabras de la carátula, o el comienzo del número)
+            limit: Número máximo de resultados
+            
+        Returns:
+            ExpedientesBusquedaResponse con los resultados ordenados por relevancia
+            
+        Raises:
+            ValueError: Si el texto no tiene letras ni números
+        """
+        consulta = texto.strip()
+        if not any(caracter.isalnum() for caracter in consulta):
+            raise ValueError("La búsqueda tiene que incluir letras o números")
+        
+        resultados = self.expediente_repository.buscar(consulta, limit=limit)
+        
+        return ExpedientesBusquedaResponse(
+            consulta=consulta,
+            resultados=[ExpedienteBusquedaItem(**resultado) for resultado in resultados]
+        )
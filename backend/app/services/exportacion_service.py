@@ -1,11 +1,307 @@
 import csv
+import hashlib
 import io
+import itertools
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
 import zipfile
-from typing import Generator
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Callable, ContextManager, Dict, Generator, Iterator, List, NamedTuple, Optional, Tuple
+import pyarrow as pa
+import pyarrow.parquet as pq
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import column, inspect, text, types
 
-from app.core.database import SessionLocal
+from app.core.cache import get_version_datos, version_de_fecha
+from app.core.config import settings
+from app.core.database import ConexionesParalelas, SessionLocal, conexiones_exportacion
+from app.repositories.metadata_repository import MetadataRepository
+
+# Marca de fin de la cola de bloques de un COPY
+_FIN = object()
+
+# Los ZIP de cada versión se llaman base_corrupcion_<versión>.<formato>.zip,
+# con su checksum al lado en base_corrupcion_<versión>.<formato>.zip.sha256.
+# La versión va como la fecha en UTC con ancho fijo (ver _nombre_version),
+# así los nombres de las versiones más viejas ordenan antes
+_PREFIJO_ARCHIVO = "base_corrupcion_"
+_NOMBRE_FECHA = re.compile(r"\d{8}T\d{12}")
+
+# Un lock por (versión, formato): el ZIP de cada uno lo arma una sola descarga
+_armado_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_armado_locks_lock = threading.Lock()
+
+
+class ArchivoExportacion(NamedTuple):
+    """ZIP de la base ya armado en disco"""
+    ruta: str
+    sha256: str
+    version: str
+    fecha: Optional[datetime]  # Fecha de la versión de los datos
+
+
+def _nombre_version(version: str) -> str:
+    """Versión como va en el nombre de los archivos: AAAAMMDDTHHMMSSffffff en UTC."""
+    try:
+        fecha = datetime.fromisoformat(version)
+    except ValueError:
+        # "sin-version"
+        return re.sub(r"[^0-9A-Za-z]+", "-", version).strip("-")
+    if fecha.tzinfo is not None:
+        fecha = fecha.astimezone(timezone.utc)
+    return fecha.strftime("%Y%m%dT%H%M%S%f")
+
+
+def _prefijo_version(version: str) -> str:
+    return os.path.join(settings.EXPORTACION_DIR, f"{_PREFIJO_ARCHIVO}{_nombre_version(version)}.")
+
+
+def _ruta_archivo(version: str, formato: str) -> str:
+    return f"{_prefijo_version(version)}{formato}.zip"
+
+
+def _lock_armado(version: str, formato: str) -> threading.Lock:
+    with _armado_locks_lock:
+        # Los locks de versiones anteriores ya no se piden
+        for clave in [clave for clave in _armado_locks if clave[0] != version]:
+            del _armado_locks[clave]
+        return _armado_locks.setdefault((version, formato), threading.Lock())
+
+
+def _leer_checksum(ruta: str) -> Optional[str]:
+    try:
+        with open(f"{ruta}.sha256", encoding="ascii") as archivo:
+            return archivo.read().split()[0]
+    except (OSError, IndexError):
+        return None
+
+
+def _es_anterior(nombre: str, publicada: str) -> bool:
+    """
+    Si el nombre de versión de un archivo es de una versión anterior a la
+    publicada. Los nombres que no son una fecha ("sin-version" o de otro
+    formato) cuentan como anteriores a cualquier fecha.
+    """
+    if _NOMBRE_FECHA.fullmatch(nombre):
+        return _NOMBRE_FECHA.fullmatch(publicada) is not None and nombre < publicada
+    return nombre != publicada and _NOMBRE_FECHA.fullmatch(publicada) is not None
+
+
+def _borrar_versiones_anteriores(version: str):
+    """
+    Borra los ZIP de las versiones anteriores a `version` (los que se están
+    armando, no). Los de versiones más nuevas quedan: los publicó una carga
+    posterior a la de este ZIP.
+    """
+    publicada = _nombre_version(version)
+    for nombre in os.listdir(settings.EXPORTACION_DIR):
+        if not nombre.startswith(_PREFIJO_ARCHIVO) or nombre.endswith(".parcial"):
+            continue
+        if _es_anterior(nombre[len(_PREFIJO_ARCHIVO):].split(".", 1)[0], publicada):
+            try:
+                os.remove(os.path.join(settings.EXPORTACION_DIR, nombre))
+            except OSError:
+                pass
+
+
+def _es_version_vigente(version: str) -> bool:
+    """
+    Si `version` sigue siendo la de los datos publicados. Lee metadata con una
+    sesión nueva: la de la exportación sigue en el snapshot en que empezó.
+    """
+    db = SessionLocal()
+    try:
+        return version_de_fecha(MetadataRepository(db).get_ultima_actualizacion()) == version
+    finally:
+        db.close()
+
+
+class _SalidaZip:
+    """
+    Destino de escritura del ZIP que no se puede rebobinar: acumula lo que
+    escribe zipfile hasta que se lo vacía para mandarlo al cliente. Como no
+    tiene seek(), zipfile escribe cada entrada con data descriptor en lugar
+    de volver a completar su encabezado.
+    """
+    
+    def __init__(self):
+        self.partes: List[bytes] = []
+    
+    def write(self, datos: bytes) -> int:
+        self.partes.append(bytes(datos))
+        return len(datos)
+    
+    def flush(self):
+        pass
+    
+    def vaciar(self) -> bytes:
+        datos = b"".join(self.partes)
+        self.partes.clear()
+        return datos
+
+
+class _EscritorCopy:
+    """
+    Destino de copy_expert. psycopg2 llama a write() una vez por fila: las
+    filas se juntan en bloques de `tamano` bytes antes de pasarlos a la cola,
+    que está acotada, así que si el cliente descarga más lento que lo que
+    escribe Postgres, el COPY espera.
+    """
+    
+    def __init__(self, cola: queue.Queue, cancelado: threading.Event, tamano: int):
+        self.cola = cola
+        self.cancelado = cancelado
+        self.tamano = tamano
+        self.bloque = bytearray()
+    
+    def write(self, datos: bytes) -> int:
+        self.bloque += datos
+        if len(self.bloque) >= self.tamano:
+            self.vaciar()
+        return len(datos)
+    
+    def vaciar(self):
+        if self.bloque and not self.cancelado.is_set():
+            self.cola.put(bytes(self.bloque))
+        self.bloque.clear()
+
+
+class _EscrituraContada:
+    """
+    Entrada del ZIP vista como archivo para pyarrow, que pregunta la posición
+    (tell) para armar el índice de Parquet; la entrada de zipfile no la sabe.
+    """
+    
+    def __init__(self, entrada):
+        self.entrada = entrada
+        self.posicion = 0
+        self.closed = False
+    
+    def write(self, datos) -> int:
+        self.entrada.write(datos)
+        self.posicion += len(datos)
+        return len(datos)
+    
+    def tell(self) -> int:
+        return self.posicion
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        # La entrada la cierra quien la abrió
+        self.closed = True
+
+
+def _tipo_arrow(tipo: types.TypeEngine, diccionario: bool) -> pa.DataType:
+    """Tipo de Arrow para una columna, según su tipo reflejado de la base."""
+    if isinstance(tipo, types.Boolean):
+        return pa.bool_()
+    if isinstance(tipo, types.SmallInteger):
+        return pa.int16()
+    if isinstance(tipo, types.BigInteger):
+        return pa.int64()
+    if isinstance(tipo, types.Integer):
+        return pa.int32()
+    if isinstance(tipo, types.Float):
+        return pa.float64()
+    if isinstance(tipo, types.Numeric) and tipo.precision:
+        return pa.decimal128(tipo.precision, tipo.scale or 0)
+    if isinstance(tipo, types.DateTime):
+        return pa.timestamp("us", tz="UTC" if tipo.timezone else None)
+    if isinstance(tipo, types.Date):
+        return pa.date32()
+    if diccionario:
+        return pa.dictionary(pa.int32(), pa.string())
+    # Texto y todo lo demás (numeric sin precisión, json, ...) como texto
+    return pa.string()
+
+
+def _columna_arrow(valores: tuple, tipo: pa.DataType) -> pa.Array:
+    if pa.types.is_dictionary(tipo):
+        return pa.array(valores, type=pa.string()).dictionary_encode()
+    if pa.types.is_string(tipo):
+        valores = [None if valor is None else str(valor) for valor in valores]
+    return pa.array(valores, type=tipo)
+
+
+class _EntradaComprimida:
+    """
+    Archivo de una entrada del ZIP que escribe un worker en su temporal: lo
+    comprime con deflate crudo (el mismo de zipfile para ZIP_DEFLATED) y
+    calcula el CRC a medida que se escribe, así el hilo de la descarga solo
+    copia bytes. zlib suelta el GIL mientras comprime y calcula el CRC, así
+    que las tablas se comprimen en paralelo.
+    """
+    
+    def __init__(self, nombre: str, compresion: int, temporal: BinaryIO):
+        self.nombre = nombre
+        self.compresion = compresion
+        self.temporal = temporal
+        self.compresor = (
+            zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            if compresion == zipfile.ZIP_DEFLATED else None
+        )
+        self.crc = 0
+        self.tamano = 0
+        self.tamano_comprimido = 0
+    
+    def write(self, datos) -> int:
+        tamano = len(datos)
+        self.crc = zlib.crc32(datos, self.crc)
+        self.tamano += tamano
+        if self.compresor is not None:
+            datos = self.compresor.compress(datos)
+        self.temporal.write(datos)
+        self.tamano_comprimido += len(datos)
+        return tamano
+    
+    def cerrar(self):
+        if self.compresor is not None:
+            datos = self.compresor.flush()
+            self.temporal.write(datos)
+            self.tamano_comprimido += len(datos)
+            self.compresor = None
+        self.temporal.seek(0)
+
+
+def _agregar_entrada_comprimida(
+    zip_file: zipfile.ZipFile,
+    entrada: _EntradaComprimida,
+    tamano_bloque: int
+) -> Iterator[None]:
+    """
+    Agrega al ZIP una entrada que ya viene comprimida y con su CRC, copiando
+    los bytes tal cual. zipfile no tiene una API para esto: se hace lo mismo
+    que ZipFile.open(..., "w") y el cierre de la entrada, pero con el CRC y
+    los tamaños ya en el encabezado local (sin data descriptor).
+    
+    Yields:
+        None después de cada bloque copiado
+    """
+    info = zipfile.ZipInfo(entrada.nombre, date_time=time.localtime()[:6])
+    info.compress_type = entrada.compresion
+    info.external_attr = 0o600 << 16
+    info.CRC = entrada.crc
+    info.file_size = entrada.tamano
+    info.compress_size = entrada.tamano_comprimido
+    zip_file._writecheck(info)
+    zip_file._didModify = True
+    info.header_offset = zip_file.fp.tell()
+    zip_file.fp.write(info.FileHeader(zip64=True))
+    while bloque := entrada.temporal.read(tamano_bloque):
+        zip_file.fp.write(bloque)
+        yield
+    zip_file.start_dir = zip_file.fp.tell()
+    zip_file.filelist.append(info)
+    zip_file.NameToInfo[info.filename] = info
 
 
 class ExportacionService:
@@ -30,60 +326,505 @@ class ExportacionService:
         "tribunal_juez"
     ]
     
-    def __init__(self, db: Session):
+    MOTORES = ("copy", "csv")
+    
+    # Formatos de los archivos de cada tabla dentro del ZIP. "arrow" es el
+    # formato IPC de streaming (.arrows), que admite diccionarios distintos
+    # en cada lote
+    FORMATOS = ("csv", "parquet", "arrow")
+    EXTENSIONES = {"csv": "csv", "parquet": "parquet", "arrow": "arrows"}
+    
+    # Columnas de texto con pocos valores distintos, que en Parquet y Arrow
+    # van con dictionary encoding (cada valor se guarda una vez)
+    COLUMNAS_DICCIONARIO = {
+        "expediente": [
+            "jurisdiccion", "tribunal", "camara_origen", "fiscal", "fiscalia",
+            "estado_procesal"
+        ],
+        "radicacion": ["tribunal", "fiscal_nombre", "fiscalia"],
+        "jurisdiccion": ["ambito", "departamento_judicial"],
+        "tribunal": ["fuero"],
+        "rol_parte": ["nombre"],
+        "representacion": ["rol"],
+        "tribunal_juez": ["cargo", "situacion"],
+    }
+    
+    # Columnas que agrega la carga para uso interno de la API (normalizadas,
+    # de búsqueda y de alias de personas): no son datos de la fuente y no se
+    # exportan. Se calculan de las otras, así que no se pierde información
+    COLUMNAS_INTERNAS = {
+        "expediente": ["tribunal_normalizado", "fiscalia_normalizada", "caratula_busqueda"],
+        "juez": ["juez_nombre_normalizado"],
+        "parte": ["persona_canonica", "persona_excluida"],
+    }
+    
+    # Parquet y Arrow: filas por lote (un row group de Parquet o un record
+    # batch de Arrow por lote)
+    FILAS_POR_GRUPO = 50000
+    
+    # Motor csv: filas que se traen del cursor del servidor y se escriben al ZIP por vez
+    FILAS_POR_LOTE = 5000
+    
+    # Motor copy: tamaño de los bloques que se escriben al ZIP y cuántos
+    # pueden esperar en memoria a que el cliente los descargue
+    BYTES_POR_BLOQUE = 256 * 1024
+    BLOQUES_EN_COLA = 8
+    
+    def __init__(
+        self,
+        db: Session,
+        motor: Optional[str] = None,
+        workers: Optional[int] = None,
+        paralelas: ConexionesParalelas = conexiones_exportacion
+    ):
         """
         Inicializa el service con una sesión de base de datos.
         
         Args:
-            db: Sesión de SQLAlchemy
+            db: Sesión de SQLAlchemy (sostiene el snapshot de la exportación)
+            motor: Uno de MOTORES (default: settings.EXPORTACION_MOTOR)
+            workers: Máximo de tablas exportadas a la vez (default: settings.EXPORTACION_WORKERS)
+            paralelas: Pool de las sesiones de las tablas exportadas en paralelo
         """
         self.db = db
+        self.motor = motor or settings.EXPORTACION_MOTOR
+        self.workers = workers or settings.EXPORTACION_WORKERS
+        self.paralelas = paralelas
+        self.errores: List[str] = []  # Tablas que fallaron en la última exportación
+        if self.motor not in self.MOTORES:
+            raise ValueError(f"Motor de exportación desconocido: '{self.motor}'")
+    
+    def _columnas_exportadas(self, nombre_tabla: str) -> List[dict]:
+        """
+        Columnas de la tabla que se exportan, en el orden de la tabla y sin
+        las de COLUMNAS_INTERNAS.
+        
+        Returns:
+            Columnas como las devuelve Inspector.get_columns (name, type, ...)
+        """
+        internas = set(self.COLUMNAS_INTERNAS.get(nombre_tabla, []))
+        return [
+            columna for columna in inspect(self.db.connection()).get_columns(nombre_tabla)
+            if columna["name"] not in internas
+        ]
+    
+    @staticmethod
+    def _lista_columnas(columnas: List[dict]) -> str:
+        return ", ".join(f'"{columna["name"]}"' for columna in columnas)
     
-    def _tabla_a_csv(self, nombre_tabla: str) -> str:
+    def _tabla_a_csv(self, nombre_tabla: str) -> Iterator[bytes]:
         """
-        Convierte una tabla de la base de datos a CSV en memoria.
+        Convierte una tabla de la base de datos a CSV, de a FILAS_POR_LOTE filas.
+        Lee con un cursor del servidor, así que nunca tiene la tabla entera en memoria.
         
         Args:
             nombre_tabla: Nombre de la tabla a exportar
             
-        Returns:
-            String con el contenido CSV de la tabla
+        Yields:
+            Bloques del CSV en UTF-8: primero el encabezado, después un bloque por lote de filas
         """
-        query = text(f"SELECT * FROM {nombre_tabla}")
-        result = self.db.execute(query)
-        columns = result.keys()
+        columnas = self._lista_columnas(self._columnas_exportadas(nombre_tabla))
+        query = text(f"SELECT {columnas} FROM {nombre_tabla}")
+        result = self.db.execute(query, execution_options={"yield_per": self.FILAS_POR_LOTE})
         
         output = io.StringIO()
         writer = csv.writer(output)
-        writer.writerow(columns)
+        writer.writerow(result.keys())
+        yield output.getvalue().encode("utf-8")
+        
+        for filas in result.partitions():
+            output.seek(0)
+            output.truncate()
+            writer.writerows(filas)
+            yield output.getvalue().encode("utf-8")
+    
+    def _tabla_a_csv_copy(self, nombre_tabla: str) -> Iterator[bytes]:
+        """
+        Convierte una tabla de la base de datos a CSV con COPY ... TO STDOUT:
+        Postgres arma el CSV y acá solo se pasan bytes, sin crear objetos de
+        Python por fila ni por valor.
+        
+        copy_expert bloquea hasta terminar, así que corre en un thread que
+        deja los bloques en una cola acotada; este generador los va entregando.
+        Si se deja de consumir antes del final (el cliente cortó la descarga),
+        se cancela el COPY en el servidor.
+        
+        Args:
+            nombre_tabla: Nombre de la tabla a exportar
+            
+        Yields:
+            Bloques del CSV (con encabezado) de BYTES_POR_BLOQUE bytes aprox.
+        """
+        columnas = self._lista_columnas(self._columnas_exportadas(nombre_tabla))
+        conexion = self.db.connection().connection.dbapi_connection
+        cola: queue.Queue = queue.Queue(maxsize=self.BLOQUES_EN_COLA)
+        cancelado = threading.Event()
+        escritor = _EscritorCopy(cola, cancelado, self.BYTES_POR_BLOQUE)
+        
+        def copiar():
+            try:
+                with conexion.cursor() as cur:
+                    cur.copy_expert(
+                        f"COPY (SELECT {columnas} FROM {nombre_tabla}) TO STDOUT WITH (FORMAT csv, HEADER)",
+                        escritor
+                    )
+                escritor.vaciar()
+                cola.put(_FIN)
+            except Exception as e:
+                cola.put(e)
+        
+        hilo = threading.Thread(target=copiar, name=f"copy-{nombre_tabla}", daemon=True)
+        hilo.start()
+        try:
+            while True:
+                bloque = cola.get()
+                if bloque is _FIN:
+                    return
+                if isinstance(bloque, Exception):
+                    raise bloque
+                yield bloque
+        finally:
+            if hilo.is_alive():
+                cancelado.set()
+                conexion.cancel()
+                # Vaciar la cola para que el thread no quede bloqueado en put()
+                while hilo.is_alive():
+                    try:
+                        cola.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+    
+    def _bloques_csv(self, nombre_tabla: str) -> Iterator[bytes]:
+        """CSV de la tabla con el motor elegido; COPY necesita el driver psycopg2."""
+        if self.motor == "copy" and self.db.get_bind().dialect.driver == "psycopg2":
+            return self._tabla_a_csv_copy(nombre_tabla)
+        return self._tabla_a_csv(nombre_tabla)
+    
+    def _tabla_a_lotes(self, nombre_tabla: str) -> Iterator[Any]:
+        """
+        Lee una tabla de a FILAS_POR_GRUPO filas con un cursor del servidor y
+        arma un record batch de Arrow por lote. Los tipos salen de las columnas
+        de la tabla (no de los valores), así todos los lotes tienen el mismo esquema.
         
-        for row in result:
-            writer.writerow(row)
+        Args:
+            nombre_tabla: Nombre de la tabla a exportar
+            
+        Yields:
+            Primero el pa.Schema de la tabla, después un pa.RecordBatch por lote
+        """
+        diccionario = set(self.COLUMNAS_DICCIONARIO.get(nombre_tabla, []))
+        columnas = self._columnas_exportadas(nombre_tabla)
+        esquema = pa.schema([
+            pa.field(columna["name"], _tipo_arrow(columna["type"], columna["name"] in diccionario))
+            for columna in columnas
+        ])
+        yield esquema
         
-        return output.getvalue()
+        query = text(f"SELECT {self._lista_columnas(columnas)} FROM {nombre_tabla}").columns(
+            *[column(columna["name"], columna["type"]) for columna in columnas]
+        )
+        result = self.db.execute(query, execution_options={"yield_per": self.FILAS_POR_GRUPO})
+        for filas in result.partitions():
+            valores = list(zip(*filas))
+            yield pa.record_batch(
+                [_columna_arrow(valores[i], campo.type) for i, campo in enumerate(esquema)],
+                schema=esquema
+            )
     
-    def generar_zip_completo(self) -> io.BytesIO:
+    def _escribir_tabla(
+        self,
+        abrir: Callable[[str, int], ContextManager[BinaryIO]],
+        tabla: str,
+        formato: str
+    ) -> Iterator[None]:
         """
-        Genera un archivo ZIP con todas las tablas exportadas como CSV.
+        Escribe una tabla en el formato pedido, en el archivo que devuelve
+        abrir(nombre, compresión del ZIP). La consulta se ejecuta antes de
+        abrirlo: si falla, no queda un archivo vacío.
+        
+        Yields:
+            None después de cada bloque o lote escrito
+        """
+        if formato == "csv":
+            bloques = self._bloques_csv(tabla)
+            encabezado = next(bloques)
+            with abrir(f"{tabla}.csv", zipfile.ZIP_DEFLATED) as archivo:
+                for bloque in itertools.chain([encabezado], bloques):
+                    archivo.write(bloque)
+                    yield
+            return
+        
+        lotes = self._tabla_a_lotes(tabla)
+        esquema = next(lotes)
+        # Parquet y Arrow ya van comprimidos (zstd): la entrada se guarda sin deflate
+        with abrir(f"{tabla}.{self.EXTENSIONES[formato]}", zipfile.ZIP_STORED) as archivo:
+            destino = _EscrituraContada(archivo)
+            if formato == "parquet":
+                escritor = pq.ParquetWriter(destino, esquema, compression="zstd")
+            else:
+                escritor = pa.ipc.new_stream(
+                    destino, esquema, options=pa.ipc.IpcWriteOptions(compression="zstd")
+                )
+            with escritor:
+                for lote in lotes:
+                    escritor.write_batch(lote)
+                    yield
+    
+    def _exportar_a_temporal(self, snapshot: str, tabla: str, formato: str) -> _EntradaComprimida:
+        """
+        Exporta una tabla a un archivo temporal, ya comprimida como va en el
+        ZIP, con su propia conexión del pool y sobre el snapshot exportado por
+        la transacción principal.
         
         Returns:
-            BytesIO con el contenido del archivo ZIP
+            La entrada del ZIP, con el archivo temporal rebobinado
+        """
+        db = self.paralelas.sesiones()
+        temporal = tempfile.TemporaryFile()
+        entradas = []
+        
+        @contextmanager
+        def abrir(nombre: str, compresion: int):
+            entrada = _EntradaComprimida(nombre, compresion, temporal)
+            yield entrada
+            entrada.cerrar()
+            entradas.append(entrada)
+        
+        try:
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            # Tiene que ser la primera sentencia de la transacción
+            db.execute(text("SET TRANSACTION SNAPSHOT :snapshot"), {"snapshot": snapshot})
+            for _ in ExportacionService(db, motor=self.motor)._escribir_tabla(abrir, tabla, formato):
+                pass
+            return entradas[0]
+        except BaseException:
+            temporal.close()
+            raise
+        finally:
+            db.close()
+    
+    def _en_paralelo(self) -> bool:
+        # SET TRANSACTION SNAPSHOT es de Postgres
+        return self.workers > 1 and self.db.get_bind().dialect.name == "postgresql"
+    
+    def generar_zip_stream(self, formato: str = "csv") -> Iterator[bytes]:
+        """
+        Genera un archivo ZIP con todas las tablas exportadas, a medida que se
+        lee la base: cada lote de filas se comprime y se entrega enseguida,
+        así que la memoria usada no depende del tamaño de las tablas y el primer
+        byte sale sin esperar al resto.
+        
+        Con más de un worker (y Postgres) las tablas se exportan en paralelo,
+        con las conexiones libres de su pool aparte (ver _tablas_en_paralelo);
+        si no hay al menos dos libres, de a una sobre self.db.
+        
+        Args:
+            formato: Uno de FORMATOS: un archivo CSV, Parquet o Arrow IPC por tabla
+        
+        Yields:
+            Bloques consecutivos del archivo ZIP
         """
-        zip_buffer = io.BytesIO()
+        salida = _SalidaZip()
+        self.errores = []
+        
+        def abrir_entrada(nombre: str, compresion: int):
+            info = zipfile.ZipInfo(nombre, date_time=time.localtime()[:6])
+            info.compress_type = compresion
+            return zip_file.open(info, 'w', force_zip64=True)
+        
+        def registrar_error(tabla: str, e: Exception):
+            self.errores.append(tabla)
+            print(f"Error exportando tabla {tabla}: {e}")
+            error_content = f"Error al exportar esta tabla: {str(e)}"
+            zip_file.writestr(f"{tabla}_ERROR.txt", error_content)
         
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for tabla in self.TABLAS:
+        with zipfile.ZipFile(salida, 'w', zipfile.ZIP_DEFLATED) as zip_file, \
+                self.paralelas.reservar(self.workers if self._en_paralelo() else 0) as reservadas:
+            if reservadas >= 2:
+                for tabla, exportada, error in self._tablas_en_paralelo(formato, reservadas):
+                    if error is not None:
+                        registrar_error(tabla, error)
+                    else:
+                        with exportada.temporal:
+                            for _ in _agregar_entrada_comprimida(zip_file, exportada, self.BYTES_POR_BLOQUE):
+                                datos = salida.vaciar()
+                                if datos:
+                                    yield datos
+                    yield salida.vaciar()
+            else:
+                for tabla in self.TABLAS:
+                    try:
+                        for _ in self._escribir_tabla(abrir_entrada, tabla, formato):
+                            datos = salida.vaciar()
+                            if datos:
+                                yield datos
+                    except Exception as e:
+                        # La transacción queda abortada; sin rollback fallarían las tablas siguientes
+                        self.db.rollback()
+                        registrar_error(tabla, e)
+                    yield salida.vaciar()
+        
+        # Directorio central del ZIP
+        yield salida.vaciar()
+    
+    def _tablas_en_paralelo(
+        self,
+        formato: str,
+        workers: int
+    ) -> Iterator[Tuple[str, Optional[_EntradaComprimida], Optional[Exception]]]:
+        """
+        Exporta las tablas en paralelo, hasta `workers` a la vez (conexiones ya
+        reservadas en self.paralelas), cada una con su propia conexión y todas sobre el snapshot de la transacción
+        de self.db (pg_export_snapshot), así que los archivos son consistentes
+        entre sí aunque una carga se publique en el medio. Cada tabla se
+        escribe a un archivo temporal, ya comprimida en el worker; las tablas
+        chicas terminan enseguida y las grandes (parte, rol_parte, expediente)
+        se leen y se comprimen a la vez.
+        
+        Yields:
+            Tuplas (tabla, entrada comprimida o None, error o None),
+            en el orden en que terminan
+        """
+        snapshot = self.db.execute(text("SELECT pg_export_snapshot()")).scalar()
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futuros = {
+                executor.submit(self._exportar_a_temporal, snapshot, tabla, formato): tabla
+                for tabla in self.TABLAS
+            }
+            for futuro in as_completed(futuros):
                 try:
-                    csv_content = self._tabla_a_csv(tabla)
-                    zip_file.writestr(f"{tabla}.csv", csv_content)
+                    yield futuros[futuro], futuro.result(), None
                 except Exception as e:
-                    print(f"Error exportando tabla {tabla}: {e}")
-                    error_content = f"Error al exportar esta tabla: {str(e)}"
-                    zip_file.writestr(f"{tabla}_ERROR.txt", error_content)
+                    yield futuros[futuro], None, e
+        finally:
+            # Si el cliente cortó la descarga, no se empiezan las tablas que faltan;
+            # las que están en curso terminan antes de devolver sus conexiones reservadas
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def obtener_archivo_zip(self, formato: str = "csv") -> Optional[ArchivoExportacion]:
+        """
+        Obtiene el ZIP ya armado de la versión vigente de los datos. Los datos
+        solo cambian cuando corre la carga, así que el ZIP se arma una vez por
+        versión y formato (en la primera descarga, ver transmitir_zip) y se
+        guarda en EXPORTACION_DIR con su checksum; las descargas siguientes no
+        consultan la base.
+        
+        Args:
+            formato: Uno de FORMATOS
+        
+        Returns:
+            ArchivoExportacion con la ruta y el checksum SHA-256 del ZIP, o None
+            si todavía no se armó
         
-        zip_buffer.seek(0)
+        Raises:
+            ValueError: Si el formato no es uno de FORMATOS
+        """
+        self._validar_formato(formato)
+        version, fecha = get_version_datos()
+        return self._archivo_existente(version, fecha, formato)
+    
+    def transmitir_zip(self, formato: str = "csv") -> Iterator[bytes]:
+        """
+        Arma el ZIP de la versión vigente mientras lo entrega: cada bloque va al
+        cliente y al archivo en disco a la vez, así la primera descarga de una
+        versión empieza enseguida y las siguientes se sirven desde el archivo
+        (obtener_archivo_zip). Si otra descarga ya está armando el mismo ZIP,
+        éste se transmite sin guardarlo en lugar de esperar a que termine; los
+        demás formatos y versiones se arman sin esperarse entre sí.
+        
+        Args:
+            formato: Uno de FORMATOS
         
-        return zip_buffer
+        Returns:
+            Iterador con los bloques consecutivos del ZIP
+        
+        Raises:
+            ValueError: Si el formato no es uno de FORMATOS
+        """
+        self._validar_formato(formato)
+        return self._transmitir_zip(formato)
+    
+    def _validar_formato(self, formato: str):
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato de exportación desconocido: '{formato}'")
+    
+    def _transmitir_zip(self, formato: str) -> Iterator[bytes]:
+        # La versión y todas las tablas se leen del mismo snapshot (también las
+        # que se exportan en paralelo: comparten el de esta transacción), así
+        # que el nombre del archivo corresponde a su contenido
+        self.db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        fecha = MetadataRepository(self.db).get_ultima_actualizacion()
+        version = version_de_fecha(fecha)
+        
+        lock = _lock_armado(version, formato)
+        if not lock.acquire(blocking=False):
+            yield from self.generar_zip_stream(formato)
+            return
+        try:
+            archivo = self._archivo_existente(version, fecha, formato)
+            if archivo is None:
+                yield from self._armar_archivo_zip(version, formato)
+                return
+            # Otra descarga lo terminó de armar recién
+            with open(archivo.ruta, "rb") as zip_en_disco:
+                while bloque := zip_en_disco.read(self.BYTES_POR_BLOQUE):
+                    yield bloque
+        finally:
+            lock.release()
+    
+    def _archivo_existente(
+        self,
+        version: str,
+        fecha: Optional[datetime],
+        formato: str
+    ) -> Optional[ArchivoExportacion]:
+        ruta = _ruta_archivo(version, formato)
+        checksum = _leer_checksum(ruta)
+        if checksum is None or not os.path.isfile(ruta):
+            return None
+        return ArchivoExportacion(ruta, checksum, version, fecha)
+    
+    def _armar_archivo_zip(self, version: str, formato: str) -> Iterator[bytes]:
+        """
+        Genera el ZIP y a la vez lo escribe en un archivo temporal, que al
+        terminar se publica con un rename, después de escribir su checksum.
+        Si el cliente corta la descarga o alguna tabla falla, el archivo se
+        descarta: la próxima descarga lo vuelve a armar. También se descarta si
+        mientras tanto se publicó una carga nueva: no se publica un ZIP viejo
+        ni se borran los de la versión nueva.
+        
+        Yields:
+            Bloques consecutivos del ZIP
+        """
+        ruta = _ruta_archivo(version, formato)
+        os.makedirs(settings.EXPORTACION_DIR, exist_ok=True)
+        parcial = f"{ruta}.{os.getpid()}.{threading.get_ident()}.parcial"
+        sha256 = hashlib.sha256()
+        try:
+            with open(parcial, "wb") as archivo:
+                for bloque in self.generar_zip_stream(formato):
+                    archivo.write(bloque)
+                    sha256.update(bloque)
+                    yield bloque
+                archivo.flush()
+                os.fsync(archivo.fileno())
+        except BaseException:
+            os.remove(parcial)
+            raise
+        
+        if self.errores or not _es_version_vigente(version):
+            os.remove(parcial)
+            return
+        
+        # El checksum va primero: un ZIP publicado siempre tiene el suyo
+        checksum_parcial = f"{ruta}.sha256.{os.getpid()}.{threading.get_ident()}.parcial"
+        with open(checksum_parcial, "w", encoding="ascii") as archivo:
+            archivo.write(f"{sha256.hexdigest()}  {os.path.basename(ruta)}\n")
+        os.replace(checksum_parcial, f"{ruta}.sha256")
+        os.replace(parcial, ruta)
+        _borrar_versiones_anteriores(version)
+        print(f"✓ Exportación {formato} armada para la versión {version}: {ruta}")
 
 
 def get_exportacion_service() -> Generator[ExportacionService, None, None]:
@@ -97,11 +838,13 @@ def get_exportacion_service() -> Generator[ExportacionService, None, None]:
     Usage en FastAPI:
         @app.get("/exportar")
         def exportar(service: ExportacionService = Depends(get_exportacion_service)):
-            return service.generar_zip_completo()
+            archivo = service.obtener_archivo_zip()
+            if archivo is None:
+                return StreamingResponse(service.transmitir_zip(), media_type="application/zip")
+            return FileResponse(archivo.ruta, media_type="application/zip")
     """
     db = SessionLocal()
     try:
         yield ExportacionService(db)
     finally:
         db.close()
-
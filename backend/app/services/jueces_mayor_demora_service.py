@@ -1,4 +1,4 @@
-from typing import Generator
+from typing import Generator, Any, Dict, List
 from app.repositories.juez_repository import JuezRepository
 from app.schemas.jueces_mayor_demora_schema import (
     JuecesMayorDemoraResponse,
@@ -19,7 +19,8 @@ class JuecesMayorDemoraService:
         Inicializa el service con el repository de jueces.
         
         Args:
-            juez_repository: Instancia del JuezRepository
+            juez_repository: Instancia del JuezRepository (o del AsyncJuezRepository,
+                para los métodos *_async)
         """
         self.juez_repository = juez_repository
     
@@ -41,7 +42,18 @@ class JuecesMayorDemoraService:
         """
         # Obtener datos del repository
         jueces_data = self.juez_repository.get_jueces_con_mayor_demora(limit=limit)
-        
+        return self._armar_respuesta(jueces_data)
+    
+    async def get_datos_grafico_async(self, limit: int = 10) -> JuecesMayorDemoraResponse:
+        """
+        Igual que get_datos_grafico, con un AsyncJuezRepository: espera la consulta
+        sin bloquear el event loop.
+        """
+        jueces_data = await self.juez_repository.get_jueces_con_mayor_demora(limit=limit)
+        return self._armar_respuesta(jueces_data)
+    
+    def _armar_respuesta(self, jueces_data: List[Dict[str, Any]]) -> JuecesMayorDemoraResponse:
+        """Procesa los datos del repository y arma la respuesta del gráfico."""
         # Procesar datos para el gráfico
         labels = []
         demoras = []
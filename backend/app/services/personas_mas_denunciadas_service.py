@@ -1,4 +1,4 @@
-from typing import Generator
+from typing import Generator, Any, Dict, List
 import math
 from app.repositories.parte_repository import ParteRepository
 from app.schemas.personas_mas_denunciadas_schema import (
@@ -20,7 +20,8 @@ class PersonasMasDenunciadasService:
         Inicializa el service con el repository de partes.
         
         Args:
-            parte_repository: Instancia del ParteRepository
+            parte_repository: Instancia del ParteRepository (o del AsyncParteRepository,
+                para los métodos *_async)
         """
         self.parte_repository = parte_repository
     
@@ -42,7 +43,18 @@ class PersonasMasDenunciadasService:
         """
         # Obtener datos del repository
         personas_data = self.parte_repository.get_personas_mas_denunciadas(limit=limit)
-        
+        return self._armar_respuesta(personas_data)
+    
+    async def get_datos_grafico_async(self, limit: int = 20) -> PersonasMasDenunciadasResponse:
+        """
+        Igual que get_datos_grafico, con un AsyncParteRepository: espera la consulta
+        sin bloquear el event loop.
+        """
+        personas_data = await self.parte_repository.get_personas_mas_denunciadas(limit=limit)
+        return self._armar_respuesta(personas_data)
+    
+    def _armar_respuesta(self, personas_data: List[Dict[str, Any]]) -> PersonasMasDenunciadasResponse:
+        """Procesa los datos del repository y arma la respuesta del gráfico."""
         # Procesar datos para el gráfico
         labels = []
         data = []
@@ -1,2 +1,173 @@
-# Utilidades para manejo de fechas
+# Utilidades para manejo de fechas y parseo de delitos
 
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+# Formatos aceptados, en el orden en que se prueban cuando no hay uno dominante
+FORMATOS_FECHA = [
+    "%Y-%m-%d",      # 2023-12-31
+    "%d/%m/%Y",      # 31/12/2023
+    "%d-%m-%Y",      # 31-12-2023
+    "%d-%m-%y",      # 31-12-23
+    "%y-%m-%d",      # 23-12-31
+]
+
+# Equivalente compilado de cada formato: regex y posición de (año, mes, día)
+_PATRONES_FECHA: Dict[str, Tuple[Pattern, Tuple[int, int, int]]] = {
+    "%Y-%m-%d": (re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})"), (1, 2, 3)),
+    "%d/%m/%Y": (re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})"), (3, 2, 1)),
+    "%d-%m-%Y": (re.compile(r"(\d{1,2})-(\d{1,2})-(\d{4})"), (3, 2, 1)),
+    "%d-%m-%y": (re.compile(r"(\d{1,2})-(\d{1,2})-(\d{2})"), (3, 2, 1)),
+    "%y-%m-%d": (re.compile(r"(\d{2})-(\d{1,2})-(\d{1,2})"), (1, 2, 3)),
+}
+
+TAMANO_MUESTRA = 1000
+
+
+def _aplicar_formato(valor: str, formato: str) -> Optional[str]:
+    """Parsea `valor` con un formato; devuelve la fecha ISO o None si no corresponde."""
+    patron, (pos_ano, pos_mes, pos_dia) = _PATRONES_FECHA[formato]
+    match = patron.fullmatch(valor)
+    if not match:
+        return None
+    ano = int(match.group(pos_ano))
+    if len(match.group(pos_ano)) == 2:
+        # Mismo pivote que strptime con %y: 69-99 -> 1900, 00-68 -> 2000
+        ano += 1900 if ano >= 69 else 2000
+    try:
+        return date(ano, int(match.group(pos_mes)), int(match.group(pos_dia))).isoformat()
+    except ValueError:
+        return None
+
+
+def parsear_fecha(valor: Optional[str], formatos: Iterable[str] = FORMATOS_FECHA) -> Optional[str]:
+    """
+    Convierte una cadena de fecha a formato ISO (YYYY-MM-DD) probando los
+    formatos en orden.
+
+    Args:
+        valor: Cadena a parsear
+        formatos: Formatos a probar, de FORMATOS_FECHA
+
+    Returns:
+        Fecha ISO, o None si está vacía o no coincide con ningún formato
+    """
+    if not valor:
+        return None
+    valor = str(valor).strip()
+    if not valor:
+        return None
+    for formato in formatos:
+        fecha = _aplicar_formato(valor, formato)
+        if fecha is not None:
+            return fecha
+    return None
+
+
+def detectar_formato_fecha(muestra: Iterable[Optional[str]]) -> Optional[str]:
+    """
+    Detecta el formato dominante de una columna a partir de una muestra.
+    Ante un empate gana el que aparece primero en FORMATOS_FECHA.
+
+    Returns:
+        El formato que más valores de la muestra parsea, o None si ninguno parsea
+    """
+    conteo = {formato: 0 for formato in FORMATOS_FECHA}
+    for valor in muestra:
+        valor = (valor or "").strip()
+        if not valor:
+            continue
+        for formato in FORMATOS_FECHA:
+            if _aplicar_formato(valor, formato) is not None:
+                conteo[formato] += 1
+    mejor = max(FORMATOS_FECHA, key=lambda formato: conteo[formato])
+    return mejor if conteo[mejor] else None
+
+
+class ParserFecha:
+    """
+    Parser de una columna de fechas: prueba primero el formato dominante de la
+    columna y después el resto, y recuerda el resultado de cada valor visto.
+    """
+
+    def __init__(self, formato: Optional[str] = None, max_cache: int = 100_000):
+        self.formato = formato
+        self.formatos: List[str] = (
+            [formato] + [f for f in FORMATOS_FECHA if f != formato] if formato else list(FORMATOS_FECHA)
+        )
+        self.max_cache = max_cache
+        self._cache: Dict[Optional[str], Optional[str]] = {}
+
+    @classmethod
+    def desde_muestra(cls, muestra: Iterable[Optional[str]], **kwargs) -> "ParserFecha":
+        return cls(detectar_formato_fecha(muestra), **kwargs)
+
+    def __call__(self, valor: Optional[str]) -> Optional[str]:
+        try:
+            return self._cache[valor]
+        except KeyError:
+            pass
+        fecha = parsear_fecha(valor, self.formatos)
+        if len(self._cache) >= self.max_cache:
+            self._cache.clear()
+        self._cache[valor] = fecha
+        return fecha
+
+
+# ============================================
+# Delitos
+# ============================================
+
+# Patrón 1: "Art. 210 CP - NOMBRE" o "Art 210 - NOMBRE"
+_PATRON_DELITO_ARTICULO_PRIMERO = re.compile(
+    r'(?:Art\.?\s*)?(\d+(?:\s*(?:inc|bis|ter)\.?\s*\d+)?)\s*([A-Z\.]+)?\s*-\s*(.+)'
+)
+
+# Patrón 2: "NOMBRE (Art. 210 CP)"
+_PATRON_DELITO_ARTICULO_ENTRE_PARENTESIS = re.compile(
+    r'(.+?)\s*\((?:Art\.?\s*)?(\d+(?:\s*(?:inc|bis|ter)\.?\s*\d+)?)\s*([A-Z\.]+)?\)'
+)
+
+# Patrón 3: Solo artículo al inicio sin "Art."
+_PATRON_DELITO_NUMERO_INICIAL = re.compile(r'^(\d+)\s+([A-Z\.]+)?\s*-?\s*(.+)')
+
+
+@lru_cache(maxsize=65536)
+def parsear_delito(delito_str: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """
+    Parsea un string de delito y extrae: nombre, artículo, ley
+
+    Ejemplos:
+    "Art. 210 CP - ASOCIACION ILICITA"
+    -> nombre: "ASOCIACION ILICITA", articulo: "210", ley: "CP"
+
+    "ASOCIACION ILICITA"
+    -> nombre: "ASOCIACION ILICITA", articulo: None, ley: None
+    """
+    delito_str = delito_str.strip()
+
+    match = _PATRON_DELITO_ARTICULO_PRIMERO.match(delito_str)
+    if match:
+        articulo = match.group(1).strip() if match.group(1) else None
+        ley = match.group(2).strip() if match.group(2) else None
+        nombre = match.group(3).strip() if match.group(3) else delito_str
+        return nombre, articulo, ley
+
+    match = _PATRON_DELITO_ARTICULO_ENTRE_PARENTESIS.match(delito_str)
+    if match:
+        nombre = match.group(1).strip()
+        articulo = match.group(2).strip() if match.group(2) else None
+        ley = match.group(3).strip() if match.group(3) else None
+        return nombre, articulo, ley
+
+    match = _PATRON_DELITO_NUMERO_INICIAL.match(delito_str)
+    if match and len(match.group(1)) <= 4:  # Evitar falsos positivos
+        articulo = match.group(1).strip()
+        ley = match.group(2).strip() if match.group(2) else None
+        nombre = match.group(3).strip() if match.group(3) else delito_str
+        return nombre, articulo, ley
+
+    # Si no matchea ningún patrón, devolver solo el nombre
+    return delito_str, None, None
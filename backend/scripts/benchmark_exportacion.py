@@ -0,0 +1,102 @@
+"""
+Benchmark de los motores de /exportacion/descargar-base-de-datos.
+
+Para cada tabla de ExportacionService.TABLAS lee el CSV completo con cada
+motor (copy: COPY ... TO STDOUT; csv: SELECT + csv.writer) y mide tiempo,
+filas por segundo y CPU del proceso (la de la API; la del servidor de
+Postgres no se cuenta). El CSV se descarta sin comprimir, para medir solo
+la lectura; al final se mide además el ZIP completo con cada motor, y con
+el motor por defecto exportando de a una tabla y con --workers en paralelo.
+
+Uso (desde backend/, con DATABASE_URL apuntando a la base cargada):
+    python scripts/benchmark_exportacion.py [--tablas expediente parte] [--sin-zip] [--workers 4]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.exportacion_service import ExportacionService
+
+
+def medir(bloques):
+    """Consume los bloques; devuelve (bytes, segundos, segundos de CPU)."""
+    inicio, cpu = time.perf_counter(), time.process_time()
+    total = sum(len(bloque) for bloque in bloques)
+    return total, time.perf_counter() - inicio, time.process_time() - cpu
+
+
+def comparar_tabla(tabla):
+    db = SessionLocal()
+    try:
+        filas = db.execute(text(f"SELECT COUNT(*) FROM {tabla}")).scalar()
+    finally:
+        db.close()
+
+    print(f"\n{tabla} ({filas:,} filas)")
+    base = None
+    for motor in ExportacionService.MOTORES:
+        db = SessionLocal()
+        try:
+            service = ExportacionService(db, motor=motor)
+            lector = service._tabla_a_csv_copy if motor == "copy" else service._tabla_a_csv
+            total, segundos, cpu = medir(lector(tabla))
+        finally:
+            db.close()
+        print(f"  {motor:<6}{segundos:>8.2f}s {filas / max(segundos, 1e-9):>14,.0f} filas/s"
+              f" {cpu:>8.2f}s CPU {total / 2**20:>10.1f} MiB")
+        if base is None:
+            base = (segundos, cpu)
+        else:
+            print(f"  {'':<6}copy es x{segundos / max(base[0], 1e-9):.1f} más rápido"
+                  f" y usa x{cpu / max(base[1], 1e-9):.1f} menos CPU")
+
+
+def medir_zip(motor, workers):
+    db = SessionLocal()
+    try:
+        return medir(ExportacionService(db, motor=motor, workers=workers).generar_zip_stream())
+    finally:
+        db.close()
+
+
+def comparar_zip(workers):
+    print("\nZIP completo (de a una tabla)")
+    for motor in ExportacionService.MOTORES:
+        total, segundos, cpu = medir_zip(motor, 1)
+        print(f"  {motor:<6}{segundos:>8.2f}s {cpu:>8.2f}s CPU {total / 2**20:>10.1f} MiB")
+
+    print(f"\nZIP completo ({settings.EXPORTACION_MOTOR}, tablas en paralelo)")
+    base = None
+    for n in sorted({1, workers}):
+        total, segundos, cpu = medir_zip(settings.EXPORTACION_MOTOR, n)
+        print(f"  {n:>2} workers{segundos:>8.2f}s {cpu:>8.2f}s CPU {total / 2**20:>10.1f} MiB")
+        if base is None:
+            base = segundos
+        else:
+            print(f"  {'':<10}x{base / max(segundos, 1e-9):.1f} más rápido")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los motores de exportación (COPY vs csv.writer)")
+    parser.add_argument("--tablas", nargs="+", default=ExportacionService.TABLAS,
+                        help="Tablas a medir (default: todas las exportadas)")
+    parser.add_argument("--sin-zip", action="store_true", help="No medir el ZIP completo")
+    parser.add_argument("--workers", type=int, default=settings.EXPORTACION_WORKERS,
+                        help="Tablas exportadas a la vez en el ZIP en paralelo (default: EXPORTACION_WORKERS)")
+    args = parser.parse_args()
+
+    for tabla in args.tablas:
+        comparar_tabla(tabla)
+    if not args.sin_zip:
+        comparar_zip(args.workers)
+
+
+if __name__ == "__main__":
+    main()
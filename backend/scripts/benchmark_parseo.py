@@ -0,0 +1,169 @@
+"""
+Micro-benchmark de los parsers de fechas y delitos del ETL.
+
+Compara las funciones anteriores de load_data_completo.py (copiadas abajo tal
+como estaban) con las de app/utils/date_utils.py sobre una columna sintética
+de un millón de valores, y verifica que ambas den el mismo resultado.
+
+Uso (desde backend/):
+    python scripts/benchmark_parseo.py [--filas 1000000] [--semilla 42]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils.date_utils import ParserFecha, parsear_delito, parsear_fecha
+
+# ============================================
+# Implementaciones anteriores
+# ============================================
+
+def parse_nullable_date_anterior(value):
+    if not value or str(value).strip() == "":
+        return None
+
+    value = str(value).strip()
+
+    formatos = [
+        "%Y-%m-%d",
+        "%d/%m/%Y",
+        "%d-%m-%Y",
+        "%d-%m-%y",
+        "%y-%m-%d",
+    ]
+
+    for formato in formatos:
+        try:
+            fecha = datetime.strptime(value, formato)
+            return fecha.strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+
+    if re.match(r'^\d{2}-\d{2}-\d{2}$', value):
+        partes = value.split('-')
+        try:
+            year = int(partes[0])
+            month = int(partes[1])
+            day = int(partes[2])
+            if year < 50:
+                year += 2000
+            else:
+                year += 1900
+            fecha = datetime(year, month, day)
+            return fecha.strftime("%Y-%m-%d")
+        except (ValueError, IndexError):
+            pass
+
+    return None
+
+def parsear_delito_anterior(delito_str):
+    delito_str = delito_str.strip()
+
+    patron1 = r'(?:Art\.?\s*)?(\d+(?:\s*(?:inc|bis|ter)\.?\s*\d+)?)\s*([A-Z\.]+)?\s*-\s*(.+)'
+    patron2 = r'(.+?)\s*\((?:Art\.?\s*)?(\d+(?:\s*(?:inc|bis|ter)\.?\s*\d+)?)\s*([A-Z\.]+)?\)'
+    patron3 = r'^(\d+)\s+([A-Z\.]+)?\s*-?\s*(.+)'
+
+    match = re.match(patron1, delito_str)
+    if match:
+        articulo = match.group(1).strip() if match.group(1) else None
+        ley = match.group(2).strip() if match.group(2) else None
+        nombre = match.group(3).strip() if match.group(3) else delito_str
+        return nombre, articulo, ley
+
+    match = re.match(patron2, delito_str)
+    if match:
+        nombre = match.group(1).strip()
+        articulo = match.group(2).strip() if match.group(2) else None
+        ley = match.group(3).strip() if match.group(3) else None
+        return nombre, articulo, ley
+
+    match = re.match(patron3, delito_str)
+    if match and len(match.group(1)) <= 4:
+        articulo = match.group(1).strip()
+        ley = match.group(2).strip() if match.group(2) else None
+        nombre = match.group(3).strip() if match.group(3) else delito_str
+        return nombre, articulo, ley
+
+    return delito_str, None, None
+
+# ============================================
+# Datos sintéticos
+# ============================================
+
+DELITOS = [
+    "Art. 210 CP - ASOCIACION ILICITA",
+    "ASOCIACION ILICITA",
+    "COHECHO (Art. 256 CP)",
+    "Art 261 - PECULADO",
+    "174 CP - DEFRAUDACION CONTRA LA ADMINISTRACION PUBLICA",
+    "NEGOCIACIONES INCOMPATIBLES CON EL EJERCICIO DE FUNCIONES PUBLICAS",
+    "Art. 248 inc. 1 CP - ABUSO DE AUTORIDAD",
+    "ENRIQUECIMIENTO ILICITO (Art. 268 bis 2 CP)",
+]
+
+def columna_fechas(filas, rng):
+    """Columna dominada por dd/mm/aaaa, con algo de ISO, años cortos y vacíos, como los CSV del ETL."""
+    inicio = datetime(1995, 1, 1)
+    valores = []
+    for _ in range(filas):
+        fecha = inicio + timedelta(days=rng.randrange(11000))
+        tirada = rng.random()
+        if tirada < 0.80:
+            valores.append(fecha.strftime("%d/%m/%Y"))
+        elif tirada < 0.90:
+            valores.append(fecha.strftime("%Y-%m-%d"))
+        elif tirada < 0.95:
+            valores.append(fecha.strftime("%d-%m-%y"))
+        else:
+            valores.append("")
+    return valores
+
+def columna_delitos(filas, rng):
+    return [rng.choice(DELITOS) for _ in range(filas)]
+
+# ============================================
+# Medición
+# ============================================
+
+def medir(nombre, funcion, valores):
+    inicio = time.perf_counter()
+    resultados = [funcion(valor) for valor in valores]
+    segundos = time.perf_counter() - inicio
+    print(f"  {nombre:<34}{segundos:>8.2f}s {len(valores) / segundos:>14,.0f} valores/s")
+    return resultados, segundos
+
+def comparar(titulo, valores, anterior, nuevas):
+    print(f"\n{titulo} ({len(valores):,} valores)")
+    esperado, base = medir("anterior", anterior, valores)
+    for nombre, funcion in nuevas:
+        resultados, segundos = medir(nombre, funcion, valores)
+        diferencias = sum(1 for a, b in zip(esperado, resultados) if a != b)
+        print(f"  {'':<34}x{base / segundos:.1f} más rápido, diferencias: {diferencias}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los parsers de fechas y delitos del ETL")
+    parser.add_argument("--filas", type=int, default=1_000_000, help="Valores por columna (default: 1000000)")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla de los datos sintéticos")
+    args = parser.parse_args()
+
+    rng = random.Random(args.semilla)
+    fechas = columna_fechas(args.filas, rng)
+    comparar("Fechas", fechas, parse_nullable_date_anterior, [
+        ("parsear_fecha (compilado)", parsear_fecha),
+        ("ParserFecha (detección + memo)", ParserFecha.desde_muestra(fechas[:1000])),
+    ])
+
+    delitos = columna_delitos(args.filas, rng)
+    comparar("Delitos", delitos, parsear_delito_anterior, [
+        ("parsear_delito (compilado + memo)", parsear_delito),
+        ("parsear_delito sin memo", parsear_delito.__wrapped__),
+    ])
+
+if __name__ == "__main__":
+    main()
@@ -15,3 +15,20 @@ ON CONFLICT (clave) DO NOTHING;
 
 
 
+-- Resumen de cada corrida del ETL (load_data_completo.py), para seguir su
+-- rendimiento en el tiempo. El detalle por etapa queda en la columna etapas.
+CREATE TABLE IF NOT EXISTS carga_ejecucion (
+    ejecucion_id SERIAL PRIMARY KEY,
+    inicio TIMESTAMP WITH TIME ZONE NOT NULL,
+    fin TIMESTAMP WITH TIME ZONE NOT NULL,
+    exitosa BOOLEAN NOT NULL,
+    modo VARCHAR(20) NOT NULL,
+    workers INTEGER NOT NULL,
+    filas_leidas BIGINT NOT NULL,
+    filas_escritas BIGINT NOT NULL,
+    filas_rechazadas BIGINT NOT NULL,
+    segundos NUMERIC(12, 3) NOT NULL,
+    filas_por_segundo NUMERIC(14, 1) NOT NULL,
+    rss_pico_kb BIGINT NOT NULL,
+    etapas JSONB NOT NULL
+);
@@ -1,8 +1,22 @@
 import psycopg2
+import argparse
 import csv
+import hashlib
+import json
 import os
-import re
-from datetime import datetime
+import resource
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from itertools import islice
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+
+DIRECTORIO_SCRIPT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(DIRECTORIO_SCRIPT))
+from app.utils.date_utils import TAMANO_MUESTRA, ParserFecha, parsear_delito, parsear_fecha
 
 os.chdir('/app/data')
 
@@ -26,129 +40,513 @@ def parse_nullable(value):
         return None
     return value
 
-def parse_nullable_date(value):
+def parse_nullable_date(value, parser=parsear_fecha):
     """Convierte cadenas de fecha a formato ISO, manejando múltiples formatos"""
-    if not value or str(value).strip() == "":
-        return None
-    
-    value = str(value).strip()
-    
-    # Lista de formatos de fecha a probar
-    formatos = [
-        "%Y-%m-%d",      # 2023-12-31
-        "%d/%m/%Y",      # 31/12/2023
-        "%d-%m-%Y",      # 31-12-2023
-        "%d-%m-%y",      # 31-12-23
-        "%y-%m-%d",      # 23-12-31
-    ]
-    
-    for formato in formatos:
-        try:
-            fecha = datetime.strptime(value, formato)
-            return fecha.strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-    
-    # Si no coincide con ningún formato, intentar parsear manualmente
-    # Para casos como "15-05-13" que podría ser año-mes-día con año corto
-    if re.match(r'^\d{2}-\d{2}-\d{2}$', value):
-        partes = value.split('-')
+    fecha = parser(value)
+    if fecha is None and value and str(value).strip():
+        print(f"⚠️ Advertencia: formato de fecha no reconocido: {value}")
+    return fecha
+
+_PARSERS_FECHA = {}
+
+def parser_fecha(nombre_csv, columna):
+    """
+    Parser para una columna de fechas de un CSV, que prueba primero el formato
+    dominante detectado en las primeras filas del archivo.
+    """
+    clave = (nombre_csv, columna)
+    if clave not in _PARSERS_FECHA:
+        with open(nombre_csv, newline="", encoding="utf-8") as f:
+            muestra = [row[columna] for row in islice(csv.DictReader(f), TAMANO_MUESTRA)]
+        _PARSERS_FECHA[clave] = ParserFecha.desde_muestra(muestra)
+    return _PARSERS_FECHA[clave]
+
+# ============================================
+# Conversión de filas CSV
+# ============================================
+
+# Cada fila_* convierte una fila del CSV en la tupla que se escribe en la
+# base, en el orden de columnas del INSERT correspondiente. Las comparten
+# todos los modos de carga (fila por fila, COPY y delta).
+
+def fila_fuero(row):
+    return (parse_nullable(row["fuero_id"]), parse_nullable(row["nombre"]))
+
+def fila_jurisdiccion(row):
+    return (
+        parse_nullable(row["jurisdiccion_id"]),
+        parse_nullable(row["ambito"]),
+        parse_nullable(row["departamento_judicial"])
+    )
+
+def fila_tribunal(row):
+    return (
+        parse_nullable(row["tribunal_id"]),
+        parse_nullable(row["nombre"]),
+        parse_nullable(row["domicilio_sede"]),
+        parse_nullable(row["contacto"]),
+        parse_nullable(row["jurisdiccion_id"]),
+        parse_nullable(row["fuero"])
+    )
+
+def fila_expediente(row):
+    return (
+        parse_nullable(row["numero_expediente"]),
+        parse_nullable(row["caratula"]),
+        parse_nullable(row["jurisdiccion"]),
+        parse_nullable(row["tribunal"]),
+        parse_nullable(row["estado_procesal"]),
+        parse_nullable_date(row["fecha_inicio"], parser_fecha("etl_expedientes.csv", "fecha_inicio")),
+        parse_nullable_date(
+            row["fecha_ultimo_movimiento"],
+            parser_fecha("etl_expedientes.csv", "fecha_ultimo_movimiento")
+        ),
+        parse_nullable(row["camara_origen"]),
+        parse_nullable(row["ano_inicio"]),
+        parse_nullable(row["delitos"]),
+        parse_nullable(row["fiscal"]),
+        parse_nullable(row["fiscalia"])
+    )
+
+def fila_parte(row):
+    return (
+        parse_nullable(row["numero_expediente"]),
+        parse_nullable(row["nombre"]),
+        parse_nullable(row.get("rol"))
+    )
+
+def fila_letrado(row):
+    return (parse_nullable(row.get("letrado")),)
+
+def fila_representacion(row):
+    return (
+        parse_nullable(row["numero_expediente"]),
+        parse_nullable(row["nombre_parte"]),
+        parse_nullable(row["letrado"]),
+        parse_nullable(row.get("rol"))
+    )
+
+def fila_resolucion(row):
+    return (
+        parse_nullable(row["numero_expediente"]),
+        parse_nullable_date(row["fecha"], parser_fecha("etl_resoluciones.csv", "fecha")),
+        parse_nullable(row["nombre"]),
+        parse_nullable(row["link"])
+    )
+
+def fila_radicacion(row):
+    return (
+        parse_nullable(row["numero_expediente"]),
+        parse_nullable(row["orden"]),
+        parse_nullable_date(row["fecha_radicacion"], parser_fecha("etl_radicaciones.csv", "fecha_radicacion")),
+        parse_nullable(row["tribunal"]),
+        parse_nullable(row["fiscal_nombre"]),
+        parse_nullable(row["fiscalia"])
+    )
+
+def fila_juez(row):
+    return (
+        parse_nullable(row["juez_id"]),
+        parse_nullable(row["nombre"]),
+        parse_nullable(row["email"]),
+        parse_nullable(row["telefono"])
+    )
+
+def fila_tribunal_juez(row):
+    return (
+        parse_nullable(row["tribunal_id"]),
+        parse_nullable(row["juez_id"]),
+        parse_nullable(row["cargo"]),
+        parse_nullable(row["situacion"])
+    )
+
+# ============================================
+# Carga masiva con COPY
+# ============================================
+
+def _valor_copy(valor):
+    """Serializa un valor al formato de texto de COPY (None -> \\N)."""
+    if valor is None:
+        return "\\N"
+    return (
+        str(valor)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class FilasCopy:
+    """
+    Adapta un iterador de filas (tuplas ya coercionadas) a un objeto tipo
+    archivo para `cursor.copy_expert`. Las filas se serializan en el formato
+    de texto de COPY a medida que se piden, así el archivo nunca se arma
+    entero en memoria.
+    """
+
+    def __init__(self, filas):
+        self._filas = iter(filas)
+        self._resto = ""
+        self.filas = 0
+
+    def read(self, size=-1):
+        partes = [self._resto]
+        largo = len(self._resto)
+        while size is None or size < 0 or largo < size:
+            try:
+                fila = next(self._filas)
+            except StopIteration:
+                break
+            linea = "\t".join(_valor_copy(valor) for valor in fila) + "\n"
+            partes.append(linea)
+            largo += len(linea)
+            self.filas += 1
+
+        datos = "".join(partes)
+        if size is None or size < 0:
+            self._resto = ""
+            return datos
+        self._resto = datos[size:]
+        return datos[:size]
+
+
+def copy_a_staging(cur, staging, columnas, filas, tabla=None, definicion=None):
+    """
+    Crea una tabla temporal de staging y vuelca las filas con COPY FROM STDIN.
+
+    A cada fila se le agrega la columna `_fila` con su posición en el CSV,
+    para que el merge pueda resolver duplicados igual que la carga fila por
+    fila (ver seleccion_fusionada).
+
+    Args:
+        cur: Cursor de psycopg2
+        staging: Nombre de la tabla temporal
+        columnas: Columnas en el orden en que vienen las tuplas de `filas`
+        filas: Iterable de tuplas ya coercionadas
+        tabla: Tabla de la que se toman los tipos de `columnas` (sin constraints,
+            así las columnas que no vienen en el CSV, como los serial, no molestan)
+        definicion: Definición explícita de columnas, si el staging no calca una tabla
+
+    Returns:
+        Cantidad de filas copiadas
+    """
+    if tabla:
+        cur.execute(f"""
+            CREATE TEMP TABLE {staging} ON COMMIT DROP AS
+            SELECT {', '.join(columnas)}, NULL::BIGINT AS _fila
+            FROM {tabla}
+            WITH NO DATA
+        """)
+    else:
+        cur.execute(f"CREATE TEMP TABLE {staging} ({definicion}, _fila BIGINT) ON COMMIT DROP")
+    stream = FilasCopy((*fila, i) for i, fila in enumerate(filas))
+    cur.copy_expert(
+        f"COPY {staging} ({', '.join(columnas)}, _fila) FROM STDIN",
+        stream
+    )
+    return stream.filas
+
+def seleccion_fusionada(origen, clave, columnas, actualizadas):
+    """
+    SELECT que deja una fila por clave del staging con la misma precedencia
+    que el upsert fila por fila (INSERT ... ON CONFLICT (clave) DO UPDATE SET
+    actualizadas): la primera ocurrencia inserta la fila y las siguientes
+    solo pisan `actualizadas`. Así las columnas actualizadas salen de la
+    última ocurrencia y las demás (ids, FKs) de la primera.
+
+    Args:
+        origen: Tabla de staging (o subconsulta con alias) con la columna _fila
+        clave: Columnas de la clave de conflicto
+        columnas: Columnas a devolver, en el orden del INSERT
+        actualizadas: Columnas del SET del ON CONFLICT
+
+    Returns:
+        SQL del SELECT
+    """
+    claves = ', '.join(clave)
+    valores = [c if c in actualizadas or c in clave else f"first_value({c}) OVER primera" for c in columnas]
+    # Un solo recorrido: DISTINCT ON se queda con la última ocurrencia y la
+    # ventana trae de la primera las columnas que el upsert no pisa
+    return f"""
+        SELECT DISTINCT ON ({claves}) {', '.join(valores)}
+        FROM {origen}
+        WINDOW primera AS (PARTITION BY {claves} ORDER BY _fila)
+        ORDER BY {claves}, _fila DESC
+    """
+
+def copiar_partes(cur, filas):
+    """
+    Inserta partes y sus roles a partir de tuplas de fila_parte usando COPY.
+
+    Returns:
+        Tupla (partes insertadas, roles insertados)
+    """
+    partes = copy_a_staging(
+        cur, "stg_parte", ["numero_expediente", "nombre_razon_social", "rol"], filas,
+        definicion="numero_expediente TEXT, nombre_razon_social TEXT, rol TEXT, parte_id BIGINT"
+    )
+    # Reservar los parte_id en el orden del CSV para poder
+    # insertar parte y rol_parte sin RETURNING fila por fila
+    cur.execute("""
+        UPDATE stg_parte s
+        SET parte_id = ids.parte_id
+        FROM (
+            SELECT _fila, nextval(pg_get_serial_sequence('parte', 'parte_id')) AS parte_id
+            FROM (SELECT _fila FROM stg_parte ORDER BY _fila) ordenadas
+        ) ids
+        WHERE s._fila = ids._fila
+    """)
+    cur.execute("""
+        INSERT INTO parte (parte_id, numero_expediente, nombre_razon_social)
+        SELECT parte_id, numero_expediente, nombre_razon_social
+        FROM stg_parte
+        ORDER BY _fila
+    """)
+    cur.execute("""
+        INSERT INTO rol_parte (parte_id, nombre)
+        SELECT parte_id, rol
+        FROM stg_parte
+        WHERE rol IS NOT NULL
+        ORDER BY _fila
+        ON CONFLICT DO NOTHING
+    """)
+    return partes, cur.rowcount
+
+
+def copiar_representaciones(cur, filas):
+    """
+    Inserta representaciones a partir de tuplas de fila_representacion usando
+    COPY, resolviendo parte_id y letrado_id con un join.
+
+    Returns:
+        Tupla (filas leídas, filas resueltas, rechazos como (fila, motivo))
+    """
+    leidas = copy_a_staging(
+        cur, "stg_representacion", ["numero_expediente", "nombre_parte", "letrado", "rol"], filas,
+        definicion="numero_expediente TEXT, nombre_parte TEXT, letrado TEXT, rol TEXT"
+    )
+    # Misma resolución que la carga fila por fila: la primera parte
+    # que coincide por nombre y expediente, y el letrado por nombre
+    cur.execute("""
+        CREATE TEMP TABLE stg_representacion_resuelta ON COMMIT DROP AS
+        SELECT s._fila, s.numero_expediente, p.parte_id, l.letrado_id, s.rol
+        FROM stg_representacion s
+        JOIN LATERAL (
+            SELECT parte_id
+            FROM parte
+            WHERE nombre_razon_social = s.nombre_parte
+              AND numero_expediente = s.numero_expediente
+            LIMIT 1
+        ) p ON TRUE
+        JOIN letrado l ON l.nombre = s.letrado
+    """)
+    resueltas = cur.rowcount
+    cur.execute("""
+        INSERT INTO representacion (numero_expediente, parte_id, letrado_id, rol)
+        SELECT numero_expediente, parte_id, letrado_id, rol
+        FROM stg_representacion_resuelta
+        ORDER BY _fila
+        ON CONFLICT DO NOTHING
+    """)
+    cur.execute("""
+        SELECT s.numero_expediente, s.nombre_parte, s.letrado, s.rol,
+               CASE WHEN NOT EXISTS (
+                        SELECT 1 FROM parte p
+                        WHERE p.nombre_razon_social = s.nombre_parte
+                          AND p.numero_expediente = s.numero_expediente
+                    ) THEN 'parte no encontrada'
+                    ELSE 'letrado no encontrado' END
+        FROM stg_representacion s
+        WHERE NOT EXISTS (SELECT 1 FROM stg_representacion_resuelta r WHERE r._fila = s._fila)
+        ORDER BY s._fila
+    """)
+    rechazos = [(fila[:4], fila[4]) for fila in cur.fetchall()]
+    return leidas, resueltas, rechazos
+
+# ============================================
+# Escritura en lotes con cuarentena
+# ============================================
+
+TAMANO_LOTE = int(os.getenv("LOAD_BATCH_SIZE", "5000"))
+DIRECTORIO_RECHAZOS = os.getenv("LOAD_REJECTS_DIR", "rechazos")
+
+def escribir_en_lotes(cur, sql, filas, clave=None, tamano=None):
+    """
+    Escribe filas con execute_values en lotes, cada uno bajo un savepoint.
+    Si un lote falla se vuelve al savepoint y se lo parte en mitades hasta
+    aislar las filas que fallan; las demás se escriben igual y la
+    transacción sigue utilizable.
+
+    Args:
+        cur: Cursor abierto (no hace commit)
+        sql: INSERT con un único "VALUES %s"
+        filas: Iterable de tuplas
+        clave: Función que da la clave de conflicto de una fila. Una fila cuya
+            clave ya está en el lote abre un lote nuevo, porque un mismo
+            upsert no puede tocar dos veces la misma fila
+        tamano: Filas por lote (default: TAMANO_LOTE)
+
+    Returns:
+        Tupla (filas escritas, cuarentena como lista de (fila, error))
+    """
+    tamano = tamano or TAMANO_LOTE
+    escritas = 0
+    cuarentena = []
+
+    def escribir(lote):
+        nonlocal escritas
+        cur.execute("SAVEPOINT lote")
         try:
-            # Asumir formato YY-MM-DD
-            year = int(partes[0])
-            month = int(partes[1])
-            day = int(partes[2])
-            
-            # Convertir año de 2 dígitos a 4
-            if year < 50:
-                year += 2000
+            execute_values(cur, sql, lote, page_size=len(lote))
+        except psycopg2.Error as e:
+            cur.execute("ROLLBACK TO SAVEPOINT lote")
+            cur.execute("RELEASE SAVEPOINT lote")
+            if len(lote) == 1:
+                cuarentena.append((lote[0], str(e).strip().splitlines()[0]))
             else:
-                year += 1900
-            
-            fecha = datetime(year, month, day)
-            return fecha.strftime("%Y-%m-%d")
-        except (ValueError, IndexError):
-            pass
-    
-    print(f"⚠️ Advertencia: formato de fecha no reconocido: {value}")
-    return None
+                mitad = len(lote) // 2
+                escribir(lote[:mitad])
+                escribir(lote[mitad:])
+            return
+        cur.execute("RELEASE SAVEPOINT lote")
+        escritas += len(lote)
+
+    lote = []
+    claves = set()
+    for fila in filas:
+        if clave is not None:
+            k = clave(fila)
+            if k in claves:
+                escribir(lote)
+                lote, claves = [], set()
+            claves.add(k)
+        lote.append(fila)
+        if len(lote) >= tamano:
+            escribir(lote)
+            lote, claves = [], set()
+    if lote:
+        escribir(lote)
+    return escritas, cuarentena
 
-def parsear_delito(delito_str):
+def escribir_rechazos(nombre, columnas, rechazos):
     """
-    Parsea un string de delito y extrae: nombre, artículo, ley
-    
-    Ejemplos:
-    "Art. 210 CP - ASOCIACION ILICITA" 
-    -> nombre: "ASOCIACION ILICITA", articulo: "210", ley: "CP"
-    
-    "ASOCIACION ILICITA"
-    -> nombre: "ASOCIACION ILICITA", articulo: None, ley: None
+    Escribe las filas que no se pudieron resolver o que quedaron en cuarentena
+    en DIRECTORIO_RECHAZOS/<nombre>.csv, con las columnas originales más el
+    motivo. Si no hay rechazos borra el reporte de una corrida anterior.
+
+    Args:
+        nombre: Nombre del reporte (normalmente la tabla destino)
+        columnas: Encabezado de las filas rechazadas, sin el motivo
+        rechazos: Lista de tuplas (fila, motivo)
+
+    Returns:
+        Ruta del reporte o None si no hubo rechazos
     """
-    delito_str = delito_str.strip()
-    
-    # Patrón 1: "Art. 210 CP - NOMBRE" o "Art 210 - NOMBRE"
-    patron1 = r'(?:Art\.?\s*)?(\d+(?:\s*(?:inc|bis|ter)\.?\s*\d+)?)\s*([A-Z\.]+)?\s*-\s*(.+)'
-    
-    # Patrón 2: "NOMBRE (Art. 210 CP)"
-    patron2 = r'(.+?)\s*\((?:Art\.?\s*)?(\d+(?:\s*(?:inc|bis|ter)\.?\s*\d+)?)\s*([A-Z\.]+)?\)'
-    
-    # Patrón 3: Solo artículo al inicio sin "Art."
-    patron3 = r'^(\d+)\s+([A-Z\.]+)?\s*-?\s*(.+)'
-    
-    match = re.match(patron1, delito_str)
-    if match:
-        articulo = match.group(1).strip() if match.group(1) else None
-        ley = match.group(2).strip() if match.group(2) else None
-        nombre = match.group(3).strip() if match.group(3) else delito_str
-        return nombre, articulo, ley
-    
-    match = re.match(patron2, delito_str)
-    if match:
-        nombre = match.group(1).strip()
-        articulo = match.group(2).strip() if match.group(2) else None
-        ley = match.group(3).strip() if match.group(3) else None
-        return nombre, articulo, ley
-    
-    match = re.match(patron3, delito_str)
-    if match and len(match.group(1)) <= 4:  # Evitar falsos positivos
-        articulo = match.group(1).strip()
-        ley = match.group(2).strip() if match.group(2) else None
-        nombre = match.group(3).strip() if match.group(3) else delito_str
-        return nombre, articulo, ley
-    
-    # Si no matchea ningún patrón, devolver solo el nombre
-    return delito_str, None, None
+    ruta = os.path.join(DIRECTORIO_RECHAZOS, f"{nombre}.csv")
+    if not rechazos:
+        if os.path.exists(ruta):
+            os.remove(ruta)
+        return None
+    os.makedirs(DIRECTORIO_RECHAZOS, exist_ok=True)
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(list(columnas) + ["motivo"])
+        for fila, motivo in rechazos:
+            writer.writerow(list(fila) + [motivo])
+    print(f"  📝 {len(rechazos)} filas rechazadas en {ruta}")
+    return ruta
+
+# ============================================
+# Resolución de claves en memoria
+# ============================================
+
+class ResolutorClaves:
+    """
+    Mapas de claves naturales a ids, leídos de la base una sola vez para
+    resolver todas las filas en memoria en lugar de hacer SELECTs por fila.
+    Cada mapa se carga la primera vez que se consulta.
+    """
+
+    def __init__(self, cur):
+        self.cur = cur
+        self._partes = None
+        self._letrados = None
+        self._tribunales = None
+        self._jueces = None
+
+    def parte_id(self, numero_expediente, nombre):
+        if self._partes is None:
+            # Si hay partes repetidas se queda con la primera, como el SELECT por fila
+            self.cur.execute("""
+                SELECT DISTINCT ON (numero_expediente, nombre_razon_social)
+                    numero_expediente, nombre_razon_social, parte_id
+                FROM parte
+                ORDER BY numero_expediente, nombre_razon_social, parte_id
+            """)
+            self._partes = {(numero, nombre): parte_id for numero, nombre, parte_id in self.cur}
+        return self._partes.get((numero_expediente, nombre))
+
+    def letrado_id(self, nombre):
+        if self._letrados is None:
+            self.cur.execute("""
+                SELECT DISTINCT ON (nombre) nombre, letrado_id
+                FROM letrado
+                ORDER BY nombre, letrado_id
+            """)
+            self._letrados = dict(self.cur.fetchall())
+        return self._letrados.get(nombre)
+
+    def existe_tribunal(self, tribunal_id):
+        if self._tribunales is None:
+            self.cur.execute("SELECT tribunal_id FROM tribunal")
+            self._tribunales = {str(fila[0]) for fila in self.cur}
+        return tribunal_id is not None and str(tribunal_id) in self._tribunales
+
+    def existe_juez(self, juez_id):
+        if self._jueces is None:
+            self.cur.execute("SELECT juez_id FROM juez")
+            self._jueces = {str(fila[0]) for fila in self.cur}
+        return juez_id is not None and str(juez_id) in self._jueces
 
 # ============================================
 # Funciones de limpieza previas
 # ============================================
 
+# Tablas que reemplaza cada carga.
+# Orden: primero las tablas dependientes, luego las principales
+TABLAS_CARGA = [
+    "tribunal_juez",
+    "representacion",
+    "expediente_delito",
+    "rol_parte",
+    "parte",
+    "plazo",
+    "resolucion",
+    "radicacion",
+    "expediente",
+    "juez",
+    "secretaria",
+    "tribunal",
+    "jurisdiccion",
+    "fuero",
+    "letrado",
+    "tipo_delito",
+    "persona_alias",
+    "resumen_causas_por_ano",
+    "resumen_delitos",
+    "resumen_causas_por_fuero",
+    "resumen_causas_por_fiscalia",
+    "resumen_jueces_demora",
+    "carga_huella"
+]
+
 def limpiar_tablas(conn):
     """Limpia las tablas en el orden correcto para evitar violaciones de FK"""
     print("Limpiando tablas existentes...")
     try:
         with conn.cursor() as cur:
-            # Orden: primero las tablas dependientes, luego las principales
-            tablas = [
-                "tribunal_juez",
-                "representacion",
-                "expediente_delito",
-                "rol_parte",
-                "parte",
-                "plazo",
-                "resolucion",
-                "radicacion",
-                "expediente",
-                "juez",
-                "secretaria",
-                "tribunal",
-                "jurisdiccion",
-                "fuero",
-                "letrado",
-                "tipo_delito" 
-            ]
-            
-            for tabla in tablas:
+            for tabla in TABLAS_CARGA:
                 cur.execute(f"DELETE FROM {tabla}")
                 print(f"  ✓ {tabla} limpiada")
             
@@ -177,480 +575,1186 @@ def limpiar_tablas(conn):
         conn.rollback()
         print(f"❌ Error en limpieza: {e}")
 
+# ============================================
+# Esquema sombra e intercambio atómico
+# ============================================
+
+# La carga nueva se arma en ESQUEMA_SOMBRA mientras la API sigue leyendo las
+# tablas de public. Al terminar, un único ALTER ... SET SCHEMA por tabla (en
+# una sola transacción) mueve la versión vigente a ESQUEMA_ANTERIOR y la nueva
+# a public. La versión anterior queda disponible para revertir con --rollback.
+#
+# Nota: las vistas o FKs de tablas ajenas a TABLAS_CARGA que apunten a estas
+# tablas siguen a la tabla movida (se resuelven por OID), no al nombre.
+ESQUEMA_SOMBRA = "carga_nueva"
+ESQUEMA_ANTERIOR = "carga_anterior"
+
+def preparar_esquema_sombra(conn):
+    """
+    Crea ESQUEMA_SOMBRA con una copia vacía de cada tabla de TABLAS_CARGA
+    (columnas, defaults, constraints, índices, secuencias propias y FKs) y
+    deja el search_path de la conexión apuntando a ese esquema, de modo que
+    las funciones de carga escriban ahí sin cambiar su SQL.
+    """
+    print(f"Preparando esquema sombra '{ESQUEMA_SOMBRA}'...")
+    with conn.cursor() as cur:
+        cur.execute("SET search_path TO public")
+        cur.execute(f"DROP SCHEMA IF EXISTS {ESQUEMA_SOMBRA} CASCADE")
+        cur.execute(f"CREATE SCHEMA {ESQUEMA_SOMBRA}")
+
+        for tabla in TABLAS_CARGA:
+            cur.execute(f"""
+                CREATE TABLE {ESQUEMA_SOMBRA}.{tabla}
+                (LIKE public.{tabla} INCLUDING ALL)
+            """)
+
+            # LIKE copia el default nextval() apuntando a la secuencia de public;
+            # cada tabla sombra necesita su propia secuencia (mismo nombre) para
+            # que el intercambio y el descarte de versiones viejas no las compartan
+            cur.execute("""
+                SELECT column_name, pg_get_serial_sequence(format('public.%%I', table_name), column_name)
+                FROM information_schema.columns
+                WHERE table_schema = 'public'
+                  AND table_name = %s
+                  AND is_identity = 'NO'
+                  AND pg_get_serial_sequence(format('public.%%I', table_name), column_name) IS NOT NULL
+            """, (tabla,))
+            for columna, secuencia in cur.fetchall():
+                nombre_secuencia = secuencia.split(".")[-1]
+                cur.execute(f"""
+                    CREATE SEQUENCE {ESQUEMA_SOMBRA}.{nombre_secuencia}
+                    OWNED BY {ESQUEMA_SOMBRA}.{tabla}.{columna}
+                """)
+                cur.execute(f"""
+                    ALTER TABLE {ESQUEMA_SOMBRA}.{tabla}
+                    ALTER COLUMN {columna}
+                    SET DEFAULT nextval('{ESQUEMA_SOMBRA}.{nombre_secuencia}')
+                """)
+
+        # Las FKs no se copian con LIKE. Se leen con search_path=public (las
+        # tablas referenciadas salen sin esquema) y se recrean con el esquema
+        # sombra primero, así apuntan a las tablas sombra
+        cur.execute("""
+            SELECT r.relname, c.conname, pg_get_constraintdef(c.oid)
+            FROM pg_constraint c
+            JOIN pg_class r ON r.oid = c.conrelid
+            JOIN pg_namespace n ON n.oid = r.relnamespace
+            WHERE c.contype = 'f'
+              AND n.nspname = 'public'
+              AND r.relname = ANY(%s)
+        """, (TABLAS_CARGA,))
+        fks = cur.fetchall()
+
+        cur.execute(f"SET search_path TO {ESQUEMA_SOMBRA}, public")
+        for tabla, nombre, definicion in fks:
+            cur.execute(f"ALTER TABLE {ESQUEMA_SOMBRA}.{tabla} ADD CONSTRAINT {nombre} {definicion}")
+
+    conn.commit()
+    print(f"✓ Esquema sombra listo ({len(TABLAS_CARGA)} tablas, {len(fks)} FKs)\n")
+
+def _mover_tablas(cur, origen, destino):
+    for tabla in TABLAS_CARGA:
+        cur.execute(f"ALTER TABLE {origen}.{tabla} SET SCHEMA {destino}")
+
+def intercambiar_esquema_sombra(conn):
+    """
+    Publica la carga armada en ESQUEMA_SOMBRA en una única transacción:
+    public -> ESQUEMA_ANTERIOR, ESQUEMA_SOMBRA -> public, y actualiza
+    metadata.ultima_actualizacion en el mismo commit. La API ve la versión
+    vieja o la nueva, nunca una carga a medias.
+    """
+    print("Intercambiando esquema sombra con public...")
+    try:
+        with conn.cursor() as cur:
+            # No quedarse esperando indefinidamente detrás de una consulta larga de la API
+            cur.execute("SET LOCAL lock_timeout = '30s'")
+            cur.execute("SET LOCAL search_path TO public")
+            cur.execute(f"DROP SCHEMA IF EXISTS {ESQUEMA_ANTERIOR} CASCADE")
+            cur.execute(f"CREATE SCHEMA {ESQUEMA_ANTERIOR}")
+            _mover_tablas(cur, "public", ESQUEMA_ANTERIOR)
+            _mover_tablas(cur, ESQUEMA_SOMBRA, "public")
+            cur.execute(f"DROP SCHEMA {ESQUEMA_SOMBRA}")
+
+            # La fecha vigente pasa a ser la de la versión anterior (para --rollback)
+            cur.execute("""
+                INSERT INTO metadata (clave, valor)
+                SELECT 'ultima_actualizacion_anterior', valor
+                FROM metadata
+                WHERE clave = 'ultima_actualizacion'
+                ON CONFLICT (clave)
+                DO UPDATE SET valor = EXCLUDED.valor
+            """)
+            _upsert_ultima_actualizacion(cur)
+        conn.commit()
+        print("✅ Nueva versión publicada; la anterior quedó en "
+              f"'{ESQUEMA_ANTERIOR}' y la fecha de última actualización fue actualizada")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("SET search_path TO public")
+        conn.commit()
+
+def revertir_ultima_carga(conn):
+    """
+    Vuelve a publicar la versión guardada en ESQUEMA_ANTERIOR. La versión que
+    estaba publicada pasa a ESQUEMA_ANTERIOR, así que revertir dos veces deja
+    todo como estaba. También intercambia las fechas de metadata.
+    """
+    print(f"Revirtiendo a la versión guardada en '{ESQUEMA_ANTERIOR}'...")
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL lock_timeout = '30s'")
+            cur.execute("SET LOCAL search_path TO public")
+            cur.execute("SELECT 1 FROM pg_namespace WHERE nspname = %s", (ESQUEMA_ANTERIOR,))
+            if not cur.fetchone():
+                print(f"❌ No existe el esquema '{ESQUEMA_ANTERIOR}': no hay versión anterior")
+                conn.rollback()
+                return False
+
+            temporal = f"{ESQUEMA_ANTERIOR}_tmp"
+            cur.execute(f"DROP SCHEMA IF EXISTS {temporal} CASCADE")
+            cur.execute(f"CREATE SCHEMA {temporal}")
+            _mover_tablas(cur, "public", temporal)
+            _mover_tablas(cur, ESQUEMA_ANTERIOR, "public")
+            cur.execute(f"DROP SCHEMA {ESQUEMA_ANTERIOR}")
+            cur.execute(f"ALTER SCHEMA {temporal} RENAME TO {ESQUEMA_ANTERIOR}")
+
+            cur.execute("""
+                UPDATE metadata m
+                SET valor = o.valor
+                FROM metadata o
+                WHERE (m.clave, o.clave) IN (
+                    ('ultima_actualizacion', 'ultima_actualizacion_anterior'),
+                    ('ultima_actualizacion_anterior', 'ultima_actualizacion')
+                )
+            """)
+        conn.commit()
+        print("✅ Versión anterior restaurada")
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error al revertir: {e}")
+        return False
+
 # ============================================
 # Funciones de carga
 # ============================================
 
-def cargar_fuero(conn):
+# Lo que devuelve cada etapa para el reporte de la corrida. Las etapas atrapan
+# sus propios errores: en ese caso devuelven el mensaje en `error`.
+ResultadoCarga = namedtuple(
+    "ResultadoCarga", ["leidas", "escritas", "rechazadas", "error"], defaults=[None]
+)
+
+def cargar_fuero(conn, usar_copy=False):
     print("Cargando fueros...")
     count = 0
+    cuarentena = []
     try:
         with conn.cursor() as cur, open("etl_fueros.csv", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            for row in reader:
-                cur.execute("""
+            filas = (fila_fuero(row) for row in reader)
+            if usar_copy:
+                count = copy_a_staging(cur, "stg_fuero", ["fuero_id", "nombre"], filas, tabla="fuero")
+                cur.execute(f"""
+                    INSERT INTO fuero (fuero_id, nombre)
+                    {seleccion_fusionada("stg_fuero", ["nombre"], ["fuero_id", "nombre"], ["nombre"])}
+                    ON CONFLICT (nombre) DO UPDATE SET nombre = EXCLUDED.nombre
+                """)
+            else:
+                count, cuarentena = escribir_en_lotes(cur, """
                     INSERT INTO fuero (fuero_id, nombre)
-                    VALUES (%s, %s)
+                    VALUES %s
                     ON CONFLICT (nombre) DO UPDATE SET nombre = EXCLUDED.nombre
-                """, (parse_nullable(row["fuero_id"]), parse_nullable(row["nombre"])))
-                count += 1
+                """, filas, clave=lambda fila: fila[1])
         conn.commit()
-        print(f"✅ Fueros insertados: {count}")
+        escribir_rechazos("fuero", ["fuero_id", "nombre"], cuarentena)
+        print(f"✅ Fueros insertados: {count} (errores: {len(cuarentena)})")
+        return ResultadoCarga(count + len(cuarentena), count, len(cuarentena))
     except Exception as e:
         conn.rollback()
         print(f"❌ Error al cargar fueros: {e}")
+        return ResultadoCarga(0, 0, 0, error=str(e))
 
-def cargar_jurisdiccion(conn):
+def cargar_jurisdiccion(conn, usar_copy=False):
     print("Cargando jurisdicciones...")
     count = 0
+    cuarentena = []
     try:
         with conn.cursor() as cur, open("etl_jurisdicciones.csv", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            for row in reader:
-                cur.execute("""
+            filas = (fila_jurisdiccion(row) for row in reader)
+            if usar_copy:
+                count = copy_a_staging(
+                    cur, "stg_jurisdiccion",
+                    ["jurisdiccion_id", "ambito", "departamento_judicial"],
+                    filas, tabla="jurisdiccion"
+                )
+                cur.execute(f"""
+                    INSERT INTO jurisdiccion (jurisdiccion_id, ambito, departamento_judicial)
+                    {seleccion_fusionada(
+                        "stg_jurisdiccion", ["jurisdiccion_id"],
+                        ["jurisdiccion_id", "ambito", "departamento_judicial"],
+                        ["ambito", "departamento_judicial"]
+                    )}
+                    ON CONFLICT (jurisdiccion_id) DO UPDATE 
+                    SET ambito = EXCLUDED.ambito,
+                        departamento_judicial = EXCLUDED.departamento_judicial
+                """)
+            else:
+                count, cuarentena = escribir_en_lotes(cur, """
                     INSERT INTO jurisdiccion (jurisdiccion_id, ambito, departamento_judicial)
-                    VALUES (%s, %s, %s)
+                    VALUES %s
                     ON CONFLICT (jurisdiccion_id) DO UPDATE 
                     SET ambito = EXCLUDED.ambito,
                         departamento_judicial = EXCLUDED.departamento_judicial
-                """, (
-                    parse_nullable(row["jurisdiccion_id"]),
-                    parse_nullable(row["ambito"]),
-                    parse_nullable(row["departamento_judicial"])
-                ))
-                count += 1
+                """, filas, clave=lambda fila: fila[0])
         conn.commit()
-        print(f"✅ Jurisdicciones insertadas: {count}")
+        escribir_rechazos("jurisdiccion", ["jurisdiccion_id", "ambito", "departamento_judicial"], cuarentena)
+        print(f"✅ Jurisdicciones insertadas: {count} (errores: {len(cuarentena)})")
+        return ResultadoCarga(count + len(cuarentena), count, len(cuarentena))
     except Exception as e:
         conn.rollback()
         print(f"❌ Error al cargar jurisdicciones: {e}")
+        return ResultadoCarga(0, 0, 0, error=str(e))
 
-def cargar_tribunal(conn):
+def cargar_tribunal(conn, usar_copy=False):
     print("Cargando tribunales...")
     count = 0
+    cuarentena = []
     try:
         with conn.cursor() as cur, open("etl_tribunales.csv", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            for row in reader:
-                cur.execute("""
+            filas = (fila_tribunal(row) for row in reader)
+            if usar_copy:
+                count = copy_a_staging(
+                    cur, "stg_tribunal",
+                    ["tribunal_id", "nombre", "domicilio_sede", "contacto", "jurisdiccion_id", "fuero"],
+                    filas, tabla="tribunal"
+                )
+                cur.execute(f"""
+                    INSERT INTO tribunal (
+                        tribunal_id, nombre, domicilio_sede,
+                        contacto, jurisdiccion_id, fuero
+                    )
+                    {seleccion_fusionada(
+                        "stg_tribunal", ["nombre"],
+                        ["tribunal_id", "nombre", "domicilio_sede", "contacto", "jurisdiccion_id", "fuero"],
+                        ["domicilio_sede", "contacto", "jurisdiccion_id", "fuero"]
+                    )}
+                    ON CONFLICT (nombre) DO UPDATE 
+                    SET domicilio_sede = EXCLUDED.domicilio_sede,
+                        contacto = EXCLUDED.contacto,
+                        jurisdiccion_id = EXCLUDED.jurisdiccion_id,
+                        fuero = EXCLUDED.fuero
+                """)
+            else:
+                count, cuarentena = escribir_en_lotes(cur, """
                     INSERT INTO tribunal (
                         tribunal_id, nombre, domicilio_sede,
                         contacto, jurisdiccion_id, fuero
-                    ) VALUES (%s, %s, %s, %s, %s, %s)
+                    ) VALUES %s
                     ON CONFLICT (nombre) DO UPDATE 
                     SET domicilio_sede = EXCLUDED.domicilio_sede,
                         contacto = EXCLUDED.contacto,
                         jurisdiccion_id = EXCLUDED.jurisdiccion_id,
                         fuero = EXCLUDED.fuero
-                """, (
-                    parse_nullable(row["tribunal_id"]),
-                    parse_nullable(row["nombre"]),
-                    parse_nullable(row["domicilio_sede"]),
-                    parse_nullable(row["contacto"]),
-                    parse_nullable(row["jurisdiccion_id"]),
-                    parse_nullable(row["fuero"])
-                ))
-                count += 1
-        conn.commit()
-        print(f"✅ Tribunales insertados: {count}")
+                """, filas, clave=lambda fila: fila[1])
+        conn.commit()
+        escribir_rechazos(
+            "tribunal",
+            ["tribunal_id", "nombre", "domicilio_sede", "contacto", "jurisdiccion_id", "fuero"],
+            cuarentena
+        )
+        print(f"✅ Tribunales insertados: {count} (errores: {len(cuarentena)})")
+        return ResultadoCarga(count + len(cuarentena), count, len(cuarentena))
     except Exception as e:
         conn.rollback()
         print(f"❌ Error al cargar tribunales: {e}")
+        return ResultadoCarga(0, 0, 0, error=str(e))
 
-def cargar_expediente(conn):
+def cargar_expediente(conn, usar_copy=False):
     print("Cargando expedientes...")
     count = 0
     errores = 0
+    cuarentena = []
+    columnas = [
+        "numero_expediente", "caratula", "jurisdiccion", "tribunal",
+        "estado_procesal", "fecha_inicio", "fecha_ultimo_movimiento",
+        "camara_origen", "ano_inicio", "delitos", "fiscal", "fiscalia"
+    ]
     try:
         with conn.cursor() as cur, open("etl_expedientes.csv", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    cur.execute("""
-                        INSERT INTO expediente (
-                            numero_expediente, caratula, jurisdiccion, tribunal,
-                            estado_procesal, fecha_inicio, fecha_ultimo_movimiento,
-                            camara_origen, ano_inicio, delitos, fiscal, fiscalia
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (numero_expediente) DO UPDATE 
-                        SET caratula = EXCLUDED.caratula,
-                            estado_procesal = EXCLUDED.estado_procesal,
-                            fecha_ultimo_movimiento = EXCLUDED.fecha_ultimo_movimiento
-                    """, (
-                        parse_nullable(row["numero_expediente"]),
-                        parse_nullable(row["caratula"]),
-                        parse_nullable(row["jurisdiccion"]),
-                        parse_nullable(row["tribunal"]),
-                        parse_nullable(row["estado_procesal"]),
-                        parse_nullable_date(row["fecha_inicio"]),
-                        parse_nullable_date(row["fecha_ultimo_movimiento"]),
-                        parse_nullable(row["camara_origen"]),
-                        parse_nullable(row["ano_inicio"]),
-                        parse_nullable(row["delitos"]),
-                        parse_nullable(row["fiscal"]),
-                        parse_nullable(row["fiscalia"])
-                    ))
-                    count += 1
-                except Exception as e:
-                    errores += 1
-                    if errores <= 5:  # Mostrar solo los primeros 5 errores
-                        print(f"  ⚠️ Error en expediente {row.get('numero_expediente')}: {e}")
+            filas = (fila_expediente(row) for row in reader)
+            if usar_copy:
+                count = copy_a_staging(cur, "stg_expediente", columnas, filas, tabla="expediente")
+                cur.execute(f"""
+                    INSERT INTO expediente ({', '.join(columnas)})
+                    {seleccion_fusionada(
+                        "stg_expediente", ["numero_expediente"], columnas,
+                        ["caratula", "estado_procesal", "fecha_ultimo_movimiento"]
+                    )}
+                    ON CONFLICT (numero_expediente) DO UPDATE 
+                    SET caratula = EXCLUDED.caratula,
+                        estado_procesal = EXCLUDED.estado_procesal,
+                        fecha_ultimo_movimiento = EXCLUDED.fecha_ultimo_movimiento
+                """)
+            else:
+                count, cuarentena = escribir_en_lotes(cur, f"""
+                    INSERT INTO expediente ({', '.join(columnas)})
+                    VALUES %s
+                    ON CONFLICT (numero_expediente) DO UPDATE 
+                    SET caratula = EXCLUDED.caratula,
+                        estado_procesal = EXCLUDED.estado_procesal,
+                        fecha_ultimo_movimiento = EXCLUDED.fecha_ultimo_movimiento
+                """, filas, clave=lambda fila: fila[0])
+                errores = len(cuarentena)
         conn.commit()
+        escribir_rechazos("expediente", columnas, cuarentena)
         print(f"✅ Expedientes insertados: {count} (errores: {errores})")
+        return ResultadoCarga(count + errores, count, errores)
     except Exception as e:
         conn.rollback()
         print(f"❌ Error al cargar expedientes: {e}")
+        return ResultadoCarga(0, 0, 0, error=str(e))
 
-def cargar_parte_y_rol(conn):
+def cargar_parte_y_rol(conn, usar_copy=False):
     print("Cargando partes y roles...")
     parte_count = rol_count = 0
+    cuarentena = []
+    cuarentena_roles = []
     try:
         with conn.cursor() as cur, open("etl_partes.csv", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            for row in reader:
+            if usar_copy:
+                filas = (fila_parte(row) for row in reader)
+                parte_count, rol_count = copiar_partes(cur, filas)
+            else:
+                filas = [fila_parte(row) for row in reader]
+                # Reservar los ids de antemano para poder escribir partes y roles en lotes
                 cur.execute("""
-                    INSERT INTO parte (numero_expediente, nombre_razon_social)
-                    VALUES (%s, %s)
-                    RETURNING parte_id
-                """, (parse_nullable(row["numero_expediente"]), parse_nullable(row["nombre"])))
-                parte_id = None
-                try:
-                    parte_id = cur.fetchone()[0]
-                except:
-                    pass
-                parte_count += 1
-
-                if parte_id and row.get("rol"):
-                    cur.execute("""
-                        INSERT INTO rol_parte (parte_id, nombre)
-                        VALUES (%s, %s)
-                        ON CONFLICT DO NOTHING
-                    """, (parte_id, parse_nullable(row["rol"])))
-                    rol_count += 1
+                    SELECT nextval(pg_get_serial_sequence('parte', 'parte_id'))
+                    FROM generate_series(1, %s)
+                """, (len(filas),))
+                ids = [parte_id for (parte_id,) in cur.fetchall()]
+                parte_count, cuarentena = escribir_en_lotes(cur, """
+                    INSERT INTO parte (parte_id, numero_expediente, nombre_razon_social)
+                    VALUES %s
+                """, [(parte_id, numero, nombre) for parte_id, (numero, nombre, _) in zip(ids, filas)])
+                sin_parte = {fila[0] for fila, _ in cuarentena}
+                rol_count, cuarentena_roles = escribir_en_lotes(cur, """
+                    INSERT INTO rol_parte (parte_id, nombre)
+                    VALUES %s
+                    ON CONFLICT DO NOTHING
+                """, [
+                    (parte_id, rol) for parte_id, (_, _, rol) in zip(ids, filas)
+                    if rol and parte_id not in sin_parte
+                ])
         conn.commit()
-        print(f"✅ Partes insertadas: {parte_count}, Roles insertados: {rol_count}")
+        escribir_rechazos("parte", ["parte_id", "numero_expediente", "nombre"], cuarentena)
+        escribir_rechazos("rol_parte", ["parte_id", "nombre"], cuarentena_roles)
+        print(f"✅ Partes insertadas: {parte_count}, Roles insertados: {rol_count} "
+              f"(errores: {len(cuarentena) + len(cuarentena_roles)})")
+        return ResultadoCarga(
+            parte_count + len(cuarentena),
+            parte_count + rol_count,
+            len(cuarentena) + len(cuarentena_roles)
+        )
     except Exception as e:
         conn.rollback()
         print(f"❌ Error al cargar partes/roles: {e}")
+        return ResultadoCarga(0, 0, 0, error=str(e))
 
-def cargar_letrado(conn):
+def cargar_letrado(conn, usar_copy=False):
     print("Cargando letrados...")
     count = 0
+    cuarentena = []
     try:
         with conn.cursor() as cur, open("etl_letrados.csv", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            for row in reader:
-                nombre = parse_nullable(row.get("letrado"))
-                if not nombre:
-                    continue
+            filas = (fila for fila in map(fila_letrado, reader) if fila[0])
+            if usar_copy:
+                count = copy_a_staging(cur, "stg_letrado", ["nombre"], filas, definicion="nombre TEXT")
                 cur.execute("""
                     INSERT INTO letrado (nombre)
-                    VALUES (%s)
+                    SELECT nombre
+                    FROM stg_letrado
+                    ORDER BY _fila
                     ON CONFLICT (nombre) DO NOTHING
-                """, (nombre,))
-                count += 1
+                """)
+            else:
+                count, cuarentena = escribir_en_lotes(cur, """
+                    INSERT INTO letrado (nombre)
+                    VALUES %s
+                    ON CONFLICT (nombre) DO NOTHING
+                """, filas)
         conn.commit()
-        print(f"✅ Letrados insertados: {count}")
+        escribir_rechazos("letrado", ["nombre"], cuarentena)
+        print(f"✅ Letrados insertados: {count} (errores: {len(cuarentena)})")
+        return ResultadoCarga(count + len(cuarentena), count, len(cuarentena))
     except Exception as e:
         conn.rollback()
         print(f"❌ Error al cargar letrados: {e}")
+        return ResultadoCarga(0, 0, 0, error=str(e))
+
+COLUMNAS_RECHAZO_REPRESENTACION = ["numero_expediente", "nombre_parte", "letrado", "rol"]
 
-def cargar_representacion(conn):
+def cargar_representacion(conn, usar_copy=False):
     print("Cargando representaciones...")
+    leidas = 0
     count = 0
     errores = 0
     try:
         with conn.cursor() as cur, open("etl_representaciones.csv", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    cur.execute("SELECT parte_id FROM parte WHERE nombre_razon_social = %s AND numero_expediente = %s",
-                                (parse_nullable(row["nombre_parte"]), parse_nullable(row["numero_expediente"])))
-                    parte_id = cur.fetchone()
-
-                    cur.execute("SELECT letrado_id FROM letrado WHERE nombre = %s",
-                                (parse_nullable(row["letrado"]),))
-                    letrado_id = cur.fetchone()
-
-                    if parte_id and letrado_id:
-                        cur.execute("""
-                            INSERT INTO representacion (numero_expediente, parte_id, letrado_id, rol)
-                            VALUES (%s, %s, %s, %s)
-                            ON CONFLICT DO NOTHING
-                        """, (
-                            parse_nullable(row["numero_expediente"]),
-                            parte_id[0],
-                            letrado_id[0],
-                            parse_nullable(row.get("rol"))
-                        ))
-                        count += 1
+            filas = (fila_representacion(row) for row in reader)
+            if usar_copy:
+                leidas, count, rechazos = copiar_representaciones(cur, filas)
+            else:
+                # Resolver parte y letrado en memoria y escribir en lotes
+                resolutor = ResolutorClaves(cur)
+                resueltas = {}
+                rechazos = []
+                for fila in filas:
+                    leidas += 1
+                    numero_expediente, nombre_parte, letrado, rol = fila
+                    parte_id = resolutor.parte_id(numero_expediente, nombre_parte)
+                    letrado_id = resolutor.letrado_id(letrado)
+                    if parte_id is None:
+                        rechazos.append((fila, "parte no encontrada"))
+                    elif letrado_id is None:
+                        rechazos.append((fila, "letrado no encontrado"))
                     else:
-                        errores += 1
-                except Exception as e:
-                    errores += 1
-                    if errores <= 3:
-                        print(f"  ⚠️ Error en representación: {e}")
+                        # Cada fila resuelta recuerda la original para el reporte de cuarentena
+                        resueltas.setdefault((numero_expediente, parte_id, letrado_id, rol), fila)
+                count, cuarentena = escribir_en_lotes(cur, """
+                    INSERT INTO representacion (numero_expediente, parte_id, letrado_id, rol)
+                    VALUES %s
+                    ON CONFLICT DO NOTHING
+                """, list(resueltas))
+                rechazos += [(resueltas[fila], error) for fila, error in cuarentena]
+            errores = len(rechazos)
         conn.commit()
+        escribir_rechazos("representacion", COLUMNAS_RECHAZO_REPRESENTACION, rechazos)
         print(f"✅ Representaciones insertadas: {count} (no encontrados: {errores})")
+        return ResultadoCarga(leidas, count, errores)
     except Exception as e:
         conn.rollback()
         print(f"❌ Error al cargar representaciones: {e}")
+        return ResultadoCarga(leidas, 0, 0, error=str(e))
 
-def cargar_resolucion(conn):
+def cargar_resolucion(conn, usar_copy=False):
     print("Cargando resoluciones...")
     count = 0
     errores = 0
+    cuarentena = []
     try:
         with conn.cursor() as cur, open("etl_resoluciones.csv", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    fecha = parse_nullable_date(row["fecha"])
-                    cur.execute("""
-                        INSERT INTO resolucion (numero_expediente, fecha, nombre, link)
-                        VALUES (%s, %s, %s, %s)
-                        ON CONFLICT DO NOTHING
-                    """, (
-                        parse_nullable(row["numero_expediente"]),
-                        fecha,
-                        parse_nullable(row["nombre"]),
-                        parse_nullable(row["link"])
-                    ))
-                    count += 1
-                except Exception as e:
-                    errores += 1
-                    if errores <= 5:
-                        print(f"  ⚠️ Error en resolución {row.get('numero_expediente')}, fecha '{row.get('fecha')}': {e}")
+            filas = (fila_resolucion(row) for row in reader)
+            if usar_copy:
+                count = copy_a_staging(
+                    cur, "stg_resolucion",
+                    ["numero_expediente", "fecha", "nombre", "link"],
+                    filas, tabla="resolucion"
+                )
+                cur.execute("""
+                    INSERT INTO resolucion (numero_expediente, fecha, nombre, link)
+                    SELECT numero_expediente, fecha, nombre, link
+                    FROM stg_resolucion
+                    ORDER BY _fila
+                    ON CONFLICT DO NOTHING
+                """)
+            else:
+                count, cuarentena = escribir_en_lotes(cur, """
+                    INSERT INTO resolucion (numero_expediente, fecha, nombre, link)
+                    VALUES %s
+                    ON CONFLICT DO NOTHING
+                """, filas)
+                errores = len(cuarentena)
         conn.commit()
+        escribir_rechazos("resolucion", ["numero_expediente", "fecha", "nombre", "link"], cuarentena)
         print(f"✅ Resoluciones insertadas: {count} (errores: {errores})")
+        return ResultadoCarga(count + errores, count, errores)
     except Exception as e:
         conn.rollback()
         print(f"❌ Error al cargar resoluciones: {e}")
+        return ResultadoCarga(0, 0, 0, error=str(e))
 
-def cargar_radicacion(conn):
+def cargar_radicacion(conn, usar_copy=False):
     print("Cargando radicaciones...")
     count = 0
     errores = 0
+    cuarentena = []
+    columnas = [
+        "numero_expediente", "orden", "fecha_radicacion",
+        "tribunal", "fiscal_nombre", "fiscalia"
+    ]
     try:
         with conn.cursor() as cur, open("etl_radicaciones.csv", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    cur.execute("""
-                        INSERT INTO radicacion (
-                            numero_expediente, orden, fecha_radicacion,
-                            tribunal, fiscal_nombre, fiscalia
-                        )
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (numero_expediente, orden) DO UPDATE
-                        SET fecha_radicacion = EXCLUDED.fecha_radicacion,
-                            tribunal = EXCLUDED.tribunal,
-                            fiscal_nombre = EXCLUDED.fiscal_nombre,
-                            fiscalia = EXCLUDED.fiscalia
-                    """, (
-                        parse_nullable(row["numero_expediente"]),
-                        parse_nullable(row["orden"]),
-                        parse_nullable_date(row["fecha_radicacion"]),
-                        parse_nullable(row["tribunal"]),
-                        parse_nullable(row["fiscal_nombre"]),
-                        parse_nullable(row["fiscalia"])
-                    ))
-                    count += 1
-                except Exception as e:
-                    errores += 1
-                    if errores <= 3:
-                        print(f"  ⚠️ Error en radicación: {e}")
+            filas = (fila_radicacion(row) for row in reader)
+            if usar_copy:
+                count = copy_a_staging(cur, "stg_radicacion", columnas, filas, tabla="radicacion")
+                cur.execute(f"""
+                    INSERT INTO radicacion ({', '.join(columnas)})
+                    {seleccion_fusionada(
+                        "stg_radicacion", ["numero_expediente", "orden"], columnas,
+                        ["fecha_radicacion", "tribunal", "fiscal_nombre", "fiscalia"]
+                    )}
+                    ON CONFLICT (numero_expediente, orden) DO UPDATE
+                    SET fecha_radicacion = EXCLUDED.fecha_radicacion,
+                        tribunal = EXCLUDED.tribunal,
+                        fiscal_nombre = EXCLUDED.fiscal_nombre,
+                        fiscalia = EXCLUDED.fiscalia
+                """)
+            else:
+                count, cuarentena = escribir_en_lotes(cur, f"""
+                    INSERT INTO radicacion ({', '.join(columnas)})
+                    VALUES %s
+                    ON CONFLICT (numero_expediente, orden) DO UPDATE
+                    SET fecha_radicacion = EXCLUDED.fecha_radicacion,
+                        tribunal = EXCLUDED.tribunal,
+                        fiscal_nombre = EXCLUDED.fiscal_nombre,
+                        fiscalia = EXCLUDED.fiscalia
+                """, filas, clave=lambda fila: (fila[0], fila[1]))
+                errores = len(cuarentena)
         conn.commit()
+        escribir_rechazos("radicacion", columnas, cuarentena)
         print(f"✅ Radicaciones insertadas: {count} (errores: {errores})")
+        return ResultadoCarga(count + errores, count, errores)
     except Exception as e:
         conn.rollback()
         print(f"❌ Error al cargar radicaciones: {e}")
+        return ResultadoCarga(0, 0, 0, error=str(e))
 
-def cargar_juez(conn):
+def cargar_juez(conn, usar_copy=False):
     print("Cargando jueces...")
     count = 0
+    cuarentena = []
     try:
         with conn.cursor() as cur, open("etl_jueces.csv", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            for row in reader:
-                cur.execute("""
+            filas = (fila_juez(row) for row in reader)
+            if usar_copy:
+                count = copy_a_staging(
+                    cur, "stg_juez",
+                    ["juez_id", "nombre", "email", "telefono"],
+                    filas, tabla="juez"
+                )
+                cur.execute(f"""
+                    INSERT INTO juez (juez_id, nombre, email, telefono)
+                    {seleccion_fusionada(
+                        "stg_juez", ["nombre"],
+                        ["juez_id", "nombre", "email", "telefono"], ["email", "telefono"]
+                    )}
+                    ON CONFLICT (nombre) DO UPDATE 
+                    SET email = EXCLUDED.email,
+                        telefono = EXCLUDED.telefono
+                """)
+            else:
+                count, cuarentena = escribir_en_lotes(cur, """
                     INSERT INTO juez (juez_id, nombre, email, telefono)
-                    VALUES (%s, %s, %s, %s)
+                    VALUES %s
                     ON CONFLICT (nombre) DO UPDATE 
                     SET email = EXCLUDED.email,
                         telefono = EXCLUDED.telefono
-                """, (
-                    parse_nullable(row["juez_id"]),
-                    parse_nullable(row["nombre"]),
-                    parse_nullable(row["email"]),
-                    parse_nullable(row["telefono"])
-                ))
-                count += 1
+                """, filas, clave=lambda fila: fila[1])
         conn.commit()
-        print(f"✅ Jueces insertados: {count}")
+        escribir_rechazos("juez", ["juez_id", "nombre", "email", "telefono"], cuarentena)
+        print(f"✅ Jueces insertados: {count} (errores: {len(cuarentena)})")
+        return ResultadoCarga(count + len(cuarentena), count, len(cuarentena))
     except Exception as e:
         conn.rollback()
         print(f"❌ Error al cargar jueces: {e}")
+        return ResultadoCarga(0, 0, 0, error=str(e))
+
+COLUMNAS_RECHAZO_TRIBUNAL_JUEZ = ["tribunal_id", "juez_id", "cargo", "situacion"]
 
-def cargar_tribunal_juez(conn):
+def cargar_tribunal_juez(conn, usar_copy=False):
     print("Cargando relaciones tribunal-juez...")
+    leidas = 0
     count = 0
     errores = 0
     try:
-        with open("etl_tribunal_juez.csv", newline="", encoding="utf-8") as f:
+        with conn.cursor() as cur, open("etl_tribunal_juez.csv", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    with conn.cursor() as cur:  
-                        
-                        cur.execute("SELECT tribunal_id FROM tribunal WHERE tribunal_id = %s", 
-                                   (parse_nullable(row["tribunal_id"]),))
-                        if not cur.fetchone():
-                            errores += 1
-                            continue
-                        
-                        cur.execute("SELECT juez_id FROM juez WHERE juez_id = %s", 
-                                   (parse_nullable(row["juez_id"]),))
-                        if not cur.fetchone():
-                            errores += 1
-                            continue
-                        
-                        cur.execute("""
-                            INSERT INTO tribunal_juez (tribunal_id, juez_id, cargo, situacion)
-                            VALUES (%s, %s, %s, %s)
-                            ON CONFLICT (tribunal_id, juez_id) DO UPDATE
-                            SET cargo = EXCLUDED.cargo,
-                                situacion = EXCLUDED.situacion
-                        """, (
-                            parse_nullable(row["tribunal_id"]),
-                            parse_nullable(row["juez_id"]),
-                            parse_nullable(row["cargo"]),
-                            parse_nullable(row["situacion"])
-                        ))
-                        conn.commit()  # Commit después de cada INSERT exitoso
-                        count += 1
-                except Exception as e:
-                    conn.rollback()  # Rollback solo de esta fila
-                    errores += 1
-                    if errores <= 3:
-                        print(f"  ⚠️ Error en tribunal-juez: {e}")
-        
+            filas = (fila_tribunal_juez(row) for row in reader)
+            if usar_copy:
+                leidas = copy_a_staging(
+                    cur, "stg_tribunal_juez",
+                    COLUMNAS_RECHAZO_TRIBUNAL_JUEZ,
+                    filas, tabla="tribunal_juez"
+                )
+                # Solo las relaciones cuyo tribunal y juez existen, como en la carga fila por fila
+                validas = """(
+                    SELECT s.*
+                    FROM stg_tribunal_juez s
+                    JOIN tribunal t ON t.tribunal_id = s.tribunal_id
+                    JOIN juez j ON j.juez_id = s.juez_id
+                ) s"""
+                cur.execute(f"""
+                    INSERT INTO tribunal_juez (tribunal_id, juez_id, cargo, situacion)
+                    {seleccion_fusionada(
+                        validas, ["tribunal_id", "juez_id"],
+                        COLUMNAS_RECHAZO_TRIBUNAL_JUEZ, ["cargo", "situacion"]
+                    )}
+                    ON CONFLICT (tribunal_id, juez_id) DO UPDATE
+                    SET cargo = EXCLUDED.cargo,
+                        situacion = EXCLUDED.situacion
+                """)
+                # Filas escritas de verdad: los duplicados se fusionaron en una
+                count = cur.rowcount
+                cur.execute("""
+                    SELECT s.tribunal_id, s.juez_id, s.cargo, s.situacion,
+                           CASE WHEN t.tribunal_id IS NULL THEN 'tribunal no encontrado'
+                                WHEN j.juez_id IS NULL THEN 'juez no encontrado' END
+                    FROM stg_tribunal_juez s
+                    LEFT JOIN tribunal t ON t.tribunal_id = s.tribunal_id
+                    LEFT JOIN juez j ON j.juez_id = s.juez_id
+                    ORDER BY s._fila
+                """)
+                rechazos = [(fila[:4], fila[4]) for fila in cur.fetchall() if fila[4]]
+            else:
+                # Validar tribunal y juez en memoria; si una relación se repite gana la última fila
+                resolutor = ResolutorClaves(cur)
+                resueltas = []
+                rechazos = []
+                for fila in filas:
+                    if not resolutor.existe_tribunal(fila[0]):
+                        rechazos.append((fila, "tribunal no encontrado"))
+                    elif not resolutor.existe_juez(fila[1]):
+                        rechazos.append((fila, "juez no encontrado"))
+                    else:
+                        resueltas.append(fila)
+                count, cuarentena = escribir_en_lotes(cur, """
+                    INSERT INTO tribunal_juez (tribunal_id, juez_id, cargo, situacion)
+                    VALUES %s
+                    ON CONFLICT (tribunal_id, juez_id) DO UPDATE
+                    SET cargo = EXCLUDED.cargo,
+                        situacion = EXCLUDED.situacion
+                """, resueltas, clave=lambda fila: (fila[0], fila[1]))
+                leidas = len(resueltas) + len(rechazos)
+                rechazos += cuarentena
+            errores = len(rechazos)
+        conn.commit()
+        escribir_rechazos("tribunal_juez", COLUMNAS_RECHAZO_TRIBUNAL_JUEZ, rechazos)
         print(f"✅ Relaciones tribunal-juez insertadas: {count} (errores: {errores})")
+        return ResultadoCarga(leidas, count, errores)
     except Exception as e:
+        conn.rollback()
         print(f"❌ Error al cargar tribunal-juez: {e}")
+        return ResultadoCarga(leidas, 0, 0, error=str(e))
 
-def extraer_y_cargar_delitos(conn):
-    """Extrae delitos únicos de expedientes y los normaliza en tipo_delito"""
-    print("Extrayendo y cargando tipos de delito...")
-    count = 0
-    errores = 0
-    
-    try:
-        with conn.cursor() as cur:
-            # Obtener todos los delitos únicos de la columna delitos
-            cur.execute("""
-                SELECT DISTINCT TRIM(unnest(string_to_array(delitos, ','))) as delito
-                FROM expediente 
-                WHERE delitos IS NOT NULL AND delitos != ''
-            """)
-            
-            delitos_raw = cur.fetchall()
-            delitos_procesados = set()  # Para evitar duplicados por nombre
-            
-            for (delito_raw,) in delitos_raw:
-                if not delito_raw or not delito_raw.strip():
-                    continue
-                
-                try:
-                    nombre, articulo, ley = parsear_delito(delito_raw)
-                    
-                    # Usar nombre como clave única
-                    if nombre not in delitos_procesados:
-                        cur.execute("""
-                            INSERT INTO tipo_delito (nombre, articulo, ley)
-                            VALUES (%s, %s, %s)
-                            ON CONFLICT (nombre) DO UPDATE
-                            SET articulo = COALESCE(EXCLUDED.articulo, tipo_delito.articulo),
-                                ley = COALESCE(EXCLUDED.ley, tipo_delito.ley)
-                        """, (nombre, articulo, ley))
-                        delitos_procesados.add(nombre)
-                        count += 1
-                except Exception as e:
-                    errores += 1
-                    if errores <= 5:
-                        print(f"  ⚠️ Error parseando delito '{delito_raw}': {e}")
-            
-            conn.commit()
-            print(f"✅ Tipos de delito insertados: {count} (errores: {errores})")
-                    
-    except Exception as e:
-        conn.rollback()
-        print(f"❌ Error al cargar tipos de delito: {e}")
+def vincular_delitos(cur, expedientes):
+    """
+    Normaliza los delitos de los expedientes dados en tipo_delito y crea sus
+    vínculos en expediente_delito. Cada string de delito distinto se parsea
+    una sola vez, los tipos se escriben en un único upsert y los vínculos en
+    un único COPY + INSERT.
 
-def vincular_expedientes_delitos(conn):
-    """Vincula expedientes con sus delitos normalizados en expediente_delito"""
-    print("Vinculando expedientes con delitos...")
-    count = 0
-    errores = 0
-    no_encontrados = 0
-    
+    Args:
+        cur: Cursor abierto (no hace commit)
+        expedientes: Iterable de (numero_expediente, delitos)
+
+    Returns:
+        Tupla (tipos de delito, vínculos)
+    """
+    delitos_por_expediente = []
+    tipos = {}
+    for numero_expediente, delitos_str in expedientes:
+        delitos_lista = {d.strip() for d in (delitos_str or "").split(",") if d.strip()}
+        if not delitos_lista:
+            continue
+        delitos_por_expediente.append((numero_expediente, delitos_lista))
+        for delito_raw in delitos_lista:
+            nombre, articulo, ley = parsear_delito(delito_raw)
+            # Si el mismo nombre aparece con y sin artículo/ley, conservar los datos
+            articulo_previo, ley_previa = tipos.get(nombre, (None, None))
+            tipos[nombre] = (articulo_previo or articulo, ley_previa or ley)
+    if not tipos:
+        return 0, 0
+
+    ids = dict(execute_values(cur, """
+        INSERT INTO tipo_delito (nombre, articulo, ley)
+        VALUES %s
+        ON CONFLICT (nombre) DO UPDATE
+        SET articulo = COALESCE(EXCLUDED.articulo, tipo_delito.articulo),
+            ley = COALESCE(EXCLUDED.ley, tipo_delito.ley)
+        RETURNING nombre, tipo_delito_id
+    """, [(nombre, articulo, ley) for nombre, (articulo, ley) in tipos.items()],
+        page_size=TAMANO_LOTE, fetch=True))
+
+    # Dos variantes del mismo delito en un expediente dan un solo vínculo
+    pares = {
+        (numero_expediente, ids[parsear_delito(delito_raw)[0]])
+        for numero_expediente, delitos_lista in delitos_por_expediente
+        for delito_raw in delitos_lista
+    }
+    vinculos = copy_a_staging(
+        cur, "stg_expediente_delito", ["numero_expediente", "tipo_delito_id"], pares,
+        tabla="expediente_delito"
+    )
+    cur.execute("""
+        INSERT INTO expediente_delito (numero_expediente, tipo_delito_id)
+        SELECT numero_expediente, tipo_delito_id
+        FROM stg_expediente_delito
+        ON CONFLICT DO NOTHING
+    """)
+    return len(tipos), vinculos
+
+def cargar_delitos(conn):
+    """Normaliza los delitos de todos los expedientes en tipo_delito y expediente_delito"""
+    print("Extrayendo tipos de delito y vinculando expedientes...")
     try:
         with conn.cursor() as cur:
             cur.execute("""
-                SELECT numero_expediente, delitos 
-                FROM expediente 
+                SELECT numero_expediente, delitos
+                FROM expediente
                 WHERE delitos IS NOT NULL AND delitos != ''
             """)
-            
             expedientes = cur.fetchall()
-            
-            for numero_exp, delitos_str in expedientes:
-                # Separar delitos por coma
-                delitos_lista = [d.strip() for d in delitos_str.split(',') if d.strip()]
-                
-                for delito_raw in delitos_lista:
-                    try:
-                        nombre, _, _ = parsear_delito(delito_raw)
-                        
-                        # Buscar el tipo_delito_id por nombre
-                        cur.execute("""
-                            SELECT tipo_delito_id FROM tipo_delito WHERE nombre = %s
-                        """, (nombre,))
-                        
-                        result = cur.fetchone()
-                        if result:
-                            tipo_delito_id = result[0]
-                            cur.execute("""
-                                INSERT INTO expediente_delito (numero_expediente, tipo_delito_id)
-                                VALUES (%s, %s)
-                                ON CONFLICT DO NOTHING
-                            """, (numero_exp, tipo_delito_id))
-                            count += 1
-                        else:
-                            no_encontrados += 1
-                            if no_encontrados <= 3:
-                                print(f"  ⚠️ Delito no encontrado: '{nombre}' en exp {numero_exp}")
-                    except Exception as e:
-                        errores += 1
-                        if errores <= 5:
-                            print(f"  ⚠️ Error vinculando {numero_exp}: {e}")
-            
-            conn.commit()
-            print(f"✅ Vínculos expediente-delito creados: {count} (errores: {errores}, no encontrados: {no_encontrados})")
-            
+            tipos, vinculos = vincular_delitos(cur, expedientes)
+        conn.commit()
+        print(f"✅ Tipos de delito: {tipos}, vínculos expediente-delito: {vinculos}")
+        return ResultadoCarga(len(expedientes), tipos + vinculos, 0)
     except Exception as e:
         conn.rollback()
-        print(f"❌ Error al vincular expedientes con delitos: {e}")
+        print(f"❌ Error al cargar delitos: {e}")
+        return ResultadoCarga(0, 0, 0, error=str(e))
 
 # ============================================
-# Funciones de metadata
+# Nombres normalizados
 # ============================================
 
-def crear_tabla_metadata_si_no_existe(conn):
-    """Crea la tabla metadata si no existe"""
+# Los gráficos agrupan por tribunal, fiscalía y juez sin el prefijo "Dr./Dra."
+# y con "Lo"/"Los" en mayúscula inicial. Esa limpieza se calcula una vez por
+# carga en columnas indexadas, en lugar de en cada consulta de la API.
+SIN_TITULO_SQL = r"""
+    REGEXP_REPLACE(
+        REGEXP_REPLACE(
+            REGEXP_REPLACE(
+                REGEXP_REPLACE(NULLIF(TRIM({columna}), ''), '^Dr\.?\s+', '', 'g'),
+                '^Dra\.?\s+', '', 'g'
+            ),
+            '^DR\.?\s+', '', 'g'
+        ),
+        '^DRA\.?\s+', '', 'g'
+    )
+"""
+
+LO_LOS_SQL = r"""
+    REGEXP_REPLACE(
+        REGEXP_REPLACE(
+            REPLACE(REPLACE({valor}, ' LO ', ' Lo '), ' LOS ', ' Los '),
+            '^LO ', 'Lo ', 'g'
+        ),
+        '^LOS ', 'Los ', 'g'
+    )
+"""
+
+# (tabla, columna normalizada, expresión a partir de la columna original)
+COLUMNAS_NORMALIZADAS = [
+    ("expediente", "tribunal_normalizado",
+     LO_LOS_SQL.format(valor=SIN_TITULO_SQL.format(columna="tribunal"))),
+    ("expediente", "fiscalia_normalizada",
+     LO_LOS_SQL.format(valor="NULLIF(TRIM(fiscalia), '')")),
+    ("juez", "juez_nombre_normalizado",
+     SIN_TITULO_SQL.format(columna="nombre")),
+]
+
+# Índices para agrupar sin leer la tabla (index-only scan)
+INDICES_NORMALIZADOS = [
+    ("expediente_tribunal_normalizado_idx", "expediente", "tribunal_normalizado, estado_procesal"),
+    ("expediente_fiscalia_normalizada_idx", "expediente", "fiscalia_normalizada, estado_procesal"),
+    ("juez_juez_nombre_normalizado_idx", "juez", "juez_nombre_normalizado"),
+]
+
+def asegurar_columnas_normalizadas(conn):
+    """
+    Agrega a las tablas de public las columnas normalizadas y sus índices si
+    todavía no existen. Corre antes de armar el esquema sombra, que las copia.
+    """
     try:
         with conn.cursor() as cur:
-            cur.execute("""
+            cur.execute("SET LOCAL search_path TO public")
+            for tabla, columna, _ in COLUMNAS_NORMALIZADAS:
+                cur.execute(f"ALTER TABLE {tabla} ADD COLUMN IF NOT EXISTS {columna} TEXT")
+            for nombre, tabla, columnas in INDICES_NORMALIZADOS:
+                cur.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({columnas})")
+        conn.commit()
+        print("✓ Columnas normalizadas verificadas/creadas")
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Advertencia al crear columnas normalizadas: {e}")
+
+def normalizar_nombres(cur):
+    """Recalcula las columnas normalizadas; solo reescribe las filas que cambian."""
+    actualizadas = 0
+    for tabla, columna, expresion in COLUMNAS_NORMALIZADAS:
+        cur.execute(f"""
+            UPDATE {tabla}
+            SET {columna} = {expresion}
+            WHERE {columna} IS DISTINCT FROM {expresion}
+        """)
+        actualizadas += cur.rowcount
+    return actualizadas
+
+def cargar_nombres_normalizados(conn):
+    print("Normalizando nombres de tribunales, fiscalías y jueces...")
+    try:
+        with conn.cursor() as cur:
+            count = normalizar_nombres(cur)
+        conn.commit()
+        print(f"✅ Nombres normalizados: {count}")
+        return ResultadoCarga(count, count, 0)
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error al normalizar nombres: {e}")
+        return ResultadoCarga(0, 0, 0, error=str(e))
+
+# ============================================
+# Índices de la API
+# ============================================
+
+# Índices que usan los endpoints de la API (no los gráficos). El listado de
+# /expedientes pagina por cursor (keyset) en orden de numero_expediente o de
+# (fecha_inicio, numero_expediente): cada página es un index scan que arranca
+# en la última clave de la anterior, así que cuesta lo mismo la página 1 que
+# la 1000. Las variantes por estado_procesal cubren el filtro más usado.
+INDICES_API = [
+    ("expediente_fecha_inicio_keyset_idx", "expediente", "fecha_inicio, numero_expediente"),
+    ("expediente_estado_keyset_idx", "expediente", "estado_procesal, numero_expediente"),
+    ("expediente_estado_fecha_keyset_idx", "expediente", "estado_procesal, fecha_inicio, numero_expediente"),
+]
+
+def asegurar_indices_api(conn):
+    """
+    Crea en public los índices de INDICES_API si todavía no existen. Corre
+    antes de armar el esquema sombra, que los copia.
+    """
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL search_path TO public")
+            for nombre, tabla, columnas in INDICES_API:
+                cur.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({columnas})")
+        conn.commit()
+        print("✓ Índices de la API verificados/creados")
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Advertencia al crear los índices de la API: {e}")
+
+# ============================================
+# Búsqueda de expedientes
+# ============================================
+
+# /expedientes/search busca por tres vías, todas con índice:
+#   - texto completo sobre la carátula: columna caratula_busqueda (tsvector,
+#     configuración CONFIG_BUSQUEDA = español sin acentos), calculada por
+#     Postgres en cada INSERT/UPDATE, con índice GIN;
+#   - subcadena de la carátula (nombres propios, siglas, palabras a medio
+#     escribir): índice GIN de trigramas sobre sin_acentos(caratula);
+#   - prefijo del número de expediente: índice btree text_pattern_ops sobre
+#     upper(numero_expediente), que sirve para LIKE 'CFP 1234%'.
+# unaccent() no es IMMUTABLE y no se puede indexar; sin_acentos() la envuelve
+# fijando el diccionario.
+CONFIG_BUSQUEDA = "es_sin_acentos"
+
+INDICES_BUSQUEDA = [
+    ("expediente_caratula_busqueda_idx", "expediente USING gin (caratula_busqueda)"),
+    ("expediente_caratula_trgm_idx", "expediente USING gin (public.sin_acentos(caratula) gin_trgm_ops)"),
+    ("expediente_numero_prefijo_idx", "expediente (upper(numero_expediente) text_pattern_ops)"),
+]
+
+def asegurar_busqueda(conn):
+    """
+    Crea en public lo que usa la búsqueda de expedientes: las extensiones
+    unaccent y pg_trgm, la configuración de texto CONFIG_BUSQUEDA, la función
+    sin_acentos, la columna caratula_busqueda y los índices de
+    INDICES_BUSQUEDA, si todavía no existen. Corre antes de armar el esquema
+    sombra, que los copia.
+
+    La primera vez agregar caratula_busqueda reescribe la tabla expediente.
+    """
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL search_path TO public")
+            cur.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+            cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cur.execute("SELECT 1 FROM pg_ts_config WHERE cfgname = %s", (CONFIG_BUSQUEDA,))
+            if cur.fetchone() is None:
+                cur.execute(f"CREATE TEXT SEARCH CONFIGURATION public.{CONFIG_BUSQUEDA} (COPY = pg_catalog.spanish)")
+                cur.execute(f"""
+                    ALTER TEXT SEARCH CONFIGURATION public.{CONFIG_BUSQUEDA}
+                    ALTER MAPPING FOR hword, hword_part, word WITH public.unaccent, spanish_stem
+                """)
+            cur.execute("""
+                CREATE OR REPLACE FUNCTION public.sin_acentos(text) RETURNS text
+                LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+                AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+            """)
+            cur.execute(f"""
+                ALTER TABLE expediente ADD COLUMN IF NOT EXISTS caratula_busqueda tsvector
+                GENERATED ALWAYS AS (
+                    to_tsvector('public.{CONFIG_BUSQUEDA}'::regconfig, coalesce(caratula, ''))
+                ) STORED
+            """)
+            for nombre, definicion in INDICES_BUSQUEDA:
+                cur.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {definicion}")
+        conn.commit()
+        print("✓ Búsqueda de expedientes verificada/creada")
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Advertencia al preparar la búsqueda de expedientes: {e}")
+
+# ============================================
+# Personas canónicas
+# ============================================
+
+# Los gráficos de personas agrupan las variantes de un mismo nombre ("CFK",
+# "CRISTINA FERNANDEZ", ...) bajo un nombre canónico. Las variantes viven en
+# ARCHIVO_ALIAS (alias, persona_canonica, excluida), se cargan a la tabla
+# persona_alias y en cada carga se aplican a parte.persona_canonica, indexada.
+# Los alias marcados como excluidos son homónimos que no deben contarse entre
+# los denunciados.
+ARCHIVO_ALIAS = os.getenv("LOAD_ALIAS_CSV", os.path.join(DIRECTORIO_SCRIPT, "persona_alias.csv"))
+
+def asegurar_tabla_alias(conn):
+    """
+    Crea en public la tabla persona_alias y agrega a parte las columnas
+    persona_canonica y persona_excluida con su índice, si todavía no existen.
+    Corre antes de armar el esquema sombra, que las copia.
+    """
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL search_path TO public")
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS persona_alias (
+                    alias TEXT PRIMARY KEY,
+                    persona_canonica TEXT NOT NULL,
+                    excluida BOOLEAN NOT NULL DEFAULT FALSE
+                )
+            """)
+            cur.execute("ALTER TABLE parte ADD COLUMN IF NOT EXISTS persona_canonica TEXT")
+            cur.execute("""
+                ALTER TABLE parte
+                ADD COLUMN IF NOT EXISTS persona_excluida BOOLEAN NOT NULL DEFAULT FALSE
+            """)
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS parte_persona_canonica_idx
+                ON parte (persona_canonica, parte_id)
+            """)
+        conn.commit()
+        print("✓ Tabla persona_alias y columnas canónicas verificadas/creadas")
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Advertencia al crear la tabla persona_alias: {e}")
+
+def fila_alias(row):
+    return (
+        row["alias"].strip().upper(),
+        row["persona_canonica"].strip().upper(),
+        row.get("excluida", "").strip().lower() in ("1", "true", "si", "sí"),
+    )
+
+def cargar_alias(cur):
+    """Reemplaza el contenido de persona_alias por el de ARCHIVO_ALIAS."""
+    with open(ARCHIVO_ALIAS, newline="", encoding="utf-8") as f:
+        # Un alias repetido se queda con la última fila del archivo
+        alias = {fila[0]: fila for fila in map(fila_alias, csv.DictReader(f)) if fila[0]}
+    cur.execute("DELETE FROM persona_alias")
+    execute_values(cur, """
+        INSERT INTO persona_alias (alias, persona_canonica, excluida) VALUES %s
+    """, list(alias.values()), page_size=TAMANO_LOTE)
+    return len(alias)
+
+def canonizar_personas(cur):
+    """
+    Recalcula parte.persona_canonica y parte.persona_excluida a partir de
+    persona_alias; solo reescribe las filas que cambian. Los nombres vacíos
+    o "NAN" quedan sin persona canónica.
+    """
+    cur.execute("""
+        WITH canonicas AS (
+            SELECT
+                p.parte_id,
+                CASE
+                    WHEN UPPER(TRIM(p.nombre_razon_social)) IN ('', 'NAN') THEN NULL
+                    ELSE COALESCE(a.persona_canonica, UPPER(TRIM(p.nombre_razon_social)))
+                END AS persona_canonica,
+                COALESCE(a.excluida, FALSE) AS persona_excluida
+            FROM parte p
+            LEFT JOIN persona_alias a ON a.alias = UPPER(TRIM(p.nombre_razon_social))
+        )
+        UPDATE parte p
+        SET persona_canonica = c.persona_canonica,
+            persona_excluida = c.persona_excluida
+        FROM canonicas c
+        WHERE p.parte_id = c.parte_id
+          AND (p.persona_canonica IS DISTINCT FROM c.persona_canonica
+               OR p.persona_excluida IS DISTINCT FROM c.persona_excluida)
+    """)
+    return cur.rowcount
+
+def cargar_personas_canonicas(conn):
+    print("Aplicando alias de personas...")
+    try:
+        with conn.cursor() as cur:
+            alias = cargar_alias(cur)
+            count = canonizar_personas(cur)
+        conn.commit()
+        print(f"✅ Alias cargados: {alias}, partes canonizadas: {count}")
+        return ResultadoCarga(alias, alias + count, 0)
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error al aplicar alias de personas: {e}")
+        return ResultadoCarga(0, 0, 0, error=str(e))
+
+# ============================================
+# Resúmenes precalculados
+# ============================================
+
+# Agregados de los gráficos más pesados, recalculados al final de cada carga.
+# La API los lee en lugar de agregar expediente en cada request (ver
+# USAR_RESUMENES en app/core/config.py). Son tablas y no vistas materializadas
+# para que viajen con el resto en el intercambio del esquema sombra.
+# (tabla, columnas, SELECT que las calcula)
+RESUMENES = [
+    ("resumen_causas_por_ano", """
+        anio INTEGER PRIMARY KEY,
+        cantidad_causas_abiertas INTEGER NOT NULL,
+        cantidad_causas_terminadas INTEGER NOT NULL,
+        cantidad_causas INTEGER NOT NULL
+    """, """
+        SELECT
+            ano_inicio,
+            COUNT(CASE WHEN estado_procesal = 'En trámite' THEN 1 END),
+            COUNT(CASE WHEN estado_procesal = 'Terminada' THEN 1 END),
+            COUNT(*)
+        FROM expediente
+        WHERE ano_inicio IS NOT NULL
+        GROUP BY ano_inicio
+    """),
+    ("resumen_delitos", """
+        delito TEXT PRIMARY KEY,
+        cantidad_causas_abiertas INTEGER NOT NULL,
+        cantidad_causas_terminadas INTEGER NOT NULL,
+        cantidad_causas INTEGER NOT NULL
+    """, """
+        SELECT
+            td.nombre,
+            COUNT(CASE WHEN e.estado_procesal = 'En trámite' THEN 1 END),
+            COUNT(CASE WHEN e.estado_procesal = 'Terminada' THEN 1 END),
+            COUNT(ed.numero_expediente)
+        FROM expediente_delito ed
+        JOIN tipo_delito td ON ed.tipo_delito_id = td.tipo_delito_id
+        JOIN expediente e ON ed.numero_expediente = e.numero_expediente
+        GROUP BY td.nombre
+    """),
+    ("resumen_causas_por_fuero", """
+        fuero TEXT PRIMARY KEY,
+        cantidad_causas_abiertas INTEGER NOT NULL,
+        cantidad_causas_terminadas INTEGER NOT NULL,
+        cantidad_causas INTEGER NOT NULL
+    """, """
+        SELECT
+            t.fuero,
+            COUNT(CASE WHEN e.estado_procesal = 'En trámite' THEN 1 END),
+            COUNT(CASE WHEN e.estado_procesal = 'Terminada' THEN 1 END),
+            COUNT(e.numero_expediente)
+        FROM expediente e
+        JOIN tribunal t ON e.tribunal = t.nombre
+        WHERE t.fuero IS NOT NULL
+        GROUP BY t.fuero
+    """),
+    ("resumen_causas_por_fiscalia", """
+        fiscalia TEXT PRIMARY KEY,
+        causas_abiertas INTEGER NOT NULL,
+        causas_terminadas INTEGER NOT NULL,
+        total_causas INTEGER NOT NULL
+    """, """
+        SELECT
+            fiscalia_normalizada,
+            COUNT(CASE WHEN estado_procesal = 'En trámite' THEN 1 END),
+            COUNT(CASE WHEN estado_procesal = 'Terminada' THEN 1 END),
+            COUNT(*)
+        FROM expediente
+        WHERE fiscalia_normalizada IS NOT NULL
+        GROUP BY fiscalia_normalizada
+    """),
+    ("resumen_jueces_demora", """
+        juez_id INTEGER NOT NULL,
+        juez_nombre TEXT,
+        tribunal_nombre TEXT,
+        demora_promedio_dias NUMERIC NOT NULL,
+        cantidad_expedientes INTEGER NOT NULL
+    """, """
+        SELECT
+            j.juez_id,
+            j.juez_nombre_normalizado,
+            e.tribunal_normalizado,
+            ROUND(AVG(e.fecha_ultimo_movimiento::date - e.fecha_inicio::date), 2),
+            COUNT(e.numero_expediente)
+        FROM expediente e
+        JOIN tribunal t ON e.tribunal = t.nombre
+        JOIN tribunal_juez tj ON tj.tribunal_id = t.tribunal_id
+        JOIN juez j ON j.juez_id = tj.juez_id
+        WHERE e.fecha_inicio IS NOT NULL
+          AND e.fecha_ultimo_movimiento IS NOT NULL
+        GROUP BY j.juez_id, j.juez_nombre_normalizado, e.tribunal_normalizado
+    """),
+]
+
+def asegurar_tablas_resumen(conn):
+    """
+    Crea en public las tablas de RESUMENES si todavía no existen. Corre antes
+    de armar el esquema sombra, que las copia.
+    """
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL search_path TO public")
+            for tabla, columnas, _ in RESUMENES:
+                cur.execute(f"CREATE TABLE IF NOT EXISTS {tabla} ({columnas})")
+        conn.commit()
+        print("✓ Tablas de resúmenes verificadas/creadas")
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Advertencia al crear las tablas de resúmenes: {e}")
+
+def refrescar_resumenes(cur):
+    """Recalcula todas las tablas de RESUMENES; devuelve la cantidad de filas escritas."""
+    filas = 0
+    for tabla, _, select in RESUMENES:
+        cur.execute(f"DELETE FROM {tabla}")
+        cur.execute(f"INSERT INTO {tabla} {select}")
+        filas += cur.rowcount
+    return filas
+
+def cargar_resumenes(conn):
+    print("Calculando resúmenes de los gráficos...")
+    try:
+        with conn.cursor() as cur:
+            count = refrescar_resumenes(cur)
+        conn.commit()
+        print(f"✅ Resúmenes calculados: {len(RESUMENES)} tablas, {count} filas")
+        return ResultadoCarga(0, count, 0)
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error al calcular resúmenes: {e}")
+        return ResultadoCarga(0, 0, 0, error=str(e))
+
+# ============================================
+# Funciones de metadata
+# ============================================
+
+def crear_tabla_metadata_si_no_existe(conn):
+    """Crea la tabla metadata si no existe"""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
                 CREATE TABLE IF NOT EXISTS metadata (
                     clave VARCHAR(50) PRIMARY KEY,
                     valor TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
@@ -661,6 +1765,17 @@ def crear_tabla_metadata_si_no_existe(conn):
     except Exception as e:
         print(f"⚠️ Advertencia al crear tabla metadata: {e}")
 
+def _upsert_ultima_actualizacion(cur):
+    # Insertar o actualizar la fecha de última actualización
+    # NOW() guarda en UTC (PostgreSQL lo convierte automáticamente)
+    # El backend lo convertirá a zona horaria de Argentina al leer
+    cur.execute("""
+        INSERT INTO metadata (clave, valor)
+        VALUES ('ultima_actualizacion', NOW())
+        ON CONFLICT (clave) 
+        DO UPDATE SET valor = NOW()
+    """)
+
 def actualizar_metadata_ultima_actualizacion(conn):
     """
     Actualiza la fecha de última actualización en la tabla metadata.
@@ -673,15 +1788,7 @@ def actualizar_metadata_ultima_actualizacion(conn):
     """
     try:
         with conn.cursor() as cur:
-            # Insertar o actualizar la fecha de última actualización
-            # NOW() guarda en UTC (PostgreSQL lo convierte automáticamente)
-            # El backend lo convertirá a zona horaria de Argentina al leer
-            cur.execute("""
-                INSERT INTO metadata (clave, valor)
-                VALUES ('ultima_actualizacion', NOW())
-                ON CONFLICT (clave) 
-                DO UPDATE SET valor = NOW()
-            """)
+            _upsert_ultima_actualizacion(cur)
         conn.commit()
         print("✅ Fecha de última actualización actualizada en metadata")
     except Exception as e:
@@ -689,50 +1796,1095 @@ def actualizar_metadata_ultima_actualizacion(conn):
         print(f"⚠️ Advertencia: No se pudo actualizar metadata: {e}")
         # No lanzamos excepción para no interrumpir el proceso si falla esto
 
+# ============================================
+# Reporte de la corrida
+# ============================================
+
+# Una fila por corrida completa, junto a metadata, para seguir el rendimiento
+# de la carga en el tiempo. Queda en public y no se reemplaza con cada carga.
+TABLA_EJECUCIONES = "carga_ejecucion"
+DIRECTORIO_REPORTES = os.getenv("LOAD_REPORTS_DIR", "reportes")
+
+def crear_tabla_ejecuciones_si_no_existe(conn):
+    """Crea la tabla de resumen de corridas si no existe"""
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS public.{TABLA_EJECUCIONES} (
+                    ejecucion_id SERIAL PRIMARY KEY,
+                    inicio TIMESTAMP WITH TIME ZONE NOT NULL,
+                    fin TIMESTAMP WITH TIME ZONE NOT NULL,
+                    exitosa BOOLEAN NOT NULL,
+                    modo VARCHAR(20) NOT NULL,
+                    workers INTEGER NOT NULL,
+                    filas_leidas BIGINT NOT NULL,
+                    filas_escritas BIGINT NOT NULL,
+                    filas_rechazadas BIGINT NOT NULL,
+                    segundos NUMERIC(12, 3) NOT NULL,
+                    filas_por_segundo NUMERIC(14, 1) NOT NULL,
+                    rss_pico_kb BIGINT NOT NULL,
+                    etapas JSONB NOT NULL
+                )
+            """)
+        conn.commit()
+        print(f"✓ Tabla {TABLA_EJECUCIONES} verificada/creada")
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Advertencia al crear tabla {TABLA_EJECUCIONES}: {e}")
+
+def rss_pico_kb():
+    """Pico de memoria residente del proceso en KB (ru_maxrss está en KB en Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def armar_reporte(inicio, fin, exitosa, modo, workers, metricas):
+    """
+    Arma el reporte de una corrida a partir de las métricas por etapa.
+
+    Args:
+        inicio, fin: datetime de comienzo y fin de la corrida
+        exitosa: Si la carga se publicó (se informa como no exitosa si
+            alguna etapa tiene error, aunque no se haya propagado)
+        modo: Descripción del modo de carga (ej: "copy/sombra")
+        workers: Etapas simultáneas permitidas
+        metricas: Diccionario {etapa: MetricaEtapa}
+
+    Returns:
+        Diccionario serializable a JSON
+    """
+    etapas = [metrica._asdict() for metrica in metricas.values()]
+    segundos = (fin - inicio).total_seconds()
+    leidas = sum(metrica.leidas for metrica in metricas.values())
+    fallidas = etapas_fallidas(metricas)
+    return {
+        "inicio": inicio.isoformat(),
+        "fin": fin.isoformat(),
+        "exitosa": exitosa and not fallidas,
+        "etapas_fallidas": fallidas,
+        "modo": modo,
+        "workers": workers,
+        "filas_leidas": leidas,
+        "filas_escritas": sum(metrica.escritas for metrica in metricas.values()),
+        "filas_rechazadas": sum(metrica.rechazadas for metrica in metricas.values()),
+        "segundos": round(segundos, 3),
+        "filas_por_segundo": round(leidas / segundos, 1) if segundos else 0.0,
+        "rss_pico_kb": rss_pico_kb(),
+        "etapas": etapas,
+    }
+
+def guardar_reporte(conn, reporte):
+    """
+    Escribe el reporte en DIRECTORIO_REPORTES como JSON y guarda su resumen
+    en la tabla de corridas. Un fallo acá no afecta la carga.
+    """
+    try:
+        os.makedirs(DIRECTORIO_REPORTES, exist_ok=True)
+        nombre = "carga_" + reporte["inicio"][:19].replace(":", "").replace("-", "").replace("T", "_") + ".json"
+        ruta = os.path.join(DIRECTORIO_REPORTES, nombre)
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+        print(f"📝 Reporte de la corrida en {ruta}")
+    except Exception as e:
+        print(f"⚠️ Advertencia: No se pudo escribir el reporte: {e}")
+
+    columnas = [
+        "inicio", "fin", "exitosa", "modo", "workers", "filas_leidas", "filas_escritas",
+        "filas_rechazadas", "segundos", "filas_por_segundo", "rss_pico_kb"
+    ]
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                INSERT INTO public.{TABLA_EJECUCIONES} ({', '.join(columnas)}, etapas)
+                VALUES ({', '.join(['%s'] * len(columnas))}, %s)
+            """, [reporte[columna] for columna in columnas] + [json.dumps(reporte["etapas"], ensure_ascii=False)])
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Advertencia: No se pudo guardar el resumen de la corrida: {e}")
+
+# ============================================
+# Carga incremental (delta)
+# ============================================
+
+# Huellas de la última carga: por cada tabla, la clave natural de cada fila
+# del CSV y un hash de su contenido. Se guardan junto con los datos (la tabla
+# está en TABLAS_CARGA), así un intercambio o un --rollback las mantiene
+# consistentes con lo publicado.
+TABLA_HUELLAS = "carga_huella"
+
+# Tablas con clave natural: una huella por fila.
+# `clave` son las posiciones de la clave dentro de la tupla de `fila`.
+# `actualizadas` son las columnas del SET del ON CONFLICT de la carga completa:
+# si una clave se repite en el CSV, se fusionan sus filas con la misma regla
+# (ver fusionar_fila).
+# `condicion` filtra las filas que se insertan/actualizan (alias `s` = staging).
+EspecDeltaFila = namedtuple(
+    "EspecDeltaFila", ["tabla", "csv", "columnas", "clave", "actualizadas", "fila", "condicion"]
+)
+
+DELTA_POR_FILA = [
+    EspecDeltaFila("fuero", "etl_fueros.csv", ["fuero_id", "nombre"], [1], ["nombre"], fila_fuero, None),
+    EspecDeltaFila(
+        "jurisdiccion", "etl_jurisdicciones.csv",
+        ["jurisdiccion_id", "ambito", "departamento_judicial"], [0],
+        ["ambito", "departamento_judicial"], fila_jurisdiccion, None
+    ),
+    EspecDeltaFila(
+        "tribunal", "etl_tribunales.csv",
+        ["tribunal_id", "nombre", "domicilio_sede", "contacto", "jurisdiccion_id", "fuero"], [1],
+        ["domicilio_sede", "contacto", "jurisdiccion_id", "fuero"], fila_tribunal, None
+    ),
+    EspecDeltaFila(
+        "expediente", "etl_expedientes.csv",
+        [
+            "numero_expediente", "caratula", "jurisdiccion", "tribunal",
+            "estado_procesal", "fecha_inicio", "fecha_ultimo_movimiento",
+            "camara_origen", "ano_inicio", "delitos", "fiscal", "fiscalia"
+        ],
+        [0], ["caratula", "estado_procesal", "fecha_ultimo_movimiento"], fila_expediente, None
+    ),
+    EspecDeltaFila("letrado", "etl_letrados.csv", ["nombre"], [0], [], fila_letrado, None),
+    EspecDeltaFila(
+        "radicacion", "etl_radicaciones.csv",
+        ["numero_expediente", "orden", "fecha_radicacion", "tribunal", "fiscal_nombre", "fiscalia"], [0, 1],
+        ["fecha_radicacion", "tribunal", "fiscal_nombre", "fiscalia"], fila_radicacion, None
+    ),
+    EspecDeltaFila(
+        "juez", "etl_jueces.csv", ["juez_id", "nombre", "email", "telefono"], [1],
+        ["email", "telefono"], fila_juez, None
+    ),
+    EspecDeltaFila(
+        "tribunal_juez", "etl_tribunal_juez.csv",
+        ["tribunal_id", "juez_id", "cargo", "situacion"], [0, 1], ["cargo", "situacion"], fila_tribunal_juez,
+        "EXISTS (SELECT 1 FROM tribunal x WHERE x.tribunal_id = s.tribunal_id) "
+        "AND EXISTS (SELECT 1 FROM juez x WHERE x.juez_id = s.juez_id)"
+    ),
+]
+
+# Tablas sin clave natural (parte tiene id serial, representacion depende de
+# él, resolucion puede repetir filas): una huella por expediente que cubre
+# todas sus filas. Si algo cambia, se reemplazan las filas de ese expediente.
+EspecDeltaExpediente = namedtuple("EspecDeltaExpediente", ["tabla", "csv", "fila"])
+
+DELTA_POR_EXPEDIENTE = [
+    EspecDeltaExpediente("parte", "etl_partes.csv", fila_parte),
+    EspecDeltaExpediente("representacion", "etl_representaciones.csv", fila_representacion),
+    EspecDeltaExpediente("resolucion", "etl_resoluciones.csv", fila_resolucion),
+]
+
+ESPECS_DELTA = {espec.tabla: espec for espec in DELTA_POR_FILA + DELTA_POR_EXPEDIENTE}
+
+Diferencia = namedtuple("Diferencia", ["huellas", "nuevas", "cambiadas", "borradas"])
+
+def crear_tabla_huellas_si_no_existe(conn):
+    """Crea la tabla de huellas de la carga incremental si no existe"""
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            CREATE TABLE IF NOT EXISTS {TABLA_HUELLAS} (
+                tabla VARCHAR(50) NOT NULL,
+                clave TEXT NOT NULL,
+                huella CHAR(32) NOT NULL,
+                PRIMARY KEY (tabla, clave)
+            )
+        """)
+    conn.commit()
+
+def _clave(valores):
+    return json.dumps(list(valores), ensure_ascii=False)
+
+def _huella(valores):
+    datos = json.dumps(list(valores), ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(datos, digest_size=16).hexdigest()
+
+def _leer_csv(nombre_csv, fila):
+    with open(nombre_csv, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield fila(row)
+
+def fusionar_fila(espec, anterior, fila):
+    """
+    Fila que deja el upsert de la carga completa cuando una clave se repite
+    (ver seleccion_fusionada): las columnas de `actualizadas` salen de la
+    última ocurrencia y las demás de la primera.
+    """
+    return tuple(
+        nuevo if columna in espec.actualizadas else viejo
+        for columna, viejo, nuevo in zip(espec.columnas, anterior, fila)
+    )
+
+def huellas_por_fila(espec):
+    """
+    Calcula las huellas de una tabla con clave natural.
+
+    Returns:
+        Tupla (huellas {clave: huella}, filas {clave: tupla}). Las filas sin
+        clave se descartan y las que repiten una clave se fusionan con
+        fusionar_fila, así la huella y la fila son las de lo que escribe la
+        carga completa.
+    """
+    filas = {}
+    for fila in _leer_csv(espec.csv, espec.fila):
+        clave = [fila[i] for i in espec.clave]
+        if any(valor is None for valor in clave):
+            continue
+        clave = _clave(clave)
+        filas[clave] = fusionar_fila(espec, filas[clave], fila) if clave in filas else tuple(fila)
+    huellas = {clave: _huella(fila) for clave, fila in filas.items()}
+    return huellas, filas
+
+def huellas_por_expediente(espec):
+    """Calcula una huella por expediente con el contenido de todas sus filas (sin importar el orden)."""
+    grupos = {}
+    for fila in _leer_csv(espec.csv, espec.fila):
+        if fila[0] is None:
+            continue
+        grupos.setdefault(fila[0], []).append(_huella(fila))
+    return {_clave([numero]): _huella(sorted(huellas)) for numero, huellas in grupos.items()}
+
+def _diferencia(cur, tabla, huellas):
+    cur.execute(f"SELECT clave, huella FROM {TABLA_HUELLAS} WHERE tabla = %s", (tabla,))
+    anteriores = dict(cur.fetchall())
+    return Diferencia(
+        huellas=huellas,
+        nuevas=[clave for clave in huellas if clave not in anteriores],
+        cambiadas=[clave for clave, huella in huellas.items() if clave in anteriores and anteriores[clave] != huella],
+        borradas=[clave for clave in anteriores if clave not in huellas],
+    )
+
+def _numeros(claves):
+    return [json.loads(clave)[0] for clave in claves]
+
+def _borrar_por_clave(cur, espec, claves):
+    if not claves:
+        return
+    columnas_clave = [espec.columnas[i] for i in espec.clave]
+    staging = f"stg_delta_borrar_{espec.tabla}"
+    copy_a_staging(cur, staging, columnas_clave, (json.loads(clave) for clave in claves), tabla=espec.tabla)
+    condicion = " AND ".join(f"t.{c} = s.{c}" for c in columnas_clave)
+    cur.execute(f"DELETE FROM {espec.tabla} t USING {staging} s WHERE {condicion}")
+
+def _upsert_por_clave(cur, espec, filas):
+    # `filas` ya vienen fusionadas, una por clave: pisar todas las columnas
+    # deja la fila igual a la que escribiría la carga completa
+    if not filas:
+        return
+    staging = f"stg_delta_{espec.tabla}"
+    copy_a_staging(cur, staging, espec.columnas, filas, tabla=espec.tabla)
+    columnas_clave = [espec.columnas[i] for i in espec.clave]
+    resto = [c for c in espec.columnas if c not in columnas_clave]
+    condicion = " AND ".join(f"t.{c} = s.{c}" for c in columnas_clave)
+    filtro = f" AND {espec.condicion}" if espec.condicion else ""
+    if resto:
+        cur.execute(f"""
+            UPDATE {espec.tabla} t
+            SET {', '.join(f'{c} = s.{c}' for c in resto)}
+            FROM {staging} s
+            WHERE {condicion}{filtro}
+        """)
+    cur.execute(f"""
+        INSERT INTO {espec.tabla} ({', '.join(espec.columnas)})
+        SELECT {', '.join(f's.{c}' for c in espec.columnas)}
+        FROM {staging} s
+        WHERE NOT EXISTS (SELECT 1 FROM {espec.tabla} t WHERE {condicion}){filtro}
+        ORDER BY s._fila
+    """)
+
+def _guardar_huellas(cur, tabla, diferencia):
+    if diferencia.borradas:
+        cur.execute(
+            f"DELETE FROM {TABLA_HUELLAS} WHERE tabla = %s AND clave = ANY(%s)",
+            (tabla, diferencia.borradas)
+        )
+    cambios = diferencia.nuevas + diferencia.cambiadas
+    if cambios:
+        staging = f"stg_huella_{tabla}"
+        copy_a_staging(
+            cur, staging, ["clave", "huella"],
+            ((clave, diferencia.huellas[clave]) for clave in cambios),
+            tabla=TABLA_HUELLAS
+        )
+        cur.execute(f"""
+            INSERT INTO {TABLA_HUELLAS} (tabla, clave, huella)
+            SELECT %s, clave, huella FROM {staging}
+            ON CONFLICT (tabla, clave) DO UPDATE SET huella = EXCLUDED.huella
+        """, (tabla,))
+
+def registrar_huellas(conn):
+    """
+    Reemplaza todas las huellas con las de los CSV actuales. Se llama al final
+    de una carga completa para que la próxima corrida con --delta parta de ahí.
+    """
+    print("Registrando huellas para la carga incremental...")
+    def todas():
+        for espec in DELTA_POR_FILA:
+            huellas, _ = huellas_por_fila(espec)
+            for clave, huella in huellas.items():
+                yield espec.tabla, clave, huella
+        for espec in DELTA_POR_EXPEDIENTE:
+            for clave, huella in huellas_por_expediente(espec).items():
+                yield espec.tabla, clave, huella
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"DELETE FROM {TABLA_HUELLAS}")
+            count = copy_a_staging(cur, "stg_huellas", ["tabla", "clave", "huella"], todas(), tabla=TABLA_HUELLAS)
+            cur.execute(f"""
+                INSERT INTO {TABLA_HUELLAS} (tabla, clave, huella)
+                SELECT DISTINCT ON (tabla, clave) tabla, clave, huella
+                FROM stg_huellas
+                ORDER BY tabla, clave, _fila DESC
+            """)
+        conn.commit()
+        print(f"✅ Huellas registradas: {count}")
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Advertencia: No se pudieron registrar las huellas ({e}); la próxima carga debe ser completa")
+
+def cargar_delta(conn):
+    """
+    Aplica sobre public solo las diferencias entre los CSV y las huellas de la
+    última carga: inserta, actualiza o borra filas cambiadas, en una única
+    transacción que también actualiza las huellas y, si hubo cambios,
+    metadata.ultima_actualizacion.
+
+    Returns:
+        True si la carga se aplicó (con o sin cambios), False si no se pudo
+    """
+    print("=== Carga incremental (delta) ===\n")
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT EXISTS (SELECT 1 FROM {TABLA_HUELLAS})")
+            if not cur.fetchone()[0]:
+                print("❌ No hay huellas de una carga anterior: correr primero una carga completa")
+                return False
+
+            # 1. Diferencias de todas las tablas antes de tocar nada
+            por_fila = {}
+            filas = {}
+            for espec in DELTA_POR_FILA:
+                huellas, filas[espec.tabla] = huellas_por_fila(espec)
+                por_fila[espec.tabla] = _diferencia(cur, espec.tabla, huellas)
+            por_expediente = {
+                espec.tabla: _diferencia(cur, espec.tabla, huellas_por_expediente(espec))
+                for espec in DELTA_POR_EXPEDIENTE
+            }
+
+            partes = por_expediente["parte"]
+            representaciones = por_expediente["representacion"]
+            resoluciones = por_expediente["resolucion"]
+            expedientes = por_fila["expediente"]
+
+            # Si cambian las partes de un expediente cambian sus parte_id,
+            # así que sus representaciones se rearman aunque no hayan cambiado
+            partes_tocadas = set(partes.nuevas + partes.cambiadas + partes.borradas)
+            representaciones_borrar = set(representaciones.cambiadas + representaciones.borradas) | partes_tocadas
+            representaciones_insertar = (
+                set(representaciones.nuevas + representaciones.cambiadas) | partes_tocadas
+            ) & set(representaciones.huellas)
+
+            # 2. Borrados, primero las tablas dependientes
+            cur.execute("DELETE FROM representacion WHERE numero_expediente = ANY(%s)",
+                        (_numeros(representaciones_borrar),))
+            numeros_partes = _numeros(partes.cambiadas + partes.borradas)
+            cur.execute("""
+                DELETE FROM rol_parte
+                WHERE parte_id IN (SELECT parte_id FROM parte WHERE numero_expediente = ANY(%s))
+            """, (numeros_partes,))
+            cur.execute("DELETE FROM parte WHERE numero_expediente = ANY(%s)", (numeros_partes,))
+            cur.execute("DELETE FROM resolucion WHERE numero_expediente = ANY(%s)",
+                        (_numeros(resoluciones.cambiadas + resoluciones.borradas),))
+            cur.execute("DELETE FROM expediente_delito WHERE numero_expediente = ANY(%s)",
+                        (_numeros(expedientes.cambiadas + expedientes.borradas),))
+            for espec in reversed(DELTA_POR_FILA):
+                _borrar_por_clave(cur, espec, por_fila[espec.tabla].borradas)
+
+            # 3. Altas y modificaciones, en el orden de la carga completa
+            def upsert(tabla, claves=()):
+                diferencia = por_fila[tabla]
+                claves = dict.fromkeys(diferencia.nuevas + diferencia.cambiadas + list(claves))
+                _upsert_por_clave(cur, ESPECS_DELTA[tabla], [filas[tabla][clave] for clave in claves])
+
+            def ids_tocados(tabla, columna):
+                diferencia = por_fila[tabla]
+                indice = ESPECS_DELTA[tabla].columnas.index(columna)
+                return {filas[tabla][clave][indice] for clave in diferencia.nuevas + diferencia.cambiadas}
+
+            def filas_de_expedientes(tabla, claves):
+                espec = ESPECS_DELTA[tabla]
+                numeros = set(_numeros(claves))
+                return (fila for fila in _leer_csv(espec.csv, espec.fila) if fila[0] in numeros)
+
+            upsert("fuero")
+            upsert("jurisdiccion")
+            upsert("tribunal")
+            upsert("expediente")
+            if partes.nuevas or partes.cambiadas:
+                copiar_partes(cur, filas_de_expedientes("parte", partes.nuevas + partes.cambiadas))
+            upsert("letrado")
+            if representaciones_insertar:
+                copiar_representaciones(cur, filas_de_expedientes("representacion", representaciones_insertar))
+            if resoluciones.nuevas or resoluciones.cambiadas:
+                copy_a_staging(
+                    cur, "stg_delta_resolucion",
+                    ["numero_expediente", "fecha", "nombre", "link"],
+                    filas_de_expedientes("resolucion", resoluciones.nuevas + resoluciones.cambiadas),
+                    tabla="resolucion"
+                )
+                cur.execute("""
+                    INSERT INTO resolucion (numero_expediente, fecha, nombre, link)
+                    SELECT numero_expediente, fecha, nombre, link
+                    FROM stg_delta_resolucion
+                    ORDER BY _fila
+                    ON CONFLICT DO NOTHING
+                """)
+            upsert("radicacion")
+            upsert("juez")
+            # Las relaciones que otra corrida salteó porque su tribunal o su
+            # juez no existía tienen huella igual; se reintentan cuando el
+            # tribunal o el juez aparece (o cambia de id), como en la carga completa
+            tribunales = ids_tocados("tribunal", "tribunal_id")
+            jueces = ids_tocados("juez", "juez_id")
+            upsert("tribunal_juez", [
+                clave for clave, fila in filas["tribunal_juez"].items()
+                if fila[0] in tribunales or fila[1] in jueces
+            ])
+            indice_delitos = ESPECS_DELTA["expediente"].columnas.index("delitos")
+            _, vinculos = vincular_delitos(cur, (
+                (filas["expediente"][clave][0], filas["expediente"][clave][indice_delitos])
+                for clave in expedientes.nuevas + expedientes.cambiadas
+            ))
+            normalizar_nombres(cur)
+            cargar_alias(cur)
+            canonizar_personas(cur)
+            refrescar_resumenes(cur)
+
+            # 4. Huellas y metadata en la misma transacción
+            hubo_cambios = False
+            print(f"{'tabla':<16}{'nuevas':>10}{'cambiadas':>12}{'borradas':>10}")
+            for tabla, diferencia in list(por_fila.items()) + list(por_expediente.items()):
+                _guardar_huellas(cur, tabla, diferencia)
+                unidad = " (expedientes)" if tabla in por_expediente else ""
+                print(f"{tabla:<16}{len(diferencia.nuevas):>10}{len(diferencia.cambiadas):>12}"
+                      f"{len(diferencia.borradas):>10}{unidad}")
+                hubo_cambios = hubo_cambios or bool(diferencia.nuevas or diferencia.cambiadas or diferencia.borradas)
+            print(f"Vínculos expediente-delito rearmados: {vinculos}")
+
+            if hubo_cambios:
+                _upsert_ultima_actualizacion(cur)
+        conn.commit()
+        if hubo_cambios:
+            print("\n✅ Cambios aplicados y fecha de última actualización actualizada")
+        else:
+            print("\n✅ Sin cambios desde la última carga")
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error en la carga incremental (no se aplicó ningún cambio): {e}")
+        return False
+
+# ============================================
+# Planificador de etapas
+# ============================================
+
+# Cada etapa declara de qué etapas depende (por FKs o porque lee lo que
+# otra escribe), qué CSV lee y qué tablas escribe. Las etapas sin
+# dependencias pendientes corren en paralelo, cada una con su propia
+# conexión del pool.
+Etapa = namedtuple("Etapa", ["nombre", "funcion", "depende_de", "usa_copy", "archivos", "tablas"])
+
+ETAPAS = [
+    Etapa("fuero", cargar_fuero, [], True, ["etl_fueros.csv"], ["fuero"]),
+    Etapa("jurisdiccion", cargar_jurisdiccion, [], True, ["etl_jurisdicciones.csv"], ["jurisdiccion"]),
+    Etapa("tribunal", cargar_tribunal, ["fuero", "jurisdiccion"], True, ["etl_tribunales.csv"], ["tribunal"]),
+    Etapa("expediente", cargar_expediente, [], True, ["etl_expedientes.csv"], ["expediente"]),
+    Etapa("parte_y_rol", cargar_parte_y_rol, ["expediente"], True, ["etl_partes.csv"], ["parte", "rol_parte"]),
+    Etapa("letrado", cargar_letrado, [], True, ["etl_letrados.csv"], ["letrado"]),
+    Etapa("representacion", cargar_representacion, ["parte_y_rol", "letrado"], True,
+          ["etl_representaciones.csv"], ["representacion"]),
+    Etapa("resolucion", cargar_resolucion, ["expediente"], True, ["etl_resoluciones.csv"], ["resolucion"]),
+    Etapa("radicacion", cargar_radicacion, ["expediente"], True, ["etl_radicaciones.csv"], ["radicacion"]),
+    Etapa("juez", cargar_juez, [], True, ["etl_jueces.csv"], ["juez"]),
+    Etapa("tribunal_juez", cargar_tribunal_juez, ["tribunal", "juez"], True,
+          ["etl_tribunal_juez.csv"], ["tribunal_juez"]),
+    Etapa("delitos", cargar_delitos, ["expediente"], False, [], ["tipo_delito", "expediente_delito"]),
+    # Solo actualiza columnas de tablas de otras etapas: no tiene tablas propias
+    Etapa("nombres_normalizados", cargar_nombres_normalizados, ["expediente", "juez"], False, [], []),
+    Etapa("personas_canonicas", cargar_personas_canonicas, ["parte_y_rol"], False,
+          [ARCHIVO_ALIAS], ["persona_alias"]),
+    # Última etapa: agrega lo que escribieron las demás
+    Etapa("resumenes", cargar_resumenes, ["delitos", "tribunal_juez", "nombres_normalizados"], False,
+          [], [tabla for tabla, _, _ in RESUMENES]),
+]
+
+def _camino_critico(etapas, metricas):
+    """Devuelve (duración total, nombres) de la cadena de dependencias más larga."""
+    por_nombre = {etapa.nombre: etapa for etapa in etapas}
+    memo = {}
+
+    def mejor(nombre):
+        if nombre not in memo:
+            previas = [mejor(dep) for dep in por_nombre[nombre].depende_de if dep in metricas]
+            total, cadena = max(previas, default=(0.0, []))
+            memo[nombre] = (total + metricas[nombre].segundos, cadena + [nombre])
+        return memo[nombre]
+
+    return max((mejor(nombre) for nombre in metricas), default=(0.0, []))
+
+def imprimir_linea_de_tiempo(etapas, metricas, omitidas=(), ancho=30):
+    """Imprime tiempos, filas y memoria de cada etapa, con una barra relativa al total."""
+    if not metricas:
+        return
+    total = max(metrica.fin for metrica in metricas.values()) or 1e-9
+    print("\n=== Línea de tiempo de etapas ===")
+    print(f"{'etapa':<20}{'inicio':>9}{'fin':>9}{'duración':>10}{'leídas':>10}{'escritas':>10}"
+          f"{'rechazos':>10}{'filas/s':>10}{'RSS MB':>8}")
+    for etapa in etapas:
+        metrica = metricas.get(etapa.nombre)
+        if metrica is None:
+            estado = "(ya completa)" if etapa.nombre in omitidas else "(no corrió)"
+            print(f"{etapa.nombre:<20}{estado:>28}")
+            continue
+        desde = int(metrica.inicio / total * ancho)
+        hasta = max(desde + 1, int(metrica.fin / total * ancho))
+        barra = " " * desde + "█" * (hasta - desde)
+        print(f"{etapa.nombre:<20}{metrica.inicio:>8.2f}s{metrica.fin:>8.2f}s{metrica.segundos:>9.2f}s"
+              f"{metrica.leidas:>10}{metrica.escritas:>10}{metrica.rechazadas:>10}"
+              f"{metrica.filas_por_segundo:>10.0f}{metrica.rss_pico_kb / 1024:>8.0f}  |{barra:<{ancho}}|"
+              + (f"  ❌ {metrica.error}" if metrica.error else ""))
+    duracion, cadena = _camino_critico(etapas, metricas)
+    print(f"Camino crítico ({duracion:.2f}s de {total:.2f}s): {' -> '.join(cadena)}")
+
+# Métricas de una etapa. inicio/fin en segundos desde el arranque de la carga;
+# rss_pico_kb es el pico del proceso al terminar la etapa (las etapas
+# paralelas lo comparten).
+MetricaEtapa = namedtuple("MetricaEtapa", [
+    "etapa", "inicio", "fin", "segundos", "leidas", "escritas", "rechazadas",
+    "filas_por_segundo", "rss_pico_kb", "error"
+])
+
+def etapas_fallidas(metricas):
+    """Nombres de las etapas con error en sus métricas"""
+    return [nombre for nombre, metrica in metricas.items() if metrica.error]
+
+def _metrica(etapa, inicio, fin, resultado=None, error=None):
+    resultado = resultado if isinstance(resultado, ResultadoCarga) else ResultadoCarga(0, 0, 0)
+    segundos = fin - inicio
+    return MetricaEtapa(
+        etapa=etapa,
+        inicio=round(inicio, 3),
+        fin=round(fin, 3),
+        segundos=round(segundos, 3),
+        leidas=resultado.leidas,
+        escritas=resultado.escritas,
+        rechazadas=resultado.rechazadas,
+        filas_por_segundo=round(resultado.leidas / segundos, 1) if segundos > 0 else 0.0,
+        rss_pico_kb=rss_pico_kb(),
+        error=error or resultado.error,
+    )
+
+def ejecutar_etapas(etapas, workers=1, usar_copy=False, search_path=None, metricas=None,
+                    omitir=(), al_completar=None):
+    """
+    Corre las etapas respetando sus dependencias, con hasta `workers` etapas
+    a la vez sobre un pool de conexiones. Si una etapa falla (lanza una
+    excepción o devuelve un ResultadoCarga con `error`), las que dependen de
+    ella no se ejecutan y al final se lanza RuntimeError.
+
+    Args:
+        etapas: Lista de Etapa en un orden válido
+        workers: Cantidad máxima de etapas simultáneas
+        usar_copy: Se pasa a las etapas que soportan carga con COPY
+        search_path: search_path de las conexiones del pool (ej: esquema sombra)
+        metricas: Diccionario donde se van guardando las MetricaEtapa, para
+            poder reportarlas aunque la carga falle
+        omitir: Nombres de etapas ya completadas (cuentan como terminadas)
+        al_completar: Función (conn, etapa) que se llama con la conexión de la
+            etapa cuando ésta termina sin errores
+
+    Returns:
+        Diccionario {etapa: MetricaEtapa}
+    """
+    workers = max(1, workers)
+    opciones = {"options": f"-c search_path={search_path}"} if search_path else {}
+    pool = ThreadedConnectionPool(1, workers, **DB_CONFIG, **opciones)
+    origen = time.perf_counter()
+    metricas = {} if metricas is None else metricas
+    errores = {}
+
+    def correr(etapa):
+        conn = pool.getconn()
+        try:
+            inicio = time.perf_counter() - origen
+            kwargs = {"usar_copy": usar_copy} if etapa.usa_copy else {}
+            try:
+                resultado = etapa.funcion(conn, **kwargs)
+            except Exception as e:
+                metricas[etapa.nombre] = _metrica(etapa.nombre, inicio, time.perf_counter() - origen, error=str(e))
+                raise
+            metricas[etapa.nombre] = _metrica(etapa.nombre, inicio, time.perf_counter() - origen, resultado)
+            if metricas[etapa.nombre].error:
+                # La etapa atrapó su propio error: cuenta como fallida igual
+                raise RuntimeError(metricas[etapa.nombre].error)
+            if al_completar:
+                al_completar(conn, etapa)
+        finally:
+            pool.putconn(conn)
+
+    pendientes = [etapa for etapa in etapas if etapa.nombre not in omitir]
+    terminadas = set(omitir)
+    en_curso = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while pendientes or en_curso:
+                # Descartar las etapas cuyas dependencias fallaron
+                for etapa in [e for e in pendientes if any(dep in errores for dep in e.depende_de)]:
+                    pendientes.remove(etapa)
+                    errores[etapa.nombre] = RuntimeError("dependencia fallida")
+                    print(f"⏭️  Etapa {etapa.nombre} omitida: falló una dependencia")
+
+                listas = [e for e in pendientes if all(dep in terminadas for dep in e.depende_de)]
+                for etapa in listas[:workers - len(en_curso)]:
+                    pendientes.remove(etapa)
+                    en_curso[executor.submit(correr, etapa)] = etapa
+
+                if not en_curso:
+                    break
+                hechas, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in hechas:
+                    etapa = en_curso.pop(futuro)
+                    try:
+                        futuro.result()
+                        terminadas.add(etapa.nombre)
+                    except Exception as e:
+                        errores[etapa.nombre] = e
+                        print(f"❌ Etapa {etapa.nombre} falló: {e}")
+    finally:
+        pool.closeall()
+        imprimir_linea_de_tiempo(etapas, metricas, omitidas=omitir)
+
+    if errores:
+        raise RuntimeError(f"Fallaron {len(errores)} etapas: {', '.join(errores)}")
+    return metricas
+
+# ============================================
+# Índices secundarios y estadísticas
+# ============================================
+
+# Con --reconstruir-indices los índices que no respaldan una PK, UNIQUE o
+# exclusión se borran antes de las etapas y se vuelven a crear al final, de
+# una sola vez por tabla. Las definiciones quedan guardadas en la base, así
+# una carga que se corta (y se retoma con --resume) no pierde índices.
+TABLA_INDICES = "carga_indice"
+
+def crear_tabla_indices_si_no_existe(conn):
+    """Crea la tabla de índices pendientes de reconstruir si no existe"""
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS public.{TABLA_INDICES} (
+                    esquema VARCHAR(63) NOT NULL,
+                    nombre VARCHAR(63) NOT NULL,
+                    tabla VARCHAR(63) NOT NULL,
+                    definicion TEXT NOT NULL,
+                    PRIMARY KEY (esquema, nombre)
+                )
+            """)
+        conn.commit()
+        print(f"✓ Tabla {TABLA_INDICES} verificada/creada")
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Advertencia al crear tabla {TABLA_INDICES}: {e}")
+
+def desactivar_indices_secundarios(conn, esquema, tablas):
+    """Guarda la definición de los índices secundarios de las tablas dadas y los borra."""
+    with conn.cursor() as cur:
+        # search_path vacío para que pg_get_indexdef califique todo con el esquema
+        cur.execute("SET LOCAL search_path TO pg_catalog")
+        cur.execute("""
+            SELECT n.nspname, ic.relname, t.relname, pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            JOIN pg_class ic ON ic.oid = i.indexrelid
+            JOIN pg_class t ON t.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE n.nspname = %s
+              AND t.relname = ANY(%s)
+              AND NOT i.indisprimary
+              AND NOT i.indisunique
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+        """, (esquema, list(tablas)))
+        indices = cur.fetchall()
+        if indices:
+            execute_values(cur, f"""
+                INSERT INTO public.{TABLA_INDICES} (esquema, nombre, tabla, definicion)
+                VALUES %s
+                ON CONFLICT (esquema, nombre) DO UPDATE SET definicion = EXCLUDED.definicion
+            """, indices)
+            for nspname, nombre, _, _ in indices:
+                cur.execute(f'DROP INDEX "{nspname}"."{nombre}"')
+    conn.commit()
+    print(f"✓ Índices secundarios desactivados: {len(indices)}")
+
+def olvidar_indices(conn, esquema):
+    """Descarta las definiciones guardadas de un esquema que se va a recrear desde cero."""
+    with conn.cursor() as cur:
+        cur.execute(f"DELETE FROM public.{TABLA_INDICES} WHERE esquema = %s", (esquema,))
+    conn.commit()
+
+def reconstruir_indices(conn, esquema, concurrente=False, workers=1):
+    """
+    Vuelve a crear los índices guardados para `esquema`, hasta `workers` a la
+    vez, cada uno en su propia conexión. Con `concurrente` usa CREATE INDEX
+    CONCURRENTLY, para no bloquear la lectura de tablas que la API ya ve.
+
+    Raises:
+        RuntimeError si algún índice no se pudo crear (queda guardado para
+        reintentar con --resume)
+    """
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT nombre, definicion FROM public.{TABLA_INDICES} WHERE esquema = %s", (esquema,))
+        indices = cur.fetchall()
+    conn.commit()
+    if not indices:
+        return
+    print(f"Reconstruyendo {len(indices)} índices secundarios...")
+
+    def crear(nombre, definicion):
+        if concurrente:
+            definicion = definicion.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+        conn_indice = conectar_db()
+        conn_indice.autocommit = True
+        try:
+            with conn_indice.cursor() as cur:
+                try:
+                    cur.execute(definicion)
+                except Exception:
+                    # Un CREATE INDEX CONCURRENTLY que falla deja un índice inválido
+                    cur.execute(f'DROP INDEX IF EXISTS "{esquema}"."{nombre}"')
+                    raise
+                cur.execute(f"DELETE FROM public.{TABLA_INDICES} WHERE esquema = %s AND nombre = %s",
+                            (esquema, nombre))
+        finally:
+            conn_indice.close()
+
+    errores = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futuros = {executor.submit(crear, nombre, definicion): nombre for nombre, definicion in indices}
+        for futuro in futuros:
+            try:
+                futuro.result()
+            except Exception as e:
+                errores += 1
+                print(f"  ⚠️ No se pudo crear el índice {futuros[futuro]}: {e}")
+    if errores:
+        raise RuntimeError(f"No se pudieron reconstruir {errores} índices")
+    print(f"✓ Índices reconstruidos: {len(indices)}")
+
+def analizar_tablas(conn, tablas):
+    """Actualiza las estadísticas del planificador de las tablas cargadas."""
+    print("Actualizando estadísticas (ANALYZE)...")
+    with conn.cursor() as cur:
+        for tabla in tablas:
+            cur.execute(f"ANALYZE {tabla}")
+    conn.commit()
+    print(f"✓ Estadísticas actualizadas en {len(tablas)} tablas")
+
+# ============================================
+# Checkpoints y reanudación
+# ============================================
+
+# Cada etapa terminada deja un checkpoint con la huella de sus entradas: sus
+# CSV más las huellas de las etapas de las que depende. Con --resume se saltean
+# las etapas cuyo checkpoint coincide (y cuyas dependencias también se
+# saltean); las demás se vacían y se vuelven a correr. Los checkpoints se
+# borran al publicar la carga o al empezar una carga nueva sin --resume.
+TABLA_CHECKPOINTS = "carga_checkpoint"
+
+def crear_tabla_checkpoints_si_no_existe(conn):
+    """Crea la tabla de checkpoints de etapas si no existe"""
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS public.{TABLA_CHECKPOINTS} (
+                    etapa VARCHAR(50) PRIMARY KEY,
+                    destino VARCHAR(20) NOT NULL,
+                    huella VARCHAR(32) NOT NULL,
+                    completada TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+                )
+            """)
+        conn.commit()
+        print(f"✓ Tabla {TABLA_CHECKPOINTS} verificada/creada")
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Advertencia al crear tabla {TABLA_CHECKPOINTS}: {e}")
+
+def huella_archivo(ruta):
+    """Huella del contenido de un archivo, leído en bloques"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+def huellas_etapas(etapas):
+    """
+    Huella de las entradas de cada etapa: sus archivos y las huellas de sus
+    dependencias, de modo que un CSV cambiado invalida también a las etapas
+    que dependen de la que lo lee.
+
+    Returns:
+        Diccionario {etapa: huella}
+    """
+    huellas = {}
+    for etapa in etapas:
+        partes = [f"{archivo}:{huella_archivo(archivo)}" for archivo in etapa.archivos]
+        partes += [f"{dep}:{huellas[dep]}" for dep in etapa.depende_de]
+        huellas[etapa.nombre] = hashlib.blake2b("|".join(partes).encode("utf-8"), digest_size=16).hexdigest()
+    return huellas
+
+def etapas_completadas(conn, etapas, huellas, destino):
+    """
+    Etapas que se pueden saltear: su checkpoint es del mismo destino, con la
+    misma huella, y todas sus dependencias también se saltean.
+    """
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT etapa, huella FROM public.{TABLA_CHECKPOINTS} WHERE destino = %s", (destino,))
+        checkpoints = dict(cur.fetchall())
+    conn.commit()
+    completadas = set()
+    for etapa in etapas:
+        if (checkpoints.get(etapa.nombre) == huellas[etapa.nombre]
+                and all(dep in completadas for dep in etapa.depende_de)):
+            completadas.add(etapa.nombre)
+    return completadas
+
+def guardar_checkpoint(conn, etapa, huella, destino):
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            INSERT INTO public.{TABLA_CHECKPOINTS} (etapa, destino, huella, completada)
+            VALUES (%s, %s, %s, NOW())
+            ON CONFLICT (etapa) DO UPDATE
+            SET destino = EXCLUDED.destino,
+                huella = EXCLUDED.huella,
+                completada = EXCLUDED.completada
+        """, (etapa, destino, huella))
+    conn.commit()
+
+def borrar_checkpoints(conn):
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"DELETE FROM public.{TABLA_CHECKPOINTS}")
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"⚠️ Advertencia: No se pudieron borrar los checkpoints: {e}")
+
+def vaciar_tablas_de_etapas(conn, etapas):
+    """
+    Vacía las tablas que escriben las etapas dadas, por si alguna llegó a
+    hacer commit antes de guardar su checkpoint. Las etapas pendientes
+    incluyen a todas las que dependen de ellas, así que se puede borrar en
+    el orden de TABLAS_CARGA (dependientes primero).
+    """
+    tablas = {tabla for etapa in etapas for tabla in etapa.tablas}
+    with conn.cursor() as cur:
+        for tabla in TABLAS_CARGA:
+            if tabla in tablas:
+                cur.execute(f"DELETE FROM {tabla}")
+    conn.commit()
+
+def existe_esquema_sombra(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1 FROM pg_namespace WHERE nspname = %s", (ESQUEMA_SOMBRA,))
+        existe = cur.fetchone() is not None
+    conn.commit()
+    return existe
+
 # ============================================
 # Main
 # ============================================
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Carga los CSV del ETL en la base de datos")
+    parser.add_argument(
+        "--copy",
+        action="store_true",
+        help="Carga masiva: vuelca cada CSV con COPY FROM STDIN a una tabla de staging "
+             "y la mergea en la tabla destino con un único INSERT ... SELECT"
+    )
+    parser.add_argument(
+        "--en-sitio",
+        action="store_true",
+        help="Carga directamente sobre las tablas de public con DELETE previo (la API "
+             "ve tablas vacías o a medio cargar durante la carga)"
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Carga incremental: compara los CSV con las huellas de la última carga y "
+             "aplica sobre public solo las filas nuevas, cambiadas o borradas"
+    )
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help=f"No carga nada: vuelve a publicar la versión guardada en '{ESQUEMA_ANTERIOR}'"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("LOAD_WORKERS", "1")),
+        help="Etapas que pueden correr a la vez, cada una con su conexión (default: "
+             "LOAD_WORKERS o 1)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retoma una carga completa que falló: saltea las etapas que ya terminaron "
+             "con los mismos CSV y vuelve a correr el resto"
+    )
+    parser.add_argument(
+        "--reconstruir-indices",
+        action="store_true",
+        help="Borra los índices secundarios de las tablas antes de cargar y los vuelve a "
+             "crear al final (CONCURRENTLY con --en-sitio)"
+    )
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+
+    if args.rollback:
+        conn = conectar_db()
+        try:
+            revertir_ultima_carga(conn)
+        finally:
+            conn.close()
+        return
+
+    if args.delta:
+        conn = conectar_db()
+        try:
+            crear_tabla_metadata_si_no_existe(conn)
+            crear_tabla_huellas_si_no_existe(conn)
+            asegurar_columnas_normalizadas(conn)
+            asegurar_tabla_alias(conn)
+            asegurar_tablas_resumen(conn)
+            asegurar_indices_api(conn)
+            asegurar_busqueda(conn)
+            cargar_delta(conn)
+        finally:
+            conn.close()
+        return
+
     print("=== Iniciando carga mejorada a base de datos ===\n")
+    if args.copy:
+        print("Modo de carga: COPY + merge desde staging\n")
     conn = conectar_db()
     carga_exitosa = False  # Flag para saber si todo fue exitoso
+    inicio = datetime.now(timezone.utc)
+    metricas = {}
     
     try:
         # Crear tabla metadata si no existe
         crear_tabla_metadata_si_no_existe(conn)
+        crear_tabla_huellas_si_no_existe(conn)
+        crear_tabla_ejecuciones_si_no_existe(conn)
+        crear_tabla_checkpoints_si_no_existe(conn)
+        crear_tabla_indices_si_no_existe(conn)
+        asegurar_columnas_normalizadas(conn)
+        asegurar_tabla_alias(conn)
+        asegurar_tablas_resumen(conn)
+        asegurar_indices_api(conn)
+        asegurar_busqueda(conn)
+
+        destino = "en_sitio" if args.en_sitio else "sombra"
+        huellas = huellas_etapas(ETAPAS)
+        completadas = set()
+        if args.resume and (args.en_sitio or existe_esquema_sombra(conn)):
+            completadas = etapas_completadas(conn, ETAPAS, huellas, destino)
+        
+        if completadas:
+            print(f"Reanudando: se saltean {len(completadas)} etapas ya completas "
+                  f"({', '.join(sorted(completadas))})\n")
+            if not args.en_sitio:
+                with conn.cursor() as cur:
+                    cur.execute(f"SET search_path TO {ESQUEMA_SOMBRA}, public")
+                conn.commit()
+            vaciar_tablas_de_etapas(conn, [etapa for etapa in ETAPAS if etapa.nombre not in completadas])
+        else:
+            if args.resume:
+                print("No hay etapas para retomar con estos CSV: se hace la carga completa\n")
+            borrar_checkpoints(conn)
+            if args.en_sitio:
+                # Limpiar tablas antes de cargar
+                limpiar_tablas(conn)
+            else:
+                # Cargar en tablas vacías del esquema sombra; public no se toca hasta el intercambio
+                olvidar_indices(conn, ESQUEMA_SOMBRA)
+                preparar_esquema_sombra(conn)
+
+        esquema = "public" if args.en_sitio else ESQUEMA_SOMBRA
+        if args.reconstruir_indices:
+            desactivar_indices_secundarios(conn, esquema, TABLAS_CARGA)
         
-        # Limpiar tablas antes de cargar
-        limpiar_tablas(conn)
+        # Cargar datos respetando las dependencias entre etapas
+        ejecutar_etapas(
+            ETAPAS,
+            workers=args.workers,
+            usar_copy=args.copy,
+            search_path=None if args.en_sitio else f"{ESQUEMA_SOMBRA},public",
+            metricas=metricas,
+            omitir=completadas,
+            al_completar=lambda conn_etapa, etapa: guardar_checkpoint(
+                conn_etapa, etapa.nombre, huellas[etapa.nombre], destino
+            )
+        )
         
-        # Cargar datos en orden
-        cargar_fuero(conn)
-        cargar_jurisdiccion(conn)
-        cargar_tribunal(conn)
-        cargar_expediente(conn)
-        cargar_parte_y_rol(conn)
-        cargar_letrado(conn)
-        cargar_representacion(conn)
-        cargar_resolucion(conn)
-        cargar_radicacion(conn)
-        cargar_juez(conn)
-        cargar_tribunal_juez(conn)
-        extraer_y_cargar_delitos(conn)
-        vincular_expedientes_delitos(conn)
+        # Índices guardados (de esta corrida o de una anterior que se cortó)
+        reconstruir_indices(conn, esquema, concurrente=args.en_sitio, workers=args.workers)
         
+        # Huellas para que la próxima corrida pueda ser incremental
+        registrar_huellas(conn)
+
+        # Estadísticas frescas antes de publicar, para que las primeras
+        # consultas de la API no usen las de la versión anterior
+        analizar_tablas(conn, TABLAS_CARGA)
+        
+        # ejecutar_etapas ya falla si alguna etapa falló; se vuelve a mirar
+        # acá porque publicar una carga a medias no tiene vuelta atrás
+        fallidas = etapas_fallidas(metricas)
+        if fallidas:
+            raise RuntimeError(f"Etapas con error: {', '.join(fallidas)}")
+
         # Si llegamos aquí, todo fue exitoso
         carga_exitosa = True
         
         # ⭐ ACTUALIZAR METADATA SOLO SI TODO FUE EXITOSO
+        # (en modo sombra se actualiza en la misma transacción del intercambio)
         if carga_exitosa:
-            actualizar_metadata_ultima_actualizacion(conn)
+            if args.en_sitio:
+                actualizar_metadata_ultima_actualizacion(conn)
+            else:
+                intercambiar_esquema_sombra(conn)
+            # Carga publicada: no queda nada para retomar. Si el intercambio
+            # falla, se salta esto y los checkpoints siguen sirviendo a --resume
+            borrar_checkpoints(conn)
         
         print("\n=== ✅ Carga completa exitosa ===")
         
     except Exception as e:
+        carga_exitosa = False
         print(f"\n=== ❌ Error general: {e} ===")
         print("⚠️ La fecha de última actualización NO se actualizó debido a errores")
+        if not args.en_sitio:
+            print(f"⚠️ public no se modificó; la carga parcial quedó en '{ESQUEMA_SOMBRA}' "
+                  "para retomarla con --resume")
+        # Los checkpoints de las etapas que terminaron bien se conservan: solo
+        # se borran al publicar o al empezar una carga completa
+        fallidas = etapas_fallidas(metricas)
+        if fallidas:
+            print(f"↩️  --resume vuelve a correr desde: {', '.join(fallidas)}")
     finally:
+        modo = ("copy" if args.copy else "filas") + ("/en_sitio" if args.en_sitio else "/sombra")
+        reporte = armar_reporte(inicio, datetime.now(timezone.utc), carga_exitosa, modo, args.workers, metricas)
+        guardar_reporte(conn, reporte)
         conn.close()
 
 if __name__ == "__main__":
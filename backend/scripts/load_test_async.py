@@ -0,0 +1,129 @@
+"""
+Prueba de carga: compara throughput y latencias (p50/p95/p99) de los
+endpoints de /analytics sincrónicos con sus variantes de /async/analytics.
+
+Abre --conexiones conexiones HTTP/1.1 keep-alive contra la API y, durante
+--segundos por camino, pide en ronda los endpoints indicados. Solo usa la
+biblioteca estándar.
+
+Para medir la base y no el cache de respuestas, levantar la API con
+CACHE_HABILITADO=false.
+
+Uso (desde backend/, con la API corriendo):
+    python scripts/load_test_async.py [--url http://localhost:8000] [--conexiones 64] [--segundos 20]
+"""
+
+import argparse
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+ENDPOINTS = [
+    "casos-por-estado",
+    "jueces-mayor-demora",
+    "causas-iniciadas-por-ano",
+    "delitos-mas-frecuentes",
+    "causas-en-tramite-por-juzgado",
+    "causas-por-fuero",
+    "personas-mas-denunciadas",
+    "causas-por-fiscal",
+]
+
+CAMINOS = {
+    "sync": "/analytics",
+    "async": "/async/analytics",
+}
+
+
+async def _pedir(lector, escritor, host, ruta):
+    """Hace un GET sobre una conexión abierta; devuelve el status."""
+    escritor.write(f"GET {ruta} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode())
+    await escritor.drain()
+    status = int((await lector.readline()).split()[1])
+    largo = 0
+    while True:
+        linea = await lector.readline()
+        if linea in (b"\r\n", b""):
+            break
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        if nombre.strip().lower() == "content-length":
+            largo = int(valor)
+    await lector.readexactly(largo)
+    return status
+
+
+async def _cliente(host, puerto, rutas, fin, latencias, errores, desfase):
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    i = desfase
+    try:
+        while time.perf_counter() < fin:
+            ruta = rutas[i % len(rutas)]
+            i += 1
+            inicio = time.perf_counter()
+            try:
+                status = await _pedir(lector, escritor, host, ruta)
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+                errores.append(ruta)
+                escritor.close()
+                lector, escritor = await asyncio.open_connection(host, puerto)
+                continue
+            if status != 200:
+                errores.append(ruta)
+            latencias.append(time.perf_counter() - inicio)
+    finally:
+        escritor.close()
+
+
+def _percentil(ordenadas, p):
+    if not ordenadas:
+        return 0.0
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p))]
+
+
+async def medir(url, prefijo, conexiones, segundos, calentamiento):
+    partes = urlsplit(url)
+    host, puerto = partes.hostname, partes.port or 80
+    rutas = [f"{prefijo}/{endpoint}" for endpoint in ENDPOINTS]
+
+    # Calentamiento: abre el pool de la API y llena los planes de consulta
+    await asyncio.gather(*(
+        _cliente(host, puerto, rutas, time.perf_counter() + calentamiento, [], [], i)
+        for i in range(min(conexiones, 8))
+    ))
+
+    latencias, errores = [], []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        _cliente(host, puerto, rutas, inicio + segundos, latencias, errores, i)
+        for i in range(conexiones)
+    ))
+    duracion = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "pedidos": len(latencias),
+        "errores": len(errores),
+        "rps": len(latencias) / duracion,
+        "p50": _percentil(latencias, 0.50) * 1000,
+        "p95": _percentil(latencias, 0.95) * 1000,
+        "p99": _percentil(latencias, 0.99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de /analytics sync vs async")
+    parser.add_argument("--url", default="http://localhost:8000", help="URL base de la API")
+    parser.add_argument("--conexiones", type=int, default=64, help="Conexiones concurrentes (default: 64)")
+    parser.add_argument("--segundos", type=float, default=20, help="Duración de cada medición (default: 20)")
+    parser.add_argument("--calentamiento", type=float, default=3, help="Segundos de calentamiento por camino")
+    args = parser.parse_args()
+
+    print(f"{args.conexiones} conexiones, {args.segundos:g}s por camino, {len(ENDPOINTS)} endpoints en ronda\n")
+    print(f"{'camino':<8}{'pedidos':>10}{'errores':>9}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for nombre, prefijo in CAMINOS.items():
+        r = asyncio.run(medir(args.url, prefijo, args.conexiones, args.segundos, args.calentamiento))
+        print(f"{nombre:<8}{r['pedidos']:>10}{r['errores']:>9}{r['rps']:>10.1f}"
+              f"{r['p50']:>9.1f}{r['p95']:>9.1f}{r['p99']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()